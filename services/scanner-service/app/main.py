@@ -1,8 +1,22 @@
 import argparse
 import asyncio
+import functools
 
 from shared.database import mongo
-from shared.util.data_collector import get_latest_ask, get_latest_bid
+from shared.util.account_state import account_state
+from shared.util.data_collector import (
+    async_get_data,
+    async_get_latest_ask,
+    async_get_latest_bid,
+)
+from shared.config.settings import get_settings
+from shared.util.candle_schedule import closing_intervals, decision_lag, next_close_ms
+from shared.util.event_bus import CANDLE_CLOSE, event_bus
+from shared.util.executor import worker_pools
+from shared.util.fan_out import fan_out
+from shared.util.indicator_cache import indicator_cache
+from shared.util.signal_ledger import signal_ledger
+from shared.util.timeframe import now_ms
 from shared.models.trade_plan import TradeParams
 from shared.util.stop import calculate_stop_loss
 from shared.util.position import (
@@ -10,8 +24,12 @@ from shared.util.position import (
     is_this_symbol_being_traded
 )
 from shared.temporal import workflow_starter
+from market.candlestick_streams import KlineFeed
+from market.order_book_streams import OrderBookFeed
 from strategy import registry
 
+settings = get_settings()
+
 
 async def start_workflow_safe(params):
     try:
@@ -20,6 +38,71 @@ async def start_workflow_safe(params):
         print(f"Workflow failed for {params.user}: {e}")
 
 
+async def start_user_trade(
+    user,
+    strategy_parameters,
+    wait_time_seconds,
+    direction: str,
+    strategy_name: str,
+    symbol: str,
+    latest_price: float,
+    stop_loss: float,
+    atr_value: float,
+) -> bool:
+    email = user.get("email", "")
+    sl_multiplier = strategy_parameters.get("sl_multiplier", 0.0)
+    trade_params = TradeParams(
+        api_key=user.get("api_key", ""),
+        api_secret=user.get("secret_key", ""),
+        user=email.split("@")[0] if email else "",
+        symbol=symbol,
+        side=direction,
+        quantity=0.0,
+        stop_price=stop_loss,
+        atr_value=atr_value,
+        timeframe=strategy_parameters.get("timeframe", ""),
+        atr_length=strategy_parameters.get("atr_period", 0),
+        user_email=email,
+        chat_id=user.get("chat_id", 0),
+        split_equally=strategy_parameters.get("split_equally", False),
+        num_levels=strategy_parameters.get("dca_levels", 1),
+        atr_trailing_stop_mul=sl_multiplier,
+        atr_take_profit_mul=strategy_parameters.get("tp_multiplier", 0.0),
+        wait_time_seconds=wait_time_seconds,
+        strategy_name=strategy_name or "",
+    )
+
+    try:
+        async with fan_out.limit(trade_params.api_key):
+            # the position check is cheaper than sizing, which reads the balance
+            if await worker_pools.run(
+                is_this_symbol_being_traded,
+                trade_params.api_key,
+                trade_params.api_secret,
+                trade_params.symbol,
+            ):
+                print(f"User {trade_params.user} already in a position. Skipping.")
+                return False
+
+            trade_params.quantity, trade_params.quantity_decimals = await worker_pools.run(
+                calculate_position_size,
+                trade_params.api_key,
+                trade_params.api_secret,
+                trade_params.symbol,
+                latest_price,
+                trade_params.stop_price,
+                trade_params.risk_per_trade,
+            )
+
+        print(f"Starting workflow for {trade_params.user}")
+        asyncio.create_task(start_workflow_safe(trade_params))
+        return True
+
+    except Exception as e:
+        print(f"Error for {trade_params.user}: {e}")
+        return False
+
+
 async def handle_trading_signal(
     users,
     strategy_parameters,
@@ -28,103 +111,208 @@ async def handle_trading_signal(
     direction: str,
     strategy_name: str,
 ):
+    """
+    Starts the trade workflow of every active user not already in the symbol.
+    The price and stop are the same for everyone and read once; the per-user
+    exchange calls then run concurrently within the limits of `fan_out`.
+    """
+    signalled_at = now_ms()
     print(f"Trading period has begun. Let's go {direction}!")
 
-    workflow_tasks = []
     symbol = strategy_parameters.get("symbol", "")
     symbol = "".join(symbol.split("/"))
     atr_value = entry_validation_dict.get("atr", 0.0)
-    sl_multiplier = strategy_parameters.get("sl_multiplier", 0.0)
     print(f"symbol: {symbol}")
-    latest_price = get_latest_bid(symbol) if direction == "BUY" else get_latest_ask(symbol)
+    latest_price = (
+        await async_get_latest_bid(symbol)
+        if direction == "BUY"
+        else await async_get_latest_ask(symbol)
+    )
+    stop_loss = await worker_pools.run(
+        functools.partial(
+            calculate_stop_loss,
+            side=direction,
+            symbol=symbol,
+            current_price=latest_price,
+            atr_value=atr_value,
+            atr_multiplier=strategy_parameters.get("sl_multiplier", 0.0),
+        )
+    )
 
+    active_users = []
     for user in users:
         if not user.get("active", False):
             print(f"User {user['email']} is not active. Skipping.")
             continue
+        active_users.append(user)
 
-        email = user.get("email", "")
-
-        stop_loss = calculate_stop_loss(
-            side=direction,
-            symbol=symbol,
-            current_price=latest_price,
-            atr_value=atr_value,
-            atr_multiplier=sl_multiplier
+    started = await asyncio.gather(
+        *(
+            start_user_trade(
+                user,
+                strategy_parameters,
+                wait_time_seconds,
+                direction,
+                strategy_name,
+                symbol,
+                latest_price,
+                stop_loss,
+                atr_value,
+            )
+            for user in active_users
         )
+    )
+    fan_out.record(strategy_name, signalled_at)
+    print(f"{strategy_name} {symbol} {direction}: started {sum(started)} of {len(active_users)} workflows")
 
-        trade_params = TradeParams(
-            api_key=user.get("api_key", ""),
-            api_secret=user.get("secret_key", ""),
-            user=email.split("@")[0] if email else "",
-            symbol=symbol,
-            side=direction,
-            quantity=0.0,
-            stop_price=stop_loss,
-            atr_value=atr_value,
-            timeframe=strategy_parameters.get("timeframe", ""),
-            atr_length=strategy_parameters.get("atr_period", 0),
-            user_email=email,
-            chat_id=user.get("chat_id", 0),
-            split_equally=strategy_parameters.get("split_equally", False),
-            num_levels=strategy_parameters.get("dca_levels", 1),
-            atr_trailing_stop_mul=sl_multiplier,
-            atr_take_profit_mul=strategy_parameters.get("tp_multiplier", 0.0),
-            wait_time_seconds=wait_time_seconds,
-            strategy_name=strategy_name or "",
-        )
 
-        trade_params.quantity, trade_params.quantity_decimals = calculate_position_size(
-            api_key=trade_params.api_key,
-            api_secret=trade_params.api_secret,
-            symbol=trade_params.symbol,
-            current_price=latest_price,
-            stop_price=trade_params.stop_price,
-            risk=trade_params.risk_per_trade
-        )
+async def load_strategies(timeframes: list[str] | None) -> list[tuple[str, dict]]:
+    """Every stored parameter set of every registered strategy, on `timeframes` or all."""
+    strategies = []
+    for strategy_name in registry.strategy_registry:
+        for timeframe in timeframes or [None]:
+            strategy_param_list = await mongo.get_many_strategy_params(
+                timeframe=timeframe, collection=strategy_name
+            )
+            for strategy_parameters in strategy_param_list or []:
+                strategies.append((strategy_name, strategy_parameters))
+    return strategies
 
-        try:
-            if not is_this_symbol_being_traded(
-                    api_key=trade_params.api_key,
-                    api_secret=trade_params.api_secret,
-                    symbol=trade_params.symbol
-                ):
-                print(f"Starting workflow for {trade_params.user}")
-                asyncio.create_task(start_workflow_safe(trade_params))
-            else:
-                print(f"User {trade_params.user} already in a position. Skipping.")
 
-        except Exception as e:
-            print(f"Error for {trade_params.user}: {e}")
+class StrategyDispatcher:
+    """
+    Runs the stored parameter sets as the candles they read close.
 
+    Every parameter set subscribes on the event bus to the closes of each
+    series it reads, its timeframe and higher timeframe, and runs on the first
+    close of a boundary to arrive; the other closes of that boundary find it
+    already done. Its series are refreshed when it runs, so a higher timeframe
+    candle whose stream message is still on its way is fetched instead.
+    """
 
+    def __init__(self, kline_feed: KlineFeed, order_book_feed: OrderBookFeed):
+        self.kline_feed = kline_feed
+        self.order_book_feed = order_book_feed
+        self.intervals: set[str] = set()
+        # bars needed per (symbol, interval), the most any strategy reading it declares
+        self.kline_streams: dict[tuple[str, str], int] = {}
+        self.users: list = []
+        self.wait_times: dict[str, int] = {}
+        self._subscriptions: list[tuple[tuple, object]] = []
+        # close boundary each parameter set last ran on
+        self._last_close: dict[tuple[str, str], int] = {}
 
-async def main(timeframe: str = "15m", collection: str = "channel_breakout_sma"):
+    async def reload(self, timeframes: list[str] | None):
+        """Reloads users and parameter sets and subscribes the sets to their closes."""
+        strategies = await load_strategies(timeframes)
+        kline_streams = {}
+        for strategy_name, strategy_parameters in strategies:
+            requirements = registry.data_requirements(strategy_name, strategy_parameters)
+            for stream, limit in requirements.items():
+                kline_streams[stream] = max(kline_streams.get(stream, 0), limit)
+        await self.kline_feed.subscribe(kline_streams)
+        await self.order_book_feed.subscribe({symbol for symbol, _ in kline_streams})
+
+        self.users = await mongo.get_users()
+        await account_state.track(self.users)
+        timeframes_in_use = {strategy_parameters["timeframe"] for _, strategy_parameters in strategies}
+        self.wait_times = {
+            timeframe: await mongo.get_waitime_from_mongodb(timeframe=timeframe)
+            for timeframe in timeframes_in_use
+        }
+        self.kline_streams = kline_streams
+        self.intervals = {interval for _, interval in kline_streams}
+
+        for topic, handler in self._subscriptions:
+            event_bus.unsubscribe(topic, handler)
+        self._subscriptions = []
+        for strategy_name, strategy_parameters in strategies:
+            handler = functools.partial(self.on_candle_close, strategy_name, strategy_parameters)
+            for symbol, interval in registry.data_requirements(strategy_name, strategy_parameters):
+                topic = (CANDLE_CLOSE, symbol, interval)
+                event_bus.subscribe(topic, handler)
+                self._subscriptions.append((topic, handler))
+        return strategies
+
+    async def on_candle_close(self, strategy_name: str, strategy_parameters: dict, topic, event):
+        key = (strategy_name, str(strategy_parameters.get("_id")))
+        closed_at = event["closed_at"]
+        if self._last_close.get(key, 0) >= closed_at:
+            return
+        self._last_close[key] = closed_at
+
+        requirements = registry.data_requirements(strategy_name, strategy_parameters)
+        series = await asyncio.gather(
+            *[
+                async_get_data(
+                    instrument=symbol,
+                    interval=interval,
+                    # the size every strategy reading the series asks for, to share one frame
+                    limit=max(limit, self.kline_streams.get((symbol, interval), 0)),
+                )
+                for (symbol, interval), limit in requirements.items()
+            ]
+        )
+        await registry.run_strategy(
+            strategy_name=strategy_name,
+            strategy_parameters=strategy_parameters,
+            frames=dict(zip(requirements, series)),
+            users=self.users,
+            wait_time_seconds=self.wait_times.get(strategy_parameters["timeframe"], 60),
+            closed_at=closed_at,
+        )
+
+
+async def main(
+    timeframes: list[str] | None = None,
+    collection: str = "channel_breakout_sma",
+    settle_seconds: float = settings.SCANNER_SETTLE_SECONDS,
+):
+    """
+    Runs strategies on candle close events. The kline streams publish each
+    close as it arrives; at every close boundary plus `settle_seconds` the
+    closes no stream delivered are published from the clock, and parameter
+    sets are reloaded.
+    """
+    kline_feed = KlineFeed()
+    order_book_feed = OrderBookFeed()
+    dispatcher = StrategyDispatcher(kline_feed, order_book_feed)
+    event_bus.start()
     while True:
         try:
-            users = await mongo.get_users()
-            wait_time_seconds = await mongo.get_waitime_from_mongodb(timeframe=timeframe)
+            strategies = await dispatcher.reload(timeframes)
+            if not dispatcher.intervals:
+                print("No strategy parameters stored. Waiting.")
+                await asyncio.sleep(60)
+                continue
 
-            tasks = []
-            for strategy_name, components in registry.strategy_registry.items():
-                strategy_param_list = await mongo.get_many_strategy_params(
-                    timeframe=timeframe, collection=strategy_name
-                )
-                for strategy_parameters in strategy_param_list:
-                    task = components["func"](
-                        strategy_parameters=strategy_parameters,
-                        users=users,
-                        wait_time_seconds=wait_time_seconds,
-                        strategy_name=strategy_name
+            indicator_cache.new_cycle()
+            closed_at = next_close_ms(dispatcher.intervals)
+            await asyncio.sleep(max(0.0, (closed_at - now_ms()) / 1000) + settle_seconds)
+            closed = closing_intervals(dispatcher.intervals, closed_at)
+            for symbol, interval in dispatcher.kline_streams:
+                if interval in closed:
+                    event_bus.publish(
+                        (CANDLE_CLOSE, symbol, interval),
+                        {
+                            "symbol": symbol,
+                            "interval": interval,
+                            "closed_at": closed_at,
+                            "source": "clock",
+                        },
+                        sequence=closed_at,
                     )
-                    tasks.append(task)
-
-            await asyncio.gather(*tasks)
+            print(f"Closed {sorted(closed)} for {len(strategies)} parameter sets")
+            print(f"Event bus: {event_bus.stats()}")
+            print(f"Indicator cache: {indicator_cache.stats()}")
+            print(f"Decision lag: {decision_lag.stats()}")
+            print(f"Signal ledger: {signal_ledger.stats()}")
+            print(f"Fan-out: {fan_out.stats()}")
+            print(f"Account state: {account_state.stats()}")
 
         except Exception as e:
             print(f"Error: {e}")
-            continue
-        await asyncio.sleep(wait_time_seconds)
+            await asyncio.sleep(settle_seconds)
 
 if __name__ == "__main__":
     # Set up argument parsing
@@ -132,8 +320,9 @@ if __name__ == "__main__":
     parser.add_argument(
         "--timeframe",
         type=str,
-        default="1h",
-        help="Specify the timeframe for the bot (e.g., 1m, 5m, 15m, 1h, 4h). Default is 1h.",
+        nargs="*",
+        default=None,
+        help="Only run strategies on these timeframes (e.g., 15m 1h). Default is every timeframe.",
     )
     parser.add_argument(
         "--collection",
@@ -146,6 +335,6 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     try:
-        asyncio.run(main(timeframe=args.timeframe, collection=args.collection))
+        asyncio.run(main(timeframes=args.timeframe, collection=args.collection))
     except KeyboardInterrupt:
         print("Bot stopped by user.")
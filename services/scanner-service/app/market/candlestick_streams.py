@@ -1,47 +1,169 @@
 import asyncio
-import os
+import math
 import logging
 
+from binance_common.constants import WebsocketMode
 from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futures import (
     DerivativesTradingUsdsFutures,
-    DERIVATIVES_TRADING_USDS_FUTURES_WS_STREAMS_PROD_URL,
     ConfigurationWebSocketStreams,
 )
 
+from shared.config.settings import get_settings
+from shared.util.candle_buffer import get_candle_buffer
+from shared.util.data_collector import async_get_data, get_data
+from shared.util.event_bus import CANDLE_CLOSE, event_bus
+from shared.util.kline_cache import kline_cache
+
+settings = get_settings()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
-# Create configuration for the WebSocket Streams
-configuration_ws_streams = ConfigurationWebSocketStreams(
-    stream_url=os.getenv(
-        "STREAM_URL", DERIVATIVES_TRADING_USDS_FUTURES_WS_STREAMS_PROD_URL
-    )
-)
 
-# Initialize DerivativesTradingUsdsFutures client
-client = DerivativesTradingUsdsFutures(config_ws_streams=configuration_ws_streams)
+class KlineFeed:
+    """
+    Keeps the candle buffers read by `get_data` up to date from combined kline streams,
+    and publishes every closed candle on the event bus.
 
+    Streams are spread over a pool of connections holding at most
+    `streams_per_connection` subscriptions each. The SDK reconnects and resubscribes
+    dropped connections; any candles missed meanwhile show up as a gap in the next
+    message and are backfilled over REST before the stream takes over again.
+    """
 
-async def kline_candlestick_streams():
-    connection = None
-    try:
-        connection = await client.websocket_streams.create_connection()
+    def __init__(
+        self,
+        stream_url: str = settings.KLINE_STREAM_URL,
+        streams_per_connection: int = settings.KLINE_STREAMS_PER_CONNECTION,
+        source: str = "spot",
+    ):
+        self.stream_url = stream_url
+        self.streams_per_connection = streams_per_connection
+        self.source = source
+        self.streams: set[tuple[str, str]] = set()
+        self.candle_closed = asyncio.Event()
+        self._connection = None
+        self._backfilling: set[tuple[str, str]] = set()
 
-        stream = await connection.kline_candlestick_streams(
-            symbol="btcusdt",
-            interval="1m",
+    async def connect(self, pool_size: int):
+        configuration_ws_streams = ConfigurationWebSocketStreams(
+            stream_url=self.stream_url,
+            mode=WebsocketMode.POOL,
+            pool_size=pool_size,
         )
+        client = DerivativesTradingUsdsFutures(config_ws_streams=configuration_ws_streams)
+        self._connection = await client.websocket_streams.create_connection()
+
+    async def subscribe(self, streams: dict[tuple[str, str], int]):
+        """
+        Seeds and subscribes every (symbol, interval) not streamed yet; `streams`
+        maps each one to the number of bars its strategies read.
+        """
+        new_streams = streams.keys() - self.streams
+        if not new_streams:
+            return
+
+        if self._connection is None:
+            await self.connect(
+                pool_size=max(1, math.ceil(len(streams) / self.streams_per_connection))
+            )
+
+        await asyncio.gather(
+            *[
+                async_get_data(
+                    instrument=symbol, interval=interval, limit=streams[(symbol, interval)]
+                )
+                for symbol, interval in new_streams
+            ]
+        )
+        for symbol, interval in new_streams:
+            stream = await self._connection.kline_candlestick_streams(
+                symbol=symbol.lower(),
+                interval=interval,
+            )
+            stream.on("message", self._make_handler(symbol, interval))
+            self.streams.add((symbol, interval))
+        logging.info(f"Streaming klines for {sorted(self.streams)}")
+
+    def _make_handler(self, symbol: str, interval: str):
+        def handler(data):
+            try:
+                self.on_kline(symbol, interval, data.k)
+            except Exception as e:
+                logging.error(f"kline handler error for {symbol} {interval}: {e}")
+
+        return handler
+
+    def on_kline(self, symbol: str, interval: str, kline):
+        buffer = get_candle_buffer(self.source, symbol, interval)
+        with buffer.lock:
+            applied = buffer.apply_stream_kline(
+                open_time=kline.t,
+                close_time=kline.T,
+                ohlcv=[float(kline.o), float(kline.h), float(kline.l), float(kline.c), float(kline.v)],
+                is_closed=bool(kline.x),
+            )
+        kline_cache.invalidate(self.source, symbol, interval)
+
+        if not applied:
+            self._schedule_backfill(symbol, interval)
+        elif kline.x:
+            self.candle_closed.set()
+            closed_at = int(kline.T) + 1
+            event_bus.publish(
+                (CANDLE_CLOSE, symbol, interval),
+                {"symbol": symbol, "interval": interval, "closed_at": closed_at, "source": "stream"},
+                sequence=closed_at,
+            )
+
+    def _schedule_backfill(self, symbol: str, interval: str):
+        if (symbol, interval) in self._backfilling:
+            return
+        self._backfilling.add((symbol, interval))
+
+        async def backfill():
+            try:
+                logging.warning(f"Backfilling kline gap for {symbol} {interval}")
+                buffer = get_candle_buffer(self.source, symbol, interval)
+                await async_get_data(instrument=symbol, interval=interval, limit=buffer.capacity)
+                kline_cache.invalidate(self.source, symbol, interval)
+            except Exception as e:
+                logging.error(f"kline backfill error for {symbol} {interval}: {e}")
+            finally:
+                self._backfilling.discard((symbol, interval))
+
+        asyncio.get_running_loop().create_task(backfill())
+
+    async def wait_for_close(self, timeout: float, settle_seconds: float = 0.25):
+        """
+        Waits until any streamed candle closes (or `timeout` elapses), then gives the
+        other streams closing on the same boundary `settle_seconds` to arrive.
+        """
+        try:
+            await asyncio.wait_for(self.candle_closed.wait(), timeout=timeout)
+            await asyncio.sleep(settle_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self.candle_closed.clear()
+
+    async def close(self):
+        if self._connection:
+            await self._connection.close_connection(close_session=True)
+            self._connection = None
+
+
+async def kline_candlestick_streams():
+    feed = KlineFeed()
+    try:
+        await feed.subscribe({("BTCUSDT", "1m"): 1500})
         while True:
-            stream.on("message", lambda data: print(f"{data}"))
-            await asyncio.sleep(2.5)
-        await stream.unsubscribe()
+            await feed.wait_for_close(timeout=60)
+            print(get_data(instrument="BTCUSDT", interval="1m").tail(3))
     except Exception as e:
         logging.error(f"kline_candlestick_streams() error: {e}")
     finally:
-        if connection:
-            await connection.close_connection(close_session=True)
+        await feed.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(kline_candlestick_streams())
\ No newline at end of file
+    asyncio.run(kline_candlestick_streams())
@@ -1,46 +1,105 @@
 import asyncio
-import os
+import math
 import logging
 
+from binance_common.constants import WebsocketMode
 from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futures import (
     DerivativesTradingUsdsFutures,
-    DERIVATIVES_TRADING_USDS_FUTURES_WS_STREAMS_PROD_URL,
     ConfigurationWebSocketStreams,
 )
 
+from shared.config.settings import get_settings
+from shared.util.event_bus import MARK_PRICE, event_bus
+
+settings = get_settings()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
-# Create configuration for the WebSocket Streams
-configuration_ws_streams = ConfigurationWebSocketStreams(
-    stream_url=os.getenv(
-        "STREAM_URL", DERIVATIVES_TRADING_USDS_FUTURES_WS_STREAMS_PROD_URL
-    )
-)
 
-# Initialize DerivativesTradingUsdsFutures client
-client = DerivativesTradingUsdsFutures(config_ws_streams=configuration_ws_streams)
+class MarkPriceFeed:
+    """
+    Publishes the futures mark price of every subscribed symbol on the event bus,
+    as (MARK_PRICE, symbol) events. Updates for a symbol whose last one is still
+    waiting to be delivered replace it, so slow subscribers only see the latest.
+    """
+
+    def __init__(
+        self,
+        stream_url: str = settings.DEPTH_STREAM_URL,
+        streams_per_connection: int = settings.KLINE_STREAMS_PER_CONNECTION,
+        update_speed: str = "1s",
+    ):
+        self.stream_url = stream_url
+        self.streams_per_connection = streams_per_connection
+        self.update_speed = update_speed
+        self.symbols: set[str] = set()
+        self._connection = None
+
+    async def connect(self, pool_size: int):
+        configuration_ws_streams = ConfigurationWebSocketStreams(
+            stream_url=self.stream_url,
+            mode=WebsocketMode.POOL,
+            pool_size=pool_size,
+        )
+        client = DerivativesTradingUsdsFutures(config_ws_streams=configuration_ws_streams)
+        self._connection = await client.websocket_streams.create_connection()
+
+    async def subscribe(self, symbols: set[str]):
+        new_symbols = symbols - self.symbols
+        if not new_symbols:
+            return
+
+        if self._connection is None:
+            await self.connect(
+                pool_size=max(1, math.ceil(len(symbols) / self.streams_per_connection))
+            )
+
+        for symbol in new_symbols:
+            stream = await self._connection.mark_price_stream(
+                symbol=symbol.lower(),
+                update_speed=self.update_speed,
+            )
+            stream.on("message", self._make_handler(symbol))
+            self.symbols.add(symbol)
+        logging.info(f"Streaming mark prices for {sorted(self.symbols)}")
+
+    def _make_handler(self, symbol: str):
+        def handler(data):
+            try:
+                event_bus.publish(
+                    (MARK_PRICE, symbol),
+                    {"symbol": symbol, "mark_price": float(data.p), "event_time": int(data.E)},
+                    sequence=int(data.E),
+                )
+            except Exception as e:
+                logging.error(f"mark price handler error for {symbol}: {e}")
+
+        return handler
+
+    async def close(self):
+        if self._connection:
+            await self._connection.close_connection(close_session=True)
+            self._connection = None
 
 
 async def mark_price_stream():
-    connection = None
-    try:
-        connection = await client.websocket_streams.create_connection()
+    async def show(topic, event):
+        print(f"{event}")
 
-        stream = await connection.mark_price_stream(
-            symbol="SOLUSDT",
-        )
+    feed = MarkPriceFeed()
+    try:
+        event_bus.start()
+        event_bus.subscribe((MARK_PRICE, "SOLUSDT"), show)
+        await feed.subscribe({"SOLUSDT"})
         while True:
-            stream.on("message", lambda data: print(f"{data}"))
             await asyncio.sleep(5)
-        await stream.unsubscribe()
     except Exception as e:
         logging.error(f"mark_price_stream() error: {e}")
     finally:
-        if connection:
-            await connection.close_connection(close_session=True)
+        await feed.close()
+        await event_bus.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(mark_price_stream())
\ No newline at end of file
+    asyncio.run(mark_price_stream())
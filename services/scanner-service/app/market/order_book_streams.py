@@ -0,0 +1,118 @@
+import asyncio
+import math
+import logging
+
+from binance_common.constants import WebsocketMode
+from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futures import (
+    DerivativesTradingUsdsFutures,
+    ConfigurationWebSocketStreams,
+)
+
+from shared.config.settings import get_settings
+from shared.util.market_client import FUTURES_REST_URL, market_client
+from shared.util.order_book import get_local_order_book
+
+settings = get_settings()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+
+class OrderBookFeed:
+    """
+    Mirrors the futures order book of every subscribed symbol from the diff depth stream.
+
+    Each book is loaded from a REST snapshot once its stream is open and diffs are
+    being held back; whenever a diff does not continue the previous one the book
+    is dropped and loaded again from a fresh snapshot.
+    """
+
+    def __init__(
+        self,
+        stream_url: str = settings.DEPTH_STREAM_URL,
+        streams_per_connection: int = settings.KLINE_STREAMS_PER_CONNECTION,
+        update_speed: str = "100ms",
+        snapshot_limit: int = 1000,
+    ):
+        self.stream_url = stream_url
+        self.streams_per_connection = streams_per_connection
+        self.update_speed = update_speed
+        self.snapshot_limit = snapshot_limit
+        self.symbols: set[str] = set()
+        self._connection = None
+        self._resyncing: set[str] = set()
+
+    async def connect(self, pool_size: int):
+        configuration_ws_streams = ConfigurationWebSocketStreams(
+            stream_url=self.stream_url,
+            mode=WebsocketMode.POOL,
+            pool_size=pool_size,
+        )
+        client = DerivativesTradingUsdsFutures(config_ws_streams=configuration_ws_streams)
+        self._connection = await client.websocket_streams.create_connection()
+
+    async def subscribe(self, symbols: set[str]):
+        new_symbols = symbols - self.symbols
+        if not new_symbols:
+            return
+
+        if self._connection is None:
+            await self.connect(
+                pool_size=max(1, math.ceil(len(symbols) / self.streams_per_connection))
+            )
+
+        for symbol in new_symbols:
+            get_local_order_book(symbol).reset()
+            stream = await self._connection.diff_book_depth_streams(
+                symbol=symbol.lower(),
+                update_speed=self.update_speed,
+            )
+            stream.on("message", self._make_handler(symbol))
+            self.symbols.add(symbol)
+            self._schedule_resync(symbol)
+        logging.info(f"Mirroring order books for {sorted(self.symbols)}")
+
+    def _make_handler(self, symbol: str):
+        book = get_local_order_book(symbol)
+
+        def handler(data):
+            try:
+                if not book.apply_diff(data.U, data.u, data.pu, data.b, data.a):
+                    logging.warning(f"Order book sequence gap for {symbol}, resyncing")
+                    self._schedule_resync(symbol)
+            except Exception as e:
+                logging.error(f"depth handler error for {symbol}: {e}")
+
+        return handler
+
+    def _schedule_resync(self, symbol: str):
+        if symbol in self._resyncing:
+            return
+        self._resyncing.add(symbol)
+
+        async def resync():
+            book = get_local_order_book(symbol)
+            attempt = 0
+            try:
+                while symbol in self.symbols:
+                    try:
+                        response = await market_client.get(
+                            f"{FUTURES_REST_URL}/fapi/v1/depth",
+                            params={"symbol": symbol, "limit": self.snapshot_limit},
+                        )
+                        if book.apply_snapshot(response.json()):
+                            return
+                        # the snapshot predates the diffs held back; try a newer one
+                    except Exception as e:
+                        logging.error(f"order book resync error for {symbol}: {e}")
+                    attempt += 1
+                    await asyncio.sleep(min(attempt, 30))
+            finally:
+                self._resyncing.discard(symbol)
+
+        asyncio.get_running_loop().create_task(resync())
+
+    async def close(self):
+        if self._connection:
+            await self._connection.close_connection(close_session=True)
+            self._connection = None
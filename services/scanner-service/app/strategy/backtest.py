@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from shared.database import mongo
+from shared.util.backtest import (
+    backtest_report,
+    select_trades,
+    signal_entries,
+    simulate_trades,
+)
+from shared.util.candle_archive import load_candles
+from shared.util.indicator import ATR
+from shared.util.ohlcv_buffer import OHLCV_COLUMNS
+from strategy import registry
+
+
+def load_frame(
+    symbol: str,
+    interval: str,
+    start: int | None = None,
+    end: int | None = None,
+    source: str = "spot",
+) -> pd.DataFrame:
+    """Archived candles of one series as the OHLCV frame the signals read."""
+    return pd.DataFrame(
+        np.array(load_candles(symbol, interval, start, end, source=source)), columns=OHLCV_COLUMNS
+    )
+
+
+def strategy_signals(
+    strategy_name: str,
+    strategy_parameters: dict,
+    data: pd.DataFrame,
+    htf: pd.DataFrame | None = None,
+) -> dict:
+    """The array form of a registered strategy over the whole of `data`."""
+    components = registry.strategy_registry[strategy_name]
+    frames = (data,) if htf is None else (data, htf)
+    return components["vectorized"](*frames, **components["params"](strategy_parameters))
+
+
+def window_trades(
+    strategy_parameters: dict,
+    data: pd.DataFrame,
+    signals: dict,
+    start: int = 0,
+    end: int | None = None,
+    fee_rate: float = 0.0,
+) -> dict:
+    """
+    The trades taken on the signals of bars [start, end), one position at a time,
+    with the live exits replayed and anything still open closed at bar end - 1.
+    Signals and indicators are computed over the whole history beforehand, so
+    every window of it reads warm values.
+    """
+    end = len(data) if end is None else end
+    open_ = data["Open"].values[:end].astype(np.float64)
+    entry_index, side, entry_atr = signal_entries(
+        {key: values[:end] for key, values in signals.items()}, open_
+    )
+    in_window = entry_index >= start
+    entry_index, side, entry_atr = entry_index[in_window], side[in_window], entry_atr[in_window]
+    trades = simulate_trades(
+        open_,
+        data["High"].values[:end].astype(np.float64),
+        data["Low"].values[:end].astype(np.float64),
+        data["Close"].values[:end].astype(np.float64),
+        ATR(data, strategy_parameters["atr_period"], True)[:end],
+        entry_index,
+        side,
+        entry_atr,
+        sl_multiplier=strategy_parameters.get("sl_multiplier", 0.0),
+        tp_multiplier=strategy_parameters.get("tp_multiplier", 0.0),
+        fee_rate=fee_rate,
+    )
+    taken = select_trades(entry_index, trades["exit_index"])
+    return {key: values[taken] for key, values in trades.items()}
+
+
+def backtest_strategy(
+    strategy_name: str,
+    strategy_parameters: dict,
+    data: pd.DataFrame,
+    htf: pd.DataFrame | None = None,
+    fee_rate: float = 0.0,
+) -> dict:
+    """
+    Runs the array form of a registered strategy over `data` and replays the live
+    exits on its entries, one position at a time, as the scanner trades them.
+    """
+    signals = strategy_signals(strategy_name, strategy_parameters, data, htf)
+    trades = window_trades(strategy_parameters, data, signals, fee_rate=fee_rate)
+    report = backtest_report(trades)
+    report.update(
+        {
+            "strategy": strategy_name,
+            "symbol": strategy_parameters["symbol"],
+            "timeframe": strategy_parameters["timeframe"],
+            "higher_timeframe": strategy_parameters.get("higher_timeframe"),
+            "parameters": {
+                key: value for key, value in strategy_parameters.items() if key != "_id"
+            },
+            "start": int(data["Open time"].values[0]) if len(data) else None,
+            "end": int(data["Open time"].values[-1]) if len(data) else None,
+            "signals": int(np.count_nonzero(signals["isTimeEnterLong"] | signals["isTimeEnterShort"])),
+            "fee_rate": fee_rate,
+        }
+    )
+    return report
+
+
+async def run_backtests(
+    strategy_name: str,
+    timeframe: str,
+    start: int | None = None,
+    end: int | None = None,
+    fee_rate: float = 0.0,
+    source: str = "spot",
+) -> list[dict]:
+    """Backtests every parameter set stored for a strategy and saves the reports."""
+    reports = []
+    strategy_param_list = await mongo.get_many_strategy_params(
+        timeframe=timeframe, collection=strategy_name
+    )
+    for strategy_parameters in strategy_param_list:
+        symbol = "".join(strategy_parameters["symbol"].split("/"))
+        data = load_frame(symbol, strategy_parameters["timeframe"], start, end, source)
+        htf = None
+        if strategy_parameters.get("higher_timeframe"):
+            htf = load_frame(symbol, strategy_parameters["higher_timeframe"], start, end, source)
+
+        report = backtest_strategy(strategy_name, strategy_parameters, data, htf, fee_rate)
+        await mongo.save_backtest_report(report)
+        print(
+            f"{strategy_name} {symbol} {strategy_parameters['timeframe']}: "
+            f"{report['trades']} trades, win rate {report['win_rate']:.2%}, "
+            f"return {report['total_return']:.2%}"
+        )
+        reports.append(report)
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest a strategy on archived candles.")
+    parser.add_argument("--collection", type=str, default="channel_breakout_sma")
+    parser.add_argument("--timeframe", type=str, default="15m")
+    parser.add_argument("--start", type=int, default=None, help="First open time, in ms.")
+    parser.add_argument("--end", type=int, default=None, help="Open time to stop before, in ms.")
+    parser.add_argument("--fee-rate", type=float, default=0.0, help="Fee per side, e.g. 0.0004.")
+    parser.add_argument("--source", choices=["spot", "futures"], default="spot", help="Archive to read.")
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_backtests(
+            strategy_name=args.collection,
+            timeframe=args.timeframe,
+            start=args.start,
+            end=args.end,
+            fee_rate=args.fee_rate,
+            source=args.source,
+        )
+    )
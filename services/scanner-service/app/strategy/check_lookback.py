@@ -0,0 +1,169 @@
+import argparse
+import contextlib
+import io
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+from shared.util.ohlcv_buffer import OHLCV_COLUMNS
+from shared.util.timeframe import interval_to_milliseconds
+from strategy import registry
+from strategy.backtest import load_frame
+
+# every parameter any registered strategy reads, at typical values
+DEFAULT_PARAMETERS = {
+    "symbol": "ETH/USDT",
+    "timeframe": "15m",
+    "higher_timeframe": "4h",
+    "atr_period": 100,
+    "sma_period": 50,
+    "length": 15,
+    "rsi_period": 14,
+    "range_period": 20,
+    "lookback_period": 15,
+    "bb_period": 20,
+    "bb_std": 2.0,
+    "rsi_ma_period": 20,
+    "macd_fast_period": 12,
+    "macd_slow_period": 26,
+    "macd_signal_period": 9,
+    "cci_period": 20,
+    "htf_cci_period": 50,
+}
+
+
+def synthetic_frame(bars: int, interval: str, seed: int | None = None) -> pd.DataFrame:
+    """A random walk with volatility regimes, for checking without an archive."""
+    rng = np.random.default_rng(seed)
+    scale = 0.004 * np.repeat(rng.uniform(0.3, 2.0, bars // 200 + 1), 200)[:bars]
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 1, bars) * scale))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 1, bars) * scale / 4)
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 1, bars)) * scale / 2)
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 1, bars)) * scale / 2)
+    open_time = np.arange(bars, dtype=np.float64) * interval_to_milliseconds(interval)
+    volume = np.abs(rng.normal(100, 40, bars))
+    return pd.DataFrame(
+        np.column_stack([open_time, open_, high, low, close, volume]), columns=OHLCV_COLUMNS
+    )
+
+
+def resample(data: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Candles of a higher `interval` built from `data`, the last one still forming."""
+    interval_ms = interval_to_milliseconds(interval)
+    grouped = data.groupby(data["Open time"] // interval_ms * interval_ms)
+    return grouped.agg(
+        {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    ).reset_index()[OHLCV_COLUMNS]
+
+
+def _decision(strategy_name: str, strategy_parameters: dict, frames: dict):
+    # signals print their working; only the decision matters here
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = registry.evaluate_strategy(strategy_name, strategy_parameters, frames)
+    if result is None:
+        return None
+    return bool(result["isTimeEnterLong"]), bool(result["isTimeEnterShort"]), float(result["entry"])
+
+
+def check_tail_windows(
+    strategy_name: str,
+    strategy_parameters: dict,
+    data: pd.DataFrame,
+    htf: pd.DataFrame | None = None,
+    steps: int = 200,
+) -> dict:
+    """
+    Replays `steps` scanner decisions over the history, each made once on every
+    bar so far and once on only the tail `data_requirements` asks for, and
+    counts the decisions (entry flags and entry price) that differ.
+    """
+    symbol = "".join(strategy_parameters["symbol"].split("/"))
+    requirements = registry.data_requirements(strategy_name, strategy_parameters)
+    ltf = (symbol, strategy_parameters["timeframe"])
+    htf_key = (symbol, strategy_parameters.get("higher_timeframe"))
+    first = max(requirements.values()) + 1
+    count = min(steps, max(len(data) - first, 0) + 1)
+    ends = np.unique(np.linspace(first, len(data), num=count, dtype=int))
+
+    decisions = entries = mismatches = 0
+    examples = []
+    open_time = data["Open time"].values
+    for end in ends:
+        full = {ltf: data.iloc[:end].reset_index(drop=True)}
+        if htf_key in requirements:
+            # the higher timeframe candles open by the last bar, the last one forming
+            full[htf_key] = htf[htf["Open time"].values <= open_time[end - 1]].reset_index(drop=True)
+        if any(len(full[series]) < limit for series, limit in requirements.items()):
+            continue
+        tail = {
+            series: frame.iloc[len(frame) - requirements[series]:].reset_index(drop=True)
+            for series, frame in full.items()
+        }
+        expected = _decision(strategy_name, strategy_parameters, full)
+        actual = _decision(strategy_name, strategy_parameters, tail)
+        decisions += 1
+        if expected is not None and (expected[0] or expected[1]):
+            entries += 1
+        if expected != actual:
+            mismatches += 1
+            if len(examples) < 5:
+                examples.append({"open_time": int(open_time[end - 1]), "full": expected, "tail": actual})
+    return {
+        "strategy": strategy_name,
+        "requirements": {f"{s}/{i}": limit for (s, i), limit in requirements.items()},
+        "decisions": decisions,
+        "entries": entries,
+        "mismatches": mismatches,
+        "examples": examples,
+    }
+
+
+def check_all(
+    strategy_parameters: dict,
+    data: pd.DataFrame,
+    htf: pd.DataFrame,
+    steps: int = 200,
+    strategies: list[str] | None = None,
+) -> list[dict]:
+    return [
+        check_tail_windows(strategy_name, strategy_parameters, data, htf, steps)
+        for strategy_name in strategies or registry.strategy_registry
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check that every strategy decides the same on its declared tail as on the full history."
+    )
+    parser.add_argument("--strategy", nargs="*", default=None, help="Default is every registered strategy.")
+    parser.add_argument("--parameters", type=str, default=None, help="JSON overrides of the default parameters.")
+    parser.add_argument("--steps", type=int, default=200, help="Decisions replayed per strategy.")
+    parser.add_argument("--symbol", type=str, default=None, help="Read this symbol's archive instead of a random walk.")
+    parser.add_argument("--source", choices=["spot", "futures"], default="spot", help="Archive to read.")
+    parser.add_argument("--start", type=int, default=None, help="First open time, in ms.")
+    parser.add_argument("--end", type=int, default=None, help="Open time to stop before, in ms.")
+    parser.add_argument("--bars", type=int, default=6000, help="Bars of the random walk.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    parameters = {**DEFAULT_PARAMETERS, **json.loads(args.parameters or "{}")}
+    if args.symbol:
+        parameters["symbol"] = args.symbol
+        data = load_frame(args.symbol, parameters["timeframe"], args.start, args.end, args.source)
+        htf = load_frame(args.symbol, parameters["higher_timeframe"], args.start, args.end, args.source)
+    else:
+        data = synthetic_frame(args.bars, parameters["timeframe"], args.seed)
+        htf = resample(data, parameters["higher_timeframe"])
+
+    failed = False
+    for report in check_all(parameters, data, htf, args.steps, args.strategy):
+        failed |= report["mismatches"] > 0 or report["decisions"] == 0
+        print(
+            f"{report['strategy']}: {report['decisions']} decisions, {report['entries']} entries, "
+            f"{report['mismatches']} mismatches on {report['requirements']}"
+        )
+        for example in report["examples"]:
+            print(f"    {example}")
+    sys.exit(1 if failed else 0)
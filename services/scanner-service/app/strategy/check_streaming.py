@@ -0,0 +1,96 @@
+import argparse
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+import talib
+
+from shared.util.streaming_indicator import STREAMING_INDICATORS
+from strategy.backtest import load_frame
+from strategy.check_lookback import synthetic_frame
+
+# each streaming indicator at the parameters strategies use, with its talib form
+CHECKS = {
+    "SMA": ((50,), lambda high, low, close: talib.SMA(close, 50)),
+    "EMA": ((20,), lambda high, low, close: talib.EMA(close, 20)),
+    "MACD": ((12, 26, 9), lambda high, low, close: talib.MACD(close, 12, 26, 9)),
+    "BB": ((20, 2.0), lambda high, low, close: talib.BBANDS(close, 20, 2.0, 2.0)),
+    "RSI": ((14,), lambda high, low, close: talib.RSI(close, 14)),
+    "ATR": ((100,), lambda high, low, close: talib.ATR(high, low, close, 100)),
+    "CCI": ((20,), lambda high, low, close: talib.CCI(high, low, close, 20)),
+}
+
+
+def _difference(expected: tuple, actual: tuple) -> float:
+    """
+    Largest difference relative to the talib value (absolute where it is below
+    1), infinite where only one side is NaN.
+    """
+    worst = 0.0
+    for a, b in zip(expected, actual):
+        if math.isnan(a) or math.isnan(b):
+            if math.isnan(a) != math.isnan(b):
+                return math.inf
+            continue
+        worst = max(worst, abs(a - b) / max(abs(a), 1.0))
+    return worst
+
+
+def check_indicator(name: str, data: pd.DataFrame) -> dict:
+    """
+    Feeds `data` bar by bar to the streaming form of `name` and compares both
+    what it peeks for each bar before taking it and the value it stores after
+    with talib over the whole history.
+    """
+    params, reference = CHECKS[name]
+    high, low, close = (data[column].values.astype(np.float64) for column in ("High", "Low", "Close"))
+    expected = reference(high, low, close)
+    expected = np.column_stack(expected if isinstance(expected, tuple) else (expected,))
+
+    indicator = STREAMING_INDICATORS[name](*params)
+    worst = {"update": 0.0, "peek": 0.0}
+    examples = []
+    for i, bar in enumerate(zip(high.tolist(), low.tolist(), close.tolist())):
+        peeked = indicator.peek(*bar)
+        updated = indicator.update(*bar)
+        for kind, value in (("peek", peeked), ("update", updated)):
+            difference = _difference(expected[i], value if isinstance(value, tuple) else (value,))
+            if difference > worst[kind]:
+                worst[kind] = difference
+                if difference == math.inf and len(examples) < 5:
+                    examples.append({"bar": i, kind: value, "talib": expected[i].tolist()})
+    return {"indicator": name, "params": params, "bars": len(data), **worst, "examples": examples}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check that every streaming indicator, updated and peeked, matches talib."
+    )
+    parser.add_argument("--indicator", nargs="*", default=None, help="Default is every streaming indicator.")
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="Largest relative difference accepted.")
+    parser.add_argument("--symbol", type=str, default=None, help="Read this symbol's archive instead of a random walk.")
+    parser.add_argument("--timeframe", type=str, default="15m")
+    parser.add_argument("--source", choices=["spot", "futures"], default="spot", help="Archive to read.")
+    parser.add_argument("--start", type=int, default=None, help="First open time, in ms.")
+    parser.add_argument("--end", type=int, default=None, help="Open time to stop before, in ms.")
+    parser.add_argument("--bars", type=int, default=6000, help="Bars of the random walk.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.symbol:
+        data = load_frame(args.symbol, args.timeframe, args.start, args.end, args.source)
+    else:
+        data = synthetic_frame(args.bars, args.timeframe, args.seed)
+
+    failed = False
+    for name in args.indicator or CHECKS:
+        report = check_indicator(name, data)
+        failed |= max(report["update"], report["peek"]) > args.tolerance
+        print(
+            f"{report['indicator']}{report['params']}: max difference {report['update']:.3g} "
+            f"after update, {report['peek']:.3g} on peek over {report['bars']} bars"
+        )
+        for example in report["examples"]:
+            print(f"    {example}")
+    sys.exit(1 if failed else 0)
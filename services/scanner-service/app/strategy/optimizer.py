@@ -0,0 +1,262 @@
+import argparse
+import asyncio
+import json
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from shared.database import mongo
+from shared.util.ohlcv_buffer import OHLCV_COLUMNS
+from shared.util.parameter_search import grid_candidates, random_candidates, tpe_candidates
+from strategy.backtest import backtest_strategy, load_frame
+
+# candles and settings of the run, attached once per worker process
+worker_state = {}
+
+
+def share_frame(data: pd.DataFrame | None) -> tuple[SharedMemory | None, tuple | None]:
+    """Copies a frame's OHLCV bars into a shared memory block workers can map."""
+    if data is None:
+        return None, None
+    bars = np.ascontiguousarray(data[OHLCV_COLUMNS].values, dtype=np.float64)
+    memory = SharedMemory(create=True, size=max(bars.nbytes, 1))
+    np.ndarray(bars.shape, dtype=np.float64, buffer=memory.buf)[:] = bars
+    return memory, (memory.name, bars.shape)
+
+
+def attach_frame(spec: tuple | None) -> pd.DataFrame | None:
+    if spec is None:
+        return None
+    name, shape = spec
+    memory = SharedMemory(name=name)
+    # the frame is a view on the block, which must stay mapped while it is used
+    worker_state.setdefault("memory", []).append(memory)
+    bars = np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+    data = pd.DataFrame(bars, columns=OHLCV_COLUMNS, copy=False)
+    # indicators with the same parameters are shared across the worker's trials
+    data.attrs["series"] = ("shared_memory", name, len(data))
+    return data
+
+
+def init_worker(strategy_name: str, base_parameters: dict, data_spec, htf_spec, fee_rate: float):
+    worker_state.update(
+        {
+            "strategy_name": strategy_name,
+            "base_parameters": base_parameters,
+            "data": attach_frame(data_spec),
+            "htf": attach_frame(htf_spec),
+            "fee_rate": fee_rate,
+        }
+    )
+
+
+def _evaluate(parameters: dict) -> dict:
+    return backtest_strategy(
+        worker_state["strategy_name"],
+        {**worker_state["base_parameters"], **parameters},
+        worker_state["data"],
+        worker_state["htf"],
+        worker_state["fee_rate"],
+    )
+
+
+def score_report(report: dict, objective: str, min_trades: int) -> float:
+    value = report.get(objective)
+    if report["trades"] < min_trades or value is None:
+        return float("-inf")
+    return float(value)
+
+
+def optimize(
+    strategy_name: str,
+    base_parameters: dict,
+    space: dict,
+    data: pd.DataFrame,
+    htf: pd.DataFrame | None = None,
+    search: str = "grid",
+    trials: int = 100,
+    workers: int | None = None,
+    objective: str = "total_return",
+    min_trades: int = 30,
+    fee_rate: float = 0.0,
+    seed: int | None = None,
+) -> list[dict]:
+    """
+    Backtests parameter sets drawn from `space` (see `shared.util.parameter_search`)
+    across a process pool and returns them best first.
+
+    `search` is "grid" for every combination, "random" for `trials` uniform
+    draws, or "tpe" for `trials` draws where, after a random start, each round
+    of proposals is steered by the scores so far. The candles are copied once
+    into shared memory that every worker maps, so a trial only ships its
+    parameters and its report between processes. Parameter sets with fewer than
+    `min_trades` trades rank last.
+    """
+    workers = workers or os.cpu_count() or 1
+    rng = np.random.default_rng(seed)
+    data_memory, data_spec = share_frame(data)
+    htf_memory, htf_spec = share_frame(htf)
+    history = []
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(strategy_name, base_parameters, data_spec, htf_spec, fee_rate),
+        ) as pool:
+
+            def evaluate(candidates: list[dict]):
+                chunksize = max(1, len(candidates) // (workers * 4))
+                for parameters, report in zip(
+                    candidates, pool.map(_evaluate, candidates, chunksize=chunksize)
+                ):
+                    history.append((parameters, report, score_report(report, objective, min_trades)))
+
+            if search == "grid":
+                evaluate(grid_candidates(space))
+            elif search == "random":
+                evaluate(random_candidates(space, trials, rng))
+            elif search == "tpe":
+                startup = min(trials, max(10, 2 * workers))
+                evaluate(random_candidates(space, startup, rng))
+                while len(history) < trials:
+                    scored = [
+                        (parameters, score)
+                        for parameters, _, score in history
+                        if np.isfinite(score)
+                    ]
+                    count = min(workers, trials - len(history))
+                    if len(scored) < 2:
+                        evaluate(random_candidates(space, count, rng))
+                    else:
+                        evaluate(tpe_candidates(space, scored, count, rng))
+            else:
+                raise ValueError(f"Unknown search: {search}")
+    finally:
+        for memory in (data_memory, htf_memory):
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+
+    run_id = uuid.uuid4().hex
+    history.sort(key=lambda trial: trial[2], reverse=True)
+    results = []
+    for rank, (parameters, report, score) in enumerate(history, start=1):
+        strategy_parameters = report.pop("parameters")
+        results.append(
+            {
+                "run_id": run_id,
+                "strategy": strategy_name,
+                "symbol": base_parameters["symbol"],
+                "timeframe": base_parameters["timeframe"],
+                "rank": rank,
+                "objective": objective,
+                "score": score if np.isfinite(score) else None,
+                "search": search,
+                "tuned": parameters,
+                # the complete parameter set, ready for promote_strategy_parameters
+                "parameters": strategy_parameters,
+                "report": report,
+            }
+        )
+    return results
+
+
+def parse_space(text: str) -> dict:
+    """JSON search space; ranges are written as {"low": ..., "high": ...}."""
+    space = {}
+    for name, values in json.loads(text).items():
+        space[name] = (values["low"], values["high"]) if isinstance(values, dict) else values
+    return space
+
+
+async def run_optimization(
+    strategy_name: str,
+    timeframe: str,
+    space: dict,
+    start: int | None = None,
+    end: int | None = None,
+    source: str = "spot",
+    keep: int = 20,
+    promote: bool = False,
+    **optimize_kwargs,
+) -> list[dict]:
+    """
+    Optimizes every parameter set stored for a strategy, saves the `keep` best
+    results of each and, with `promote`, makes the best one live.
+    """
+    best = []
+    strategy_param_list = await mongo.get_many_strategy_params(
+        timeframe=timeframe, collection=strategy_name
+    )
+    for strategy_parameters in strategy_param_list:
+        base_parameters = {key: value for key, value in strategy_parameters.items() if key != "_id"}
+        symbol = "".join(base_parameters["symbol"].split("/"))
+        data = load_frame(symbol, base_parameters["timeframe"], start, end, source)
+        htf = None
+        if base_parameters.get("higher_timeframe"):
+            htf = load_frame(symbol, base_parameters["higher_timeframe"], start, end, source)
+
+        results = await asyncio.to_thread(
+            optimize, strategy_name, base_parameters, space, data, htf, **optimize_kwargs
+        )
+        if not results:
+            continue
+        await mongo.save_optimization_results(results[:keep])
+        top = results[0]
+        print(
+            f"{strategy_name} {symbol} {base_parameters['timeframe']}: best {top['tuned']} "
+            f"{top['objective']}={top['score']} over {len(results)} trials"
+        )
+        if promote and top["score"] is not None:
+            await mongo.promote_strategy_parameters(strategy_name, top["parameters"])
+        best.append(top)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Optimize strategy parameters on archived candles.")
+    parser.add_argument("--collection", type=str, default="channel_breakout_sma")
+    parser.add_argument("--timeframe", type=str, default="15m")
+    parser.add_argument(
+        "--space",
+        type=str,
+        required=True,
+        help='JSON search space, e.g. \'{"length": [10, 15, 20], "sl_multiplier": {"low": 1, "high": 4}}\'',
+    )
+    parser.add_argument("--search", choices=["grid", "random", "tpe"], default="grid")
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--objective", type=str, default="total_return")
+    parser.add_argument("--min-trades", type=int, default=30)
+    parser.add_argument("--fee-rate", type=float, default=0.0)
+    parser.add_argument("--start", type=int, default=None, help="First open time, in ms.")
+    parser.add_argument("--end", type=int, default=None, help="Open time to stop before, in ms.")
+    parser.add_argument("--source", choices=["spot", "futures"], default="spot", help="Archive to read.")
+    parser.add_argument("--keep", type=int, default=20, help="Results saved per parameter set.")
+    parser.add_argument("--promote", action="store_true", help="Make the best parameter set live.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_optimization(
+            strategy_name=args.collection,
+            timeframe=args.timeframe,
+            space=parse_space(args.space),
+            start=args.start,
+            end=args.end,
+            source=args.source,
+            keep=args.keep,
+            promote=args.promote,
+            search=args.search,
+            trials=args.trials,
+            workers=args.workers,
+            objective=args.objective,
+            min_trades=args.min_trades,
+            fee_rate=args.fee_rate,
+            seed=args.seed,
+        )
+    )
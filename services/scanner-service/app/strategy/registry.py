@@ -1,274 +1,412 @@
+import asyncio
+
 from app.main import handle_trading_signal
-from app.strategy import signals
+from app.strategy import signals, vectorized_signals
+from shared.config.settings import get_settings
+from shared.util.candle_schedule import candle_close_ms, decision_lag
+from shared.util.executor import worker_pools
+from shared.util.lookback import bars_needed, indicator_lookback
+from shared.util.signal_ledger import signal_ledger
+from shared.util.timeframe import interval_to_milliseconds, now_ms
+
+settings = get_settings()
 
 async def handle_trading_signal_caller(
-    users, strategy_parameters, wait_time_seconds, entry_validation_dict, strategy_name: str
+    users,
+    strategy_parameters,
+    wait_time_seconds,
+    entry_validation_dict,
+    strategy_name: str,
+    bar_open_time: int | None = None,
 ):
-    if entry_validation_dict["isTimeEnterLong"]:
+    """
+    Acts on a signal once per bar: with `bar_open_time`, the open time of the
+    bar the signal was read on, a direction already emitted for that bar is
+    dropped before any per-user work.
+    """
+    symbol = "".join(strategy_parameters["symbol"].split("/"))
+    for direction, entering in (
+        ("BUY", entry_validation_dict["isTimeEnterLong"]),
+        ("SELL", entry_validation_dict["isTimeEnterShort"]),
+    ):
+        if not entering:
+            continue
+        if bar_open_time is not None and not await signal_ledger.claim(
+            strategy_name, symbol, strategy_parameters["timeframe"], direction, bar_open_time
+        ):
+            print(
+                f"{strategy_name} {symbol} {direction} already signalled on bar {bar_open_time}. "
+                "Skipping."
+            )
+            continue
         await handle_trading_signal(
             users=users,
             strategy_parameters=strategy_parameters,
             wait_time_seconds=wait_time_seconds,
             entry_validation_dict=entry_validation_dict,
-            direction="BUY",
+            direction=direction,
             strategy_name=strategy_name
         )
 
-    if entry_validation_dict["isTimeEnterShort"]:
-        await handle_trading_signal(
-            users=users,
-            strategy_parameters=strategy_parameters,
-            wait_time_seconds=wait_time_seconds,
-            entry_validation_dict=entry_validation_dict,
-            direction="SELL",
-            strategy_name=strategy_name
-        )
 
-async def channel_breakout_run(
-    strategy_parameters: dict, users: list, wait_time_seconds: int, strategy_name:str
-):
-    entry_validation_dict = signals.channel_breakout_signal(
-        instrument=strategy_parameters["symbol"],
-        timeframe=strategy_parameters["timeframe"],
-        length=strategy_parameters["length"],
-        ma_length=strategy_parameters["sma_period"],
-        atr_length=strategy_parameters["atr_period"],
-    )
+def signal_bar_open_time(timeframe: str, data, closed_at: int | None = None) -> int:
+    """Open time of the last closed bar, the [-2] row signals decide on."""
+    if data is not None and len(data) >= 2:
+        return int(data["Open time"].values[-2])
+    interval_ms = interval_to_milliseconds(timeframe)
+    # the forming bar opens at the close being acted on, or else the latest close
+    if closed_at is None:
+        closed_at = candle_close_ms(timeframe, now_ms()) - interval_ms
+    return closed_at - interval_ms
 
-    await handle_trading_signal_caller(
-        users=users,
-        strategy_parameters=strategy_parameters,
-        wait_time_seconds=wait_time_seconds,
-        entry_validation_dict=entry_validation_dict,
-        strategy_name=strategy_name
-    )
+def channel_breakout_params(strategy_parameters: dict) -> dict:
+    return {
+        "length": strategy_parameters["length"],
+        "ma_length": strategy_parameters["sma_period"],
+        "atr_length": strategy_parameters["atr_period"],
+    }
 
 
-async def engulfing_run(
-    strategy_parameters: dict, users: list, wait_time_seconds: int, strategy_name:str
-):
-    entry_validation_dict = signals.engulfing_signal(
-        instrument=strategy_parameters["symbol"],
-        timeframe=strategy_parameters["timeframe"],
-        atr_length=strategy_parameters["atr_period"],
-    )
+def channel_breakout_indicators(strategy_parameters: dict) -> dict:
+    return {
+        "timeframe": [
+            ("ATR", strategy_parameters["atr_period"]),
+            ("MA", strategy_parameters["sma_period"]),
+            ("ROLLING", strategy_parameters["length"]),
+        ],
+    }
 
-    await handle_trading_signal_caller(
-        users=users,
-        strategy_parameters=strategy_parameters,
-        wait_time_seconds=wait_time_seconds,
-        entry_validation_dict=entry_validation_dict,
-        strategy_name=strategy_name
-    )
 
-async def htf_range_ltf_mean_reversion_run(
-    strategy_parameters: dict, users: list, wait_time_seconds: int, strategy_name:str
-):
-    entry_validation_dict = signals.htf_range_ltf_mean_reversion_signal(
-        instrument=strategy_parameters["symbol"],
-        timeframe=strategy_parameters["timeframe"],
-        htf_timeframe=strategy_parameters["higher_timeframe"],
-        rsi_len=strategy_parameters["rsi_period"],
-        range_len=strategy_parameters["range_period"],
-        atr_length=strategy_parameters["atr_period"],
-    )
+def engulfing_params(strategy_parameters: dict) -> dict:
+    return {
+        "atr_length": strategy_parameters["atr_period"],
+    }
 
-    await handle_trading_signal_caller(
-        users=users,
-        strategy_parameters=strategy_parameters,
-        wait_time_seconds=wait_time_seconds,
-        entry_validation_dict=entry_validation_dict,
-        strategy_name=strategy_name
-    )
 
-async def htf_rsi_ltf_bullish_dec_volume_run(
-    strategy_parameters: dict, users: list, wait_time_seconds: int, strategy_name:str
-):
-    entry_validation_dict = signals.htf_rsi_ltf_bullish_dec_volume_signal(
-        instrument=strategy_parameters["symbol"],
-        timeframe=strategy_parameters["timeframe"],
-        htf_timeframe=strategy_parameters["higher_timeframe"],
-        rsi_len=strategy_parameters["rsi_period"],
-        sma_len=strategy_parameters["sma_period"],
-        atr_length=strategy_parameters["atr_period"],
-    )
+def engulfing_indicators(strategy_parameters: dict) -> dict:
+    return {
+        "timeframe": [
+            ("ATR", strategy_parameters["atr_period"]),
+            ("ENGULFING",),
+        ],
+    }
 
-    await handle_trading_signal_caller(
-        users=users,
-        strategy_parameters=strategy_parameters,
-        wait_time_seconds=wait_time_seconds,
-        entry_validation_dict=entry_validation_dict,
-        strategy_name=strategy_name
-    )
+def htf_range_ltf_mean_reversion_params(strategy_parameters: dict) -> dict:
+    return {
+        "rsi_len": strategy_parameters["rsi_period"],
+        "range_len": strategy_parameters["range_period"],
+        "atr_length": strategy_parameters["atr_period"],
+    }
 
-async def htf_rsi_ltf_bearish_dec_volume_run(
-    strategy_parameters: dict, users: list, wait_time_seconds: int, strategy_name:str
-):
-    entry_validation_dict = signals.htf_rsi_ltf_bearish_dec_volume_signal(
-        instrument=strategy_parameters["symbol"],
-        timeframe=strategy_parameters["timeframe"],
-        htf_timeframe=strategy_parameters["higher_timeframe"],
-        rsi_len=strategy_parameters["rsi_period"],
-        sma_len=strategy_parameters["sma_period"],
-        lookback_len=strategy_parameters["lookback_period"],
-        atr_length=strategy_parameters["atr_period"],
-    )
 
-    await handle_trading_signal_caller(
-        users=users,
-        strategy_parameters=strategy_parameters,
-        wait_time_seconds=wait_time_seconds,
-        entry_validation_dict=entry_validation_dict,
-        strategy_name=strategy_name
-    )
+def htf_range_ltf_mean_reversion_indicators(strategy_parameters: dict) -> dict:
+    return {
+        "timeframe": [
+            ("ATR", strategy_parameters["atr_period"]),
+            ("SIMPLE_RSI", strategy_parameters["rsi_period"]),
+        ],
+        "higher_timeframe": [("ROLLING", strategy_parameters["range_period"])],
+    }
 
+def htf_rsi_ltf_bullish_dec_volume_params(strategy_parameters: dict) -> dict:
+    return {
+        "rsi_len": strategy_parameters["rsi_period"],
+        "sma_len": strategy_parameters["sma_period"],
+        "atr_length": strategy_parameters["atr_period"],
+    }
 
-async def htf_rsi_ltf_walk_bb_run(
-    strategy_parameters: dict, users: list, wait_time_seconds: int, strategy_name:str
-):
-    entry_validation_dict = signals.htf_rsi_ltf_walk_bb_signal(
-        instrument=strategy_parameters["symbol"],
-        timeframe=strategy_parameters["timeframe"],
-        htf_timeframe=strategy_parameters["higher_timeframe"],
-        rsi_len=strategy_parameters["rsi_period"],
-        bb_len=strategy_parameters["bb_period"],
-        bb_std=strategy_parameters["bb_std"],
-        atr_length=strategy_parameters["atr_period"],
-    )
 
-    await handle_trading_signal_caller(
-        users=users,
-        strategy_parameters=strategy_parameters,
-        wait_time_seconds=wait_time_seconds,
-        entry_validation_dict=entry_validation_dict,
-        strategy_name=strategy_name
-    )
+def htf_rsi_ltf_bullish_dec_volume_indicators(strategy_parameters: dict) -> dict:
+    return {
+        "timeframe": [
+            ("ATR", strategy_parameters["atr_period"]),
+            ("MA", strategy_parameters["sma_period"]),
+        ],
+        "higher_timeframe": [("SIMPLE_RSI", strategy_parameters["rsi_period"])],
+    }
 
+def htf_rsi_ltf_bearish_dec_volume_params(strategy_parameters: dict) -> dict:
+    return {
+        "rsi_len": strategy_parameters["rsi_period"],
+        "sma_len": strategy_parameters["sma_period"],
+        "lookback_len": strategy_parameters["lookback_period"],
+        "atr_length": strategy_parameters["atr_period"],
+    }
 
-async def htf_ltf_sync_rsi_run(
-    strategy_parameters: dict, users: list, wait_time_seconds: int, strategy_name:str
-):
-    entry_validation_dict = signals.htf_ltf_sync_rsi_signal(
-        instrument=strategy_parameters["symbol"],
-        timeframe=strategy_parameters["timeframe"],
-        htf_timeframe=strategy_parameters["higher_timeframe"],
-        rsi_len=strategy_parameters["rsi_period"],
-        rsi_ma_len=strategy_parameters["rsi_ma_period"],
-        atr_length=strategy_parameters["atr_period"],
-    )
 
-    await handle_trading_signal_caller(
-        users=users,
-        strategy_parameters=strategy_parameters,
-        wait_time_seconds=wait_time_seconds,
-        entry_validation_dict=entry_validation_dict,
-        strategy_name=strategy_name
-    )
+def htf_rsi_ltf_bearish_dec_volume_indicators(strategy_parameters: dict) -> dict:
+    return {
+        "timeframe": [
+            ("ATR", strategy_parameters["atr_period"]),
+            ("MA", strategy_parameters["sma_period"]),
+            ("ROLLING", strategy_parameters["lookback_period"]),
+        ],
+        "higher_timeframe": [("RSI", strategy_parameters["rsi_period"])],
+    }
 
 
-async def htf_macd_ltf_channel_breakout_run(
-    strategy_parameters: dict, users: list, wait_time_seconds: int, strategy_name:str
-):
-    entry_validation_dict = signals.htf_macd_ltf_channel_breakout_signal(
-        instrument=strategy_parameters["symbol"],
-        timeframe=strategy_parameters["timeframe"],
-        htf_timeframe=strategy_parameters["higher_timeframe"],
-        length=strategy_parameters["length"],
-        macd_fast=strategy_parameters["macd_fast_period"],
-        macd_slow=strategy_parameters["macd_slow_period"],
-        macd_signal=strategy_parameters["macd_signal_period"],
-        atr_period=strategy_parameters["atr_period"],
-    )
+def htf_rsi_ltf_walk_bb_params(strategy_parameters: dict) -> dict:
+    return {
+        "rsi_len": strategy_parameters["rsi_period"],
+        "bb_len": strategy_parameters["bb_period"],
+        "bb_std": strategy_parameters["bb_std"],
+        "atr_length": strategy_parameters["atr_period"],
+    }
 
-    await handle_trading_signal_caller(
-        users=users,
-        strategy_parameters=strategy_parameters,
-        wait_time_seconds=wait_time_seconds,
-        entry_validation_dict=entry_validation_dict,
-        strategy_name=strategy_name
-    )
 
+def htf_rsi_ltf_walk_bb_indicators(strategy_parameters: dict) -> dict:
+    return {
+        "timeframe": [
+            ("ATR", strategy_parameters["atr_period"]),
+            ("BB", strategy_parameters["bb_period"]),
+        ],
+        "higher_timeframe": [("SIMPLE_RSI", strategy_parameters["rsi_period"])],
+    }
 
-async def htf_ltf_sync_cci_run(
-    strategy_parameters: dict, users: list, wait_time_seconds: int, strategy_name:str
-):
-    entry_validation_dict = signals.htf_ltf_sync_cci_signal(
-        instrument=strategy_parameters["symbol"],
-        timeframe=strategy_parameters["timeframe"],
-        htf_timeframe=strategy_parameters["higher_timeframe"],
-        htf_cci_period=strategy_parameters["htf_cci_period"],
-        cci_period=strategy_parameters["cci_period"],
-        atr_period=strategy_parameters["atr_period"],
-    )
 
-    await handle_trading_signal_caller(
-        users=users,
-        strategy_parameters=strategy_parameters,
-        wait_time_seconds=wait_time_seconds,
-        entry_validation_dict=entry_validation_dict,
-        strategy_name=strategy_name
-    )
+def htf_ltf_sync_rsi_params(strategy_parameters: dict) -> dict:
+    return {
+        "rsi_len": strategy_parameters["rsi_period"],
+        "rsi_ma_len": strategy_parameters["rsi_ma_period"],
+        "atr_length": strategy_parameters["atr_period"],
+    }
 
 
-async def htf_rsi_ltf_channel_breakout_run(
-    strategy_parameters: dict, users: list, wait_time_seconds: int, strategy_name:str
-):
-    entry_validation_dict = signals.htf_rsi_ltf_channel_breakout_signal(
-        instrument=strategy_parameters["symbol"],
-        timeframe=strategy_parameters["timeframe"],
-        htf_timeframe=strategy_parameters["higher_timeframe"],
-        length=strategy_parameters["length"],
-        rsi_len=strategy_parameters["rsi_period"],
-        atr_period=strategy_parameters["atr_period"],
-    )
+def htf_ltf_sync_rsi_indicators(strategy_parameters: dict) -> dict:
+    return {
+        "timeframe": [
+            ("ATR", strategy_parameters["atr_period"]),
+            ("RSI_MA", strategy_parameters["rsi_period"], strategy_parameters["rsi_ma_period"]),
+        ],
+        "higher_timeframe": [
+            ("RSI_MA", strategy_parameters["rsi_period"], strategy_parameters["rsi_ma_period"]),
+        ],
+    }
 
-    await handle_trading_signal_caller(
-        users=users,
-        strategy_parameters=strategy_parameters,
-        wait_time_seconds=wait_time_seconds,
-        entry_validation_dict=entry_validation_dict,
-        strategy_name=strategy_name
-    )
 
+def htf_macd_ltf_channel_breakout_params(strategy_parameters: dict) -> dict:
+    return {
+        "length": strategy_parameters["length"],
+        "macd_fast": strategy_parameters["macd_fast_period"],
+        "macd_slow": strategy_parameters["macd_slow_period"],
+        "macd_signal": strategy_parameters["macd_signal_period"],
+        "atr_period": strategy_parameters["atr_period"],
+    }
+
+
+def htf_macd_ltf_channel_breakout_indicators(strategy_parameters: dict) -> dict:
+    return {
+        "timeframe": [
+            ("ATR", strategy_parameters["atr_period"]),
+            ("ROLLING", strategy_parameters["length"]),
+        ],
+        "higher_timeframe": [
+            (
+                "MACD",
+                strategy_parameters["macd_fast_period"],
+                strategy_parameters["macd_slow_period"],
+                strategy_parameters["macd_signal_period"],
+            ),
+        ],
+    }
+
+
+def htf_ltf_sync_cci_params(strategy_parameters: dict) -> dict:
+    return {
+        "htf_cci_period": strategy_parameters["htf_cci_period"],
+        "cci_period": strategy_parameters["cci_period"],
+        "atr_period": strategy_parameters["atr_period"],
+    }
+
+
+def htf_ltf_sync_cci_indicators(strategy_parameters: dict) -> dict:
+    return {
+        "timeframe": [
+            ("ATR", strategy_parameters["atr_period"]),
+            ("CCI", strategy_parameters["cci_period"]),
+        ],
+        "higher_timeframe": [("CCI", strategy_parameters["htf_cci_period"])],
+    }
+
+
+def htf_rsi_ltf_channel_breakout_params(strategy_parameters: dict) -> dict:
+    return {
+        "length": strategy_parameters["length"],
+        "rsi_len": strategy_parameters["rsi_period"],
+        "atr_period": strategy_parameters["atr_period"],
+    }
+
+
+def htf_rsi_ltf_channel_breakout_indicators(strategy_parameters: dict) -> dict:
+    return {
+        "timeframe": [
+            ("ATR", strategy_parameters["atr_period"]),
+            ("ROLLING", strategy_parameters["length"]),
+        ],
+        "higher_timeframe": [("RSI", strategy_parameters["rsi_period"])],
+    }
+
+
+# Each strategy is declared rather than wired up by hand:
+# - "signal" evaluates the latest bar, reading the frames it is given;
+# - "indicators" lists the indicators it reads on each series, keyed by the
+#   strategy parameter naming the series' interval ("timeframe" and, for
+#   multi-timeframe strategies, "higher_timeframe"), as (name, *periods) from
+#   `shared.util.lookback.INDICATOR_LOOKBACKS`. The symbol is the parameter
+#   set's own, so the declaration also says which candles are read and how many;
+# - "params" maps the stored parameters to the signal's keyword arguments;
+# - "vectorized" is the full-history form backtests run.
+# The scanner collects `data_requirements` of every parameter set before a
+# cycle and fetches each series once, so a new strategy reading series another
+# one already reads costs no extra requests.
 strategy_registry = {
     "channel_breakout_sma": {
-        "runner": "channel_breakout_run",
-        "func": channel_breakout_run
+        "signal": signals.channel_breakout_signal,
+        "indicators": channel_breakout_indicators,
+        "params": channel_breakout_params,
+        "vectorized": vectorized_signals.channel_breakout_signal,
     },
     "engulfing": {
-        "runner": "engulfing_run",
-        "func": engulfing_run
+        "signal": signals.engulfing_signal,
+        "indicators": engulfing_indicators,
+        "params": engulfing_params,
+        "vectorized": vectorized_signals.engulfing_signal,
     },
     "multi_timeframe_mean_reversion": {
-        "runner": "htf_range_ltf_mean_reversion_run",
-        "func": htf_range_ltf_mean_reversion_run
+        "signal": signals.htf_range_ltf_mean_reversion_signal,
+        "indicators": htf_range_ltf_mean_reversion_indicators,
+        "params": htf_range_ltf_mean_reversion_params,
+        "vectorized": vectorized_signals.htf_range_ltf_mean_reversion_signal,
     },
     "multi_timeframe_bullish_dec_vol_rsi": {
-        "runner": "htf_rsi_ltf_bullish_dec_volume_run",
-        "func": htf_rsi_ltf_bullish_dec_volume_run
+        "signal": signals.htf_rsi_ltf_bullish_dec_volume_signal,
+        "indicators": htf_rsi_ltf_bullish_dec_volume_indicators,
+        "params": htf_rsi_ltf_bullish_dec_volume_params,
+        "vectorized": vectorized_signals.htf_rsi_ltf_bullish_dec_volume_signal,
     },
     "multi_timeframe_bearish_dec_vol_rsi": {
-        "runner": "htf_rsi_ltf_bearish_dec_volume_run",
-        "func": htf_rsi_ltf_bearish_dec_volume_run
+        "signal": signals.htf_rsi_ltf_bearish_dec_volume_signal,
+        "indicators": htf_rsi_ltf_bearish_dec_volume_indicators,
+        "params": htf_rsi_ltf_bearish_dec_volume_params,
+        "vectorized": vectorized_signals.htf_rsi_ltf_bearish_dec_volume_signal,
     },
     "multi_timeframe_bb_walk_band": {
-        "runner": "htf_rsi_ltf_walk_bb_run",
-        "func": htf_rsi_ltf_walk_bb_run
+        "signal": signals.htf_rsi_ltf_walk_bb_signal,
+        "indicators": htf_rsi_ltf_walk_bb_indicators,
+        "params": htf_rsi_ltf_walk_bb_params,
+        "vectorized": vectorized_signals.htf_rsi_ltf_walk_bb_signal,
     },
     "multi_timeframe_sync_rsi": {
-        "runner": "htf_ltf_sync_rsi_run",
-        "func": htf_ltf_sync_rsi_run
+        "signal": signals.htf_ltf_sync_rsi_signal,
+        "indicators": htf_ltf_sync_rsi_indicators,
+        "params": htf_ltf_sync_rsi_params,
+        "vectorized": vectorized_signals.htf_ltf_sync_rsi_signal,
     },
     "multi_timeframe_macd_channel_breakout": {
-        "runner": "htf_macd_ltf_channel_breakout_run",
-        "func": htf_macd_ltf_channel_breakout_run
+        "signal": signals.htf_macd_ltf_channel_breakout_signal,
+        "indicators": htf_macd_ltf_channel_breakout_indicators,
+        "params": htf_macd_ltf_channel_breakout_params,
+        "vectorized": vectorized_signals.htf_macd_ltf_channel_breakout_signal,
     },
     "multi_timeframe_sync_cci": {
-        "runner": "htf_ltf_sync_cci_run",
-        "func": htf_ltf_sync_cci_run
+        "signal": signals.htf_ltf_sync_cci_signal,
+        "indicators": htf_ltf_sync_cci_indicators,
+        "params": htf_ltf_sync_cci_params,
+        "vectorized": vectorized_signals.htf_ltf_sync_cci_signal,
     },
     "multi_timeframe_rsi_channel_breakout": {
-        "runner": "htf_rsi_ltf_channel_breakout_run",
-        "func": htf_rsi_ltf_channel_breakout_run
+        "signal": signals.htf_rsi_ltf_channel_breakout_signal,
+        "indicators": htf_rsi_ltf_channel_breakout_indicators,
+        "params": htf_rsi_ltf_channel_breakout_params,
+        "vectorized": vectorized_signals.htf_rsi_ltf_channel_breakout_signal,
     },
 }
+
+
+def data_requirements(strategy_name: str, strategy_parameters: dict) -> dict[tuple[str, str], int]:
+    """Bars of each (symbol, interval) series a parameter set reads."""
+    symbol = "".join(strategy_parameters["symbol"].split("/"))
+    declared = strategy_registry[strategy_name]["indicators"](strategy_parameters)
+    requirements = {}
+    for timeframe, indicators in declared.items():
+        series = (symbol, strategy_parameters[timeframe])
+        limit = bars_needed(*(indicator_lookback(*indicator) for indicator in indicators))
+        requirements[series] = max(requirements.get(series, 0), limit)
+    return requirements
+
+
+def evaluate_strategy(strategy_name: str, strategy_parameters: dict, frames: dict) -> dict:
+    """
+    The latest signal of a parameter set on prefetched `frames`, keyed like
+    `data_requirements`. Series missing from `frames` are fetched by the signal.
+    """
+    components = strategy_registry[strategy_name]
+    symbol = "".join(strategy_parameters["symbol"].split("/"))
+    requirements = data_requirements(strategy_name, strategy_parameters)
+    ltf = (symbol, strategy_parameters["timeframe"])
+    kwargs = {
+        "instrument": strategy_parameters["symbol"],
+        "timeframe": strategy_parameters["timeframe"],
+        "limit": requirements[ltf],
+        "data": frames[ltf].copy() if ltf in frames else None,
+    }
+    if "higher_timeframe" in components["indicators"](strategy_parameters):
+        htf = (symbol, strategy_parameters["higher_timeframe"])
+        kwargs.update(
+            {
+                "htf_timeframe": strategy_parameters["higher_timeframe"],
+                "htf_limit": requirements[htf],
+                "htf": frames[htf].copy() if htf in frames else None,
+            }
+        )
+    return components["signal"](**kwargs, **components["params"](strategy_parameters))
+
+
+async def run_strategy(
+    strategy_name: str,
+    strategy_parameters: dict,
+    frames: dict,
+    users: list,
+    wait_time_seconds: int,
+    closed_at: int | None = None,
+):
+    """
+    Evaluates a parameter set on the worker thread pool, so every strategy of a
+    cycle runs at once. It stays in this process, where the cycle's indicator
+    cache is shared with the other strategies reading the same series and is
+    cleared by `new_cycle`; a process pool worker would keep a private cache
+    that is never cleared. `closed_at` is the candle close being acted on, for
+    the decision lag.
+    """
+    requirements = data_requirements(strategy_name, strategy_parameters)
+    frames = {series: frames[series] for series in requirements if series in frames}
+    try:
+        entry_validation_dict = await worker_pools.run(
+            evaluate_strategy,
+            strategy_name,
+            strategy_parameters,
+            frames,
+            timeout=settings.SCANNER_STRATEGY_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        print(
+            f"{strategy_name} {strategy_parameters['symbol']} {strategy_parameters['timeframe']} "
+            f"took over {settings.SCANNER_STRATEGY_TIMEOUT_SECONDS}s. Skipping."
+        )
+        return
+    if closed_at is not None:
+        decision_lag.record(strategy_parameters["timeframe"], closed_at)
+
+    symbol = "".join(strategy_parameters["symbol"].split("/"))
+    await handle_trading_signal_caller(
+        users=users,
+        strategy_parameters=strategy_parameters,
+        wait_time_seconds=wait_time_seconds,
+        entry_validation_dict=entry_validation_dict,
+        strategy_name=strategy_name,
+        bar_open_time=signal_bar_open_time(
+            strategy_parameters["timeframe"],
+            frames.get((symbol, strategy_parameters["timeframe"])),
+            closed_at,
+        ),
+    )
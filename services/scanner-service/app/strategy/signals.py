@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 from shared.util.data_collector import get_data
@@ -9,14 +10,18 @@ from shared.util.indicator import (
     ENGULFING,
     BB,
     MACD,
-    CCI
+    CCI,
+    SIMPLE_RSI
 )
 
 
 def crossed_above(a, b):
-        return a[-2] > b[-2] and a[-3] < b[-3]
+    # b may be a fixed level instead of a series
+    b = np.broadcast_to(b, np.shape(a))
+    return a[-2] > b[-2] and a[-3] < b[-3]
 
 def crossed_below(a, b):
+    b = np.broadcast_to(b, np.shape(a))
     return a[-2] < b[-2] and a[-3] > b[-3]
 
 def prepare_ohlcv_for_resample(
@@ -64,12 +69,13 @@ def signal(
     instrument: str = "ETHUSDT",
     timeframe: str = "5m",
     ma_length: int = 14,
-    rsi_length: int = 14
+    rsi_length: int = 14,
+    limit: int = 1500
 ) -> bool:
     """This Function checks if the market is in an up-trend pullback"""
     if "/" in instrument:
         instrument = "".join(instrument.split("/"))
-    data = get_data(instrument=instrument, interval=timeframe)
+    data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     print(data)
     data[f"RSI"] = RSI(data, rsi_length)
     data[f"MA"] = MA_for_indicators(data, "RSI", ma_length)
@@ -96,12 +102,13 @@ def bullish_volume_rsi_signal(
     instrument: str = "ETHUSDT",
     timeframe: str = "5m",
     ma_length: int = 14,
-    rsi_length: int = 14
+    rsi_length: int = 14,
+    limit: int = 1500
 ) -> bool:
     """This Function checks if the market is in an up-trend pullback"""
     if "/" in instrument:
         instrument = "".join(instrument.split("/"))
-    data = get_data(instrument=instrument, interval=timeframe)
+    data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     print(data)
     data[f"RSI"] = RSI(data, rsi_length)
     data["ATR"] = ATR(data)
@@ -128,12 +135,13 @@ def rsi_ma_signal(
     timeframe: str = "5m",
     ma_length: int = 100,
     rsi_length: int = 14,
-    rsi_ma_length: int = 14
+    rsi_ma_length: int = 14,
+    limit: int = 1500
 ) -> bool:
     """This Function checks if the market is in an up-trend pullback"""
     if "/" in instrument:
         instrument = "".join(instrument.split("/"))
-    data = get_data(instrument=instrument, interval=timeframe)
+    data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     data["RSI"] = RSI(data, rsi_length)
     data["RSI_MA"] = MA_for_indicators(data, "RSI", rsi_ma_length)
     data["MA"] = MA(data, ma_length)
@@ -171,12 +179,15 @@ def channel_breakout_signal(
     timeframe: str = "5m",
     length: int = 5,
     atr_length: int = 100,
-    ma_length: int = 100
+    ma_length: int = 100,
+    limit: int = 1500,
+    data: pd.DataFrame | None = None
 ) -> bool:
     """This Function checks if the market is in an up-trend pullback"""
     if "/" in instrument:
         instrument = "".join(instrument.split("/"))
-    data = get_data(instrument=instrument, interval=timeframe)
+    if data is None:
+        data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     upper_bound = data.High.rolling(length).max()
     lower_bound = data.Low.rolling(length).min()
     print(data)
@@ -217,11 +228,14 @@ def engulfing_signal(
     instrument: str = "ETHUSDT",
     timeframe: str = "5m",
     atr_length: int = 100,
+    limit: int = 1500,
+    data: pd.DataFrame | None = None
 ) -> bool:
     """This Function checks if the market is in an up-trend pullback"""
     if "/" in instrument:
         instrument = "".join(instrument.split("/"))
-    data = get_data(instrument=instrument, interval=timeframe)
+    if data is None:
+        data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     print(data)
     data["ATR"] = ATR(data, atr_length)
     data["ENGULFING"] = ENGULFING(data)
@@ -255,7 +269,11 @@ def htf_range_ltf_mean_reversion_signal(
     htf_timeframe: str = "4h",
     rsi_len: int = 14,
     range_len: int = 20,
-    atr_length: int = 100
+    atr_length: int = 100,
+    limit: int = 1500,
+    htf_limit: int = 1500,
+    data: pd.DataFrame | None = None,
+    htf: pd.DataFrame | None = None
 ) -> dict:
     """
     HTF range detection + LTF mean reversion entry
@@ -265,7 +283,8 @@ def htf_range_ltf_mean_reversion_signal(
         instrument = "".join(instrument.split("/"))
 
     # ===== LTF DATA =====
-    data = get_data(instrument=instrument, interval=timeframe)
+    if data is None:
+        data = get_data(instrument=instrument, interval=timeframe, limit=limit)
 
     print("Timeframe: ", timeframe, " for instrument: ", instrument)
     print(data)
@@ -273,17 +292,14 @@ def htf_range_ltf_mean_reversion_signal(
     data["ATR"] = ATR(data, atr_length)
 
     # RSI
-    delta = data.Close.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    rs = gain.rolling(rsi_len).mean() / loss.rolling(rsi_len).mean()
-    data["RSI"] = 100 - (100 / (1 + rs))
+    data["RSI"] = SIMPLE_RSI(data, rsi_len, True)
 
     # Latest confirmed LTF close
     latest_close = data["Close"].values[-2]
 
     # ===== HTF DATA =====
-    htf = get_data(instrument=instrument, interval=htf_timeframe)
+    if htf is None:
+        htf = get_data(instrument=instrument, interval=htf_timeframe, limit=htf_limit)
 
     htf["range"] = (htf.High - htf.Low) / htf.Close
     htf["is_range"] = htf["range"] < htf["range"].rolling(range_len).mean()
@@ -326,7 +342,11 @@ def htf_rsi_ltf_bullish_dec_volume_signal(
     htf_timeframe: str = "4h",
     rsi_len: int = 14,
     sma_len: int = 50,
-    atr_length: int = 100
+    atr_length: int = 100,
+    limit: int = 1500,
+    htf_limit: int = 1500,
+    data: pd.DataFrame | None = None,
+    htf: pd.DataFrame | None = None
 ) -> dict:
     """
     HTF RSI bullish regime + LTF bearish pullback with volume contraction
@@ -336,7 +356,8 @@ def htf_rsi_ltf_bullish_dec_volume_signal(
         instrument = "".join(instrument.split("/"))
 
     # ===== LTF DATA =====
-    data = get_data(instrument=instrument, interval=timeframe)
+    if data is None:
+        data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     print("Timeframe: ", timeframe, " for instrument: ", instrument)
     print(data)
     
@@ -347,14 +368,11 @@ def htf_rsi_ltf_bullish_dec_volume_signal(
     latest_sma = data["SMA"].values[-2]
 
     # ===== HTF DATA =====
-    htf = get_data(instrument=instrument, interval=htf_timeframe)
+    if htf is None:
+        htf = get_data(instrument=instrument, interval=htf_timeframe, limit=htf_limit)
 
     # HTF RSI
-    delta = htf.Close.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    rs = gain.rolling(rsi_len).mean() / loss.rolling(rsi_len).mean()
-    htf["RSI"] = 100 - (100 / (1 + rs))
+    htf["RSI"] = SIMPLE_RSI(htf, rsi_len, True)
 
     # Last confirmed HTF candle
     htf_rsi = htf["RSI"].values[-2]
@@ -391,7 +409,11 @@ def htf_rsi_ltf_bearish_dec_volume_signal(
     rsi_len: int = 14,
     sma_len: int = 50,
     lookback_len: int = 15,
-    atr_length: int = 100
+    atr_length: int = 100,
+    limit: int = 1500,
+    htf_limit: int = 1500,
+    data: pd.DataFrame | None = None,
+    htf: pd.DataFrame | None = None
 ) -> dict:
     """
     HTF RSI bearish regime + LTF bullish push with volume contraction (short setup)
@@ -401,7 +423,8 @@ def htf_rsi_ltf_bearish_dec_volume_signal(
         instrument = "".join(instrument.split("/"))
 
     # ===== LTF DATA =====
-    data = get_data(instrument=instrument, interval=timeframe)
+    if data is None:
+        data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     print("Timeframe: ", timeframe, " for instrument: ", instrument)
     print(data)
     data["ATR"] = ATR(data, atr_length)
@@ -415,7 +438,8 @@ def htf_rsi_ltf_bearish_dec_volume_signal(
     latest_high = data["High"].values[-2]
 
     # ===== HTF DATA =====
-    htf = get_data(instrument=instrument, interval=htf_timeframe)
+    if htf is None:
+        htf = get_data(instrument=instrument, interval=htf_timeframe, limit=htf_limit)
 
     # HTF RSI
     htf["RSI"] = RSI(htf, rsi_len)
@@ -466,7 +490,11 @@ def htf_rsi_ltf_walk_bb_signal(
     rsi_len: int = 14,
     bb_len: int = 20,
     bb_std: float = 2.0,
-    atr_length: int = 100
+    atr_length: int = 100,
+    limit: int = 1500,
+    htf_limit: int = 1500,
+    data: pd.DataFrame | None = None,
+    htf: pd.DataFrame | None = None
 ) -> dict:
     """
     HTF RSI regime + LTF Bollinger Band walk (trend continuation)
@@ -476,7 +504,8 @@ def htf_rsi_ltf_walk_bb_signal(
         instrument = "".join(instrument.split("/"))
 
     # ===== LTF DATA =====
-    data = get_data(instrument=instrument, interval=timeframe)
+    if data is None:
+        data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     print("Timeframe: ", timeframe, " for instrument: ", instrument)
     print(data)
     
@@ -494,15 +523,11 @@ def htf_rsi_ltf_walk_bb_signal(
     prev_price = data.Close.values[-3]
 
     # ===== HTF DATA =====
-    htf = get_data(instrument=instrument, interval=htf_timeframe)
+    if htf is None:
+        htf = get_data(instrument=instrument, interval=htf_timeframe, limit=htf_limit)
 
     # HTF RSI
-    delta = htf.Close.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    rs = gain.rolling(rsi_len).mean() / loss.rolling(rsi_len).mean()
-
-    htf["RSI"] = 100 - (100 / (1 + rs))
+    htf["RSI"] = SIMPLE_RSI(htf, rsi_len, True)
 
     # Last confirmed HTF candle
     htf_rsi = htf["RSI"].values[-2]
@@ -549,7 +574,11 @@ def htf_ltf_sync_rsi_signal(
     htf_timeframe: str = "1h",
     rsi_len: int = 14,
     rsi_ma_len: int = 20,
-    atr_length: int = 100
+    atr_length: int = 100,
+    limit: int = 1500,
+    htf_limit: int = 1500,
+    data: pd.DataFrame | None = None,
+    htf: pd.DataFrame | None = None
 ) -> dict:
     """
     Sync RSI strategy:
@@ -561,7 +590,8 @@ def htf_ltf_sync_rsi_signal(
         instrument = "".join(instrument.split("/"))
 
     # ===== LTF DATA =====
-    data = get_data(instrument=instrument, interval=timeframe)
+    if data is None:
+        data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     print("Timeframe: ", timeframe, " for instrument: ", instrument)
     print(data)
 
@@ -576,7 +606,8 @@ def htf_ltf_sync_rsi_signal(
     price = data.Close.values[-2]
 
     # ===== HTF DATA (1H) =====
-    htf = get_data(instrument=instrument, interval=htf_timeframe)
+    if htf is None:
+        htf = get_data(instrument=instrument, interval=htf_timeframe, limit=htf_limit)
 
     htf_rsi = RSI(htf, rsi_len, True)
         
@@ -625,17 +656,23 @@ def htf_macd_ltf_channel_breakout_signal(
     macd_fast: int = 12,
     macd_slow: int = 26,
     macd_signal: int = 9,
+    limit: int = 1500,
+    htf_limit: int = 1500,
+    data: pd.DataFrame | None = None,
+    htf: pd.DataFrame | None = None
 ):
     if "/" in instrument:
         instrument = instrument.replace("/", "")
 
     # === LTF data ===
-    data = get_data(instrument=instrument, interval=timeframe)
+    if data is None:
+        data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     print("Timeframe: ", timeframe, " for instrument: ", instrument)
     print(data)
 
     # === HTF data ===
-    htf = get_data(instrument=instrument, interval=htf_timeframe)
+    if htf is None:
+        htf = get_data(instrument=instrument, interval=htf_timeframe, limit=htf_limit)
 
 
     # === Indicators ===
@@ -694,17 +731,23 @@ def htf_ltf_sync_cci_signal(
     cci_period: int = 20,
     htf_cci_period: int = 50,
     atr_period: int = 100,
+    limit: int = 1500,
+    htf_limit: int = 1500,
+    data: pd.DataFrame | None = None,
+    htf: pd.DataFrame | None = None
 ):
     if "/" in instrument:
         instrument = instrument.replace("/", "")
 
     # === LTF data ===
-    data = get_data(instrument=instrument, interval=timeframe)
+    if data is None:
+        data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     print("Timeframe: ", timeframe, " for instrument: ", instrument)
     print(data)
 
     # === HTF data ===
-    htf = get_data(instrument=instrument, interval=htf_timeframe)
+    if htf is None:
+        htf = get_data(instrument=instrument, interval=htf_timeframe, limit=htf_limit)
 
     # === Indicators ===
     cci = CCI(data, cci_period, True)
@@ -748,17 +791,23 @@ def htf_rsi_ltf_channel_breakout_signal(
     rsi_len: int = 14,
     atr_period: int = 100,
     length: int = 15,
+    limit: int = 1500,
+    htf_limit: int = 1500,
+    data: pd.DataFrame | None = None,
+    htf: pd.DataFrame | None = None
 ):
     if "/" in instrument:
         instrument = instrument.replace("/", "")
 
     # === LTF data ===
-    data = get_data(instrument=instrument, interval=timeframe)
+    if data is None:
+        data = get_data(instrument=instrument, interval=timeframe, limit=limit)
     print("Timeframe: ", timeframe, " for instrument: ", instrument)
     print(data)
 
     # === HTF data ===
-    htf = get_data(instrument=instrument, interval=htf_timeframe)
+    if htf is None:
+        htf = get_data(instrument=instrument, interval=htf_timeframe, limit=htf_limit)
 
     # === Indicators ===
     rsi_htf = RSI(htf, rsi_len, True)
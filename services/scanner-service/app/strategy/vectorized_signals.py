@@ -0,0 +1,344 @@
+import numpy as np
+import pandas as pd
+import talib
+
+from shared.util.batch_indicator import RSI_AVERAGES
+from shared.util.indicator import (
+    RSI,
+    ATR,
+    MA,
+    ENGULFING,
+    BB,
+    MACD,
+    CCI,
+    SIMPLE_RSI
+)
+
+# Array forms of the strategies in `signals.py`. Each takes the full LTF history
+# (and the HTF history for multi timeframe strategies) as OHLCV frames with an
+# "Open time" column, oldest bar first, and returns the live dict with one
+# value per LTF bar: row j holds what the live function returns while bar j is
+# the forming candle, so [-2] reads row j - 1 and [-3] row j - 2, and the
+# entry and ATR are those of bar j - 1.
+#
+# Live, a strategy runs as bar j opens, so the forming candle has not traded
+# yet; it is taken as flat at its open. HTF reads use the HTF candle forming at
+# bar j's open time, [-2] being the last HTF candle closed by then, and an HTF
+# [-1] read uses that candle as far as it has formed: its high and low over the
+# LTF bars it spans so far, closing at bar j's open.
+
+
+def _values(data: pd.DataFrame, column: str) -> np.ndarray:
+    return np.asarray(data[column].values, dtype=np.float64)
+
+
+def _previous(values: np.ndarray, bars: int = 1) -> np.ndarray:
+    """values[j - bars] at row j, NaN before the series starts."""
+    out = np.full(len(values), np.nan)
+    if bars < len(values):
+        out[bars:] = values[:len(values) - bars]
+    return out
+
+
+def _at(values: np.ndarray, index: np.ndarray) -> np.ndarray:
+    out = np.full(len(index), np.nan)
+    valid = (index >= 0) & (index < len(values))
+    out[valid] = values[index[valid]]
+    return out
+
+
+def _htf_index(data: pd.DataFrame, htf: pd.DataFrame) -> np.ndarray:
+    """Row of the HTF candle forming when each LTF candle opens, -1 before the first."""
+    return np.searchsorted(_values(htf, "Open time"), _values(data, "Open time"), side="right") - 1
+
+
+def _crossed_above(a: np.ndarray, b) -> np.ndarray:
+    b = np.broadcast_to(b, a.shape)
+    return (_previous(a) > _previous(b)) & (_previous(a, 2) < _previous(b, 2))
+
+
+def _crossed_below(a: np.ndarray, b) -> np.ndarray:
+    b = np.broadcast_to(b, a.shape)
+    return (_previous(a) < _previous(b)) & (_previous(a, 2) > _previous(b, 2))
+
+
+def _htf_crossed_above(a: np.ndarray, b: np.ndarray, index: np.ndarray) -> np.ndarray:
+    return (_at(a, index - 1) > _at(b, index - 1)) & (_at(a, index - 2) < _at(b, index - 2))
+
+
+def _htf_crossed_below(a: np.ndarray, b: np.ndarray, index: np.ndarray) -> np.ndarray:
+    return (_at(a, index - 1) < _at(b, index - 1)) & (_at(a, index - 2) > _at(b, index - 2))
+
+
+def _channel_breakout(data: pd.DataFrame, length: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The live `High[-1] >= High.rolling(length).max()[-1]` check (and its low side)
+    on a forming candle flat at its open: the open reaching the extreme of the
+    length - 1 closed bars before it.
+    """
+    open_ = _values(data, "Open")
+    if length <= 1:
+        everywhere = np.ones(len(open_), dtype=bool)
+        return everywhere, everywhere
+    high = pd.Series(_values(data, "High")).rolling(length - 1).max().shift(1).values
+    low = pd.Series(_values(data, "Low")).rolling(length - 1).min().shift(1).values
+    return open_ >= high, open_ <= low
+
+
+def _forming_htf_candle(data: pd.DataFrame, index: np.ndarray):
+    """High, low and close of the HTF candle forming at each LTF bar's open."""
+    open_ = _values(data, "Open")
+    groups = pd.Series(index)
+    high = pd.Series(_values(data, "High")).groupby(groups).cummax().groupby(groups).shift(1)
+    low = pd.Series(_values(data, "Low")).groupby(groups).cummin().groupby(groups).shift(1)
+    return np.fmax(high.values, open_), np.fmin(low.values, open_), open_
+
+
+def _forming_htf_cci(data: pd.DataFrame, htf: pd.DataFrame, index: np.ndarray, N: int) -> np.ndarray:
+    """talib.CCI of the HTF series ending in the candle forming at each LTF bar."""
+    high, low, close = _forming_htf_candle(data, index)
+    typical = (_values(htf, "High") + _values(htf, "Low") + _values(htf, "Close")) / 3
+    # the N - 1 closed HTF candles before the forming one, then the forming one
+    window = np.concatenate(
+        [
+            _at(typical, (index[:, None] + np.arange(1 - N, 0)).ravel()).reshape(len(index), N - 1),
+            ((high + low + close) / 3)[:, None],
+        ],
+        axis=1,
+    )
+    mean = window.mean(axis=1)
+    mean_deviation = np.abs(window - mean[:, None]).mean(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cci = (window[:, -1] - mean) / (0.015 * mean_deviation)
+    return np.where(mean_deviation == 0, 0.0, cci)
+
+
+def _forming_htf_rsi(data: pd.DataFrame, htf: pd.DataFrame, index: np.ndarray, N: int) -> np.ndarray:
+    """talib.RSI of the HTF series ending in the candle forming at each LTF bar."""
+    _, _, close = _forming_htf_candle(data, index)
+    average_gain, average_loss = (
+        averages[0] for averages in RSI_AVERAGES(_values(htf, "Close")[None, :], N)
+    )
+    change = close - _at(_values(htf, "Close"), index - 1)
+    gain = (_at(average_gain, index - 1) * (N - 1) + np.maximum(change, 0)) / N
+    loss = (_at(average_loss, index - 1) * (N - 1) + np.maximum(-change, 0)) / N
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 * gain / (gain + loss)
+    return np.where(gain + loss == 0, 0.0, rsi)
+
+
+def _result(long: np.ndarray, short: np.ndarray, atr: np.ndarray, data: pd.DataFrame) -> dict:
+    return {
+        "isTimeEnterLong": long,
+        "isTimeEnterShort": short & ~long,
+        "atr": _previous(np.asarray(atr, dtype=np.float64)),
+        "entry": _previous(_values(data, "Close")),
+    }
+
+
+def signal(data: pd.DataFrame, ma_length: int = 14, rsi_length: int = 14) -> dict:
+    rsi = RSI(data, rsi_length, True)
+    rsi_ma = talib.MA(rsi, ma_length)
+    long = _previous(rsi) > _previous(rsi_ma)
+    return _result(long, ~long, ATR(data, 14, True), data)
+
+
+def bullish_volume_rsi_signal(data: pd.DataFrame, ma_length: int = 14, rsi_length: int = 14) -> dict:
+    rsi = RSI(data, rsi_length, True)
+    close = _values(data, "Close")
+    volume = _values(data, "Volume")
+    long = (
+        (_previous(rsi) > 60)
+        & (_previous(close) < _previous(close, 2))
+        & (_previous(close, 2) < _previous(_values(data, "Open"), 2))
+        & (_previous(volume) < _previous(volume, 2))
+    )
+    return _result(long, np.zeros_like(long), ATR(data, 14, True), data)
+
+
+def rsi_ma_signal(
+    data: pd.DataFrame, ma_length: int = 100, rsi_length: int = 14, rsi_ma_length: int = 14
+) -> dict:
+    rsi = RSI(data, rsi_length, True)
+    rsi_ma = talib.MA(rsi, rsi_ma_length)
+    above_ma = _previous(_values(data, "Close")) >= _previous(MA(data, ma_length, True))
+    long = above_ma & _crossed_above(rsi, rsi_ma)
+    short = ~above_ma & _crossed_below(rsi, rsi_ma)
+    return _result(long, short, ATR(data, 14, True), data)
+
+
+def channel_breakout_signal(
+    data: pd.DataFrame, length: int = 5, atr_length: int = 100, ma_length: int = 100
+) -> dict:
+    breakout_up, breakout_down = _channel_breakout(data, length)
+    close = _previous(_values(data, "Close"))
+    sma = _previous(MA(data, ma_length, True))
+    return _result(
+        breakout_up & (close > sma), breakout_down & (close < sma), ATR(data, atr_length, True), data
+    )
+
+
+def engulfing_signal(data: pd.DataFrame, atr_length: int = 100) -> dict:
+    engulfing = _previous(ENGULFING(data, True))
+    return _result(engulfing == 100, engulfing == -100, ATR(data, atr_length, True), data)
+
+
+def htf_range_ltf_mean_reversion_signal(
+    data: pd.DataFrame,
+    htf: pd.DataFrame,
+    rsi_len: int = 14,
+    range_len: int = 20,
+    atr_length: int = 100,
+) -> dict:
+    index = _htf_index(data, htf)
+    htf_range = (_values(htf, "High") - _values(htf, "Low")) / _values(htf, "Close")
+    range_mean = pd.Series(htf_range).rolling(range_len).mean().values
+    is_range = _at(htf_range, index - 1) < _at(range_mean, index - 1)
+
+    rsi = _previous(SIMPLE_RSI(data, rsi_len, True))
+    return _result(is_range & (rsi < 30), is_range & (rsi > 70), ATR(data, atr_length, True), data)
+
+
+def htf_rsi_ltf_bullish_dec_volume_signal(
+    data: pd.DataFrame,
+    htf: pd.DataFrame,
+    rsi_len: int = 14,
+    sma_len: int = 50,
+    atr_length: int = 100,
+) -> dict:
+    index = _htf_index(data, htf)
+    htf_rsi = _at(SIMPLE_RSI(htf, rsi_len, True), index - 1)
+
+    close = _values(data, "Close")
+    volume = _values(data, "Volume")
+    long = (
+        (htf_rsi > 60)
+        & (_previous(close) > _previous(MA(data, sma_len, True)))
+        & (_previous(close, 2) < _previous(close, 3))
+        & (_previous(close, 3) < _previous(_values(data, "Open"), 3))
+        & (_previous(volume, 2) < _previous(volume, 3))
+    )
+    return _result(long, np.zeros_like(long), ATR(data, atr_length, True), data)
+
+
+def htf_rsi_ltf_bearish_dec_volume_signal(
+    data: pd.DataFrame,
+    htf: pd.DataFrame,
+    rsi_len: int = 14,
+    sma_len: int = 50,
+    lookback_len: int = 15,
+    atr_length: int = 100,
+) -> dict:
+    index = _htf_index(data, htf)
+    htf_rsi = _at(RSI(htf, rsi_len, True), index - 1)
+
+    close = _values(data, "Close")
+    volume = _values(data, "Volume")
+    resistance = pd.Series(close).rolling(lookback_len).max().values
+    short = (
+        (htf_rsi < 40)
+        & (_previous(close) < _previous(MA(data, sma_len, True)))
+        & (_previous(_values(data, "High")) >= _previous(resistance))
+        & (_previous(close) > _previous(close, 2))
+        & (_previous(close, 2) > _previous(close, 3))
+        & (_previous(close, 3) > _previous(close, 4))
+        & (_previous(volume) < _previous(volume, 2))
+        & (_previous(volume, 2) < _previous(volume, 3))
+    )
+    return _result(np.zeros_like(short), short, ATR(data, atr_length, True), data)
+
+
+def htf_rsi_ltf_walk_bb_signal(
+    data: pd.DataFrame,
+    htf: pd.DataFrame,
+    rsi_len: int = 14,
+    bb_len: int = 20,
+    bb_std: float = 2.0,
+    atr_length: int = 100,
+) -> dict:
+    index = _htf_index(data, htf)
+    htf_rsi = _at(SIMPLE_RSI(htf, rsi_len, True), index - 1)
+
+    upper, middle, lower = BB(data, bb_len, bb_std, True)
+    close = _values(data, "Close")
+    long = (
+        (htf_rsi > 60)
+        & (_previous(close) > _previous(upper))
+        & (_previous(close, 2) > _previous(upper, 2))
+    )
+    short = (
+        (htf_rsi < 40)
+        & (_previous(close) < _previous(lower))
+        & (_previous(close, 2) < _previous(lower, 2))
+    )
+    return _result(long, short, ATR(data, atr_length, True), data)
+
+
+def htf_ltf_sync_rsi_signal(
+    data: pd.DataFrame,
+    htf: pd.DataFrame,
+    rsi_len: int = 14,
+    rsi_ma_len: int = 20,
+    atr_length: int = 100,
+) -> dict:
+    index = _htf_index(data, htf)
+    htf_rsi = RSI(htf, rsi_len, True)
+    htf_rsi_ma = pd.Series(htf_rsi).rolling(rsi_ma_len).mean().values
+    htf_cross = _htf_crossed_above(htf_rsi, htf_rsi_ma, index)
+
+    rsi = RSI(data, rsi_len, True)
+    rsi_ma = talib.MA(rsi, rsi_ma_len)
+    # like the live function, the short side also requires the HTF cross up
+    long = htf_cross & _crossed_above(rsi, rsi_ma)
+    short = htf_cross & _crossed_below(rsi, rsi_ma)
+    return _result(long, short, ATR(data, atr_length, True), data)
+
+
+def htf_macd_ltf_channel_breakout_signal(
+    data: pd.DataFrame,
+    htf: pd.DataFrame,
+    length: int = 15,
+    atr_period: int = 100,
+    macd_fast: int = 12,
+    macd_slow: int = 26,
+    macd_signal: int = 9,
+) -> dict:
+    index = _htf_index(data, htf)
+    macd, macd_signal_line, _ = MACD(htf, macd_fast, macd_slow, macd_signal, True)
+
+    breakout_up, breakout_down = _channel_breakout(data, length)
+    long = _htf_crossed_above(macd, macd_signal_line, index) & breakout_up
+    short = _htf_crossed_below(macd, macd_signal_line, index) & breakout_down
+    return _result(long, short, ATR(data, atr_period, True), data)
+
+
+def htf_ltf_sync_cci_signal(
+    data: pd.DataFrame,
+    htf: pd.DataFrame,
+    cci_period: int = 20,
+    htf_cci_period: int = 50,
+    atr_period: int = 100,
+) -> dict:
+    index = _htf_index(data, htf)
+    htf_cci = _forming_htf_cci(data, htf, index, htf_cci_period)
+
+    cci = CCI(data, cci_period, True)
+    long = (htf_cci > 100) & _crossed_above(cci, -100)
+    short = (htf_cci < -100) & _crossed_below(cci, 100)
+    return _result(long, short, ATR(data, atr_period, True), data)
+
+
+def htf_rsi_ltf_channel_breakout_signal(
+    data: pd.DataFrame,
+    htf: pd.DataFrame,
+    rsi_len: int = 14,
+    atr_period: int = 100,
+    length: int = 15,
+) -> dict:
+    index = _htf_index(data, htf)
+    htf_rsi = _forming_htf_rsi(data, htf, index, rsi_len)
+
+    breakout_up, breakout_down = _channel_breakout(data, length)
+    long = (htf_rsi > 60) & breakout_up
+    short = (htf_rsi < 40) & breakout_down
+    return _result(long, short, ATR(data, atr_period, True), data)
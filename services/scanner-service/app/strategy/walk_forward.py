@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from shared.database import mongo
+from shared.util.backtest import backtest_report
+from shared.util.parameter_search import grid_candidates, random_candidates
+from shared.util.timeframe import interval_to_milliseconds
+from strategy import optimizer
+from strategy.backtest import load_frame, strategy_signals, window_trades
+
+
+def walk_forward_windows(
+    bars: int, train_bars: int, test_bars: int, anchored: bool = False
+) -> list[tuple[int, int, int, int]]:
+    """
+    (train_start, train_end, test_start, test_end) bar ranges, end exclusive,
+    rolling the test window over everything after the first training window.
+    Anchored windows keep training from the first bar instead of rolling.
+    """
+    windows = []
+    test_start = train_bars
+    while test_start < bars:
+        test_end = min(test_start + test_bars, bars)
+        train_start = 0 if anchored else test_start - train_bars
+        windows.append((train_start, test_start, test_start, test_end))
+        test_start = test_end
+    return windows
+
+
+def _evaluate_candidate(parameters: dict, windows: list, objective: str, min_trades: int):
+    """Train scores and test trades of one parameter set in every window."""
+    state = optimizer.worker_state
+    strategy_parameters = {**state["base_parameters"], **parameters}
+    # computed once over the whole history and shared by every window
+    signals = strategy_signals(state["strategy_name"], strategy_parameters, state["data"], state["htf"])
+
+    scores, tests = [], []
+    for train_start, train_end, test_start, test_end in windows:
+        train = window_trades(
+            strategy_parameters, state["data"], signals, train_start, train_end, state["fee_rate"]
+        )
+        scores.append(optimizer.score_report(backtest_report(train), objective, min_trades))
+        tests.append(
+            window_trades(
+                strategy_parameters, state["data"], signals, test_start, test_end, state["fee_rate"]
+            )
+        )
+    return scores, tests
+
+
+def walk_forward(
+    strategy_name: str,
+    base_parameters: dict,
+    space: dict,
+    data: pd.DataFrame,
+    htf: pd.DataFrame | None = None,
+    train_bars: int = 8640,
+    test_bars: int = 8640,
+    anchored: bool = False,
+    search: str = "grid",
+    trials: int = 100,
+    workers: int | None = None,
+    objective: str = "total_return",
+    min_trades: int = 30,
+    fee_rate: float = 0.0,
+    seed: int | None = None,
+) -> dict:
+    """
+    Re-optimizes a strategy in every training window and trades the winner on
+    the test window after it, returning the report of the joined out-of-sample
+    trades along with each fold's choice.
+
+    The same candidate parameter sets (a grid, or `trials` random draws) are
+    scored in every window, which lets each worker compute a candidate's signals
+    and indicators once over the full history and reuse them for all the
+    overlapping windows; only the trade replay is per window. Candidates run in
+    parallel over the shared memory candles of `optimizer`.
+    """
+    workers = workers or os.cpu_count() or 1
+    if search == "grid":
+        candidates = grid_candidates(space)
+    elif search == "random":
+        candidates = random_candidates(space, trials, np.random.default_rng(seed))
+    else:
+        raise ValueError(f"Unknown search for walk forward: {search}")
+
+    windows = walk_forward_windows(len(data), train_bars, test_bars, anchored)
+    data_memory, data_spec = optimizer.share_frame(data)
+    htf_memory, htf_spec = optimizer.share_frame(htf)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=optimizer.init_worker,
+            initargs=(strategy_name, base_parameters, data_spec, htf_spec, fee_rate),
+        ) as pool:
+            evaluations = list(
+                pool.map(
+                    _evaluate_candidate,
+                    candidates,
+                    repeat(windows),
+                    repeat(objective),
+                    repeat(min_trades),
+                )
+            )
+    finally:
+        for memory in (data_memory, htf_memory):
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+
+    open_time = data["Open time"].values
+    folds, out_of_sample = [], []
+    for fold, (train_start, train_end, test_start, test_end) in enumerate(windows):
+        scores = np.array([train_scores[fold] for train_scores, _ in evaluations])
+        best = int(np.argmax(scores)) if len(scores) else 0
+        chosen = bool(len(scores)) and bool(np.isfinite(scores[best]))
+        test = evaluations[best][1][fold] if chosen else None
+        if test is not None:
+            out_of_sample.append(test)
+        folds.append(
+            {
+                "train_start": int(open_time[train_start]),
+                "train_end": int(open_time[train_end - 1]),
+                "test_start": int(open_time[test_start]),
+                "test_end": int(open_time[test_end - 1]),
+                "parameters": candidates[best] if chosen else None,
+                "train_score": float(scores[best]) if chosen else None,
+                "test": backtest_report(test) if test is not None else None,
+            }
+        )
+
+    trades = {
+        key: np.concatenate([test[key] for test in out_of_sample])
+        for key in (out_of_sample[0] if out_of_sample else {})
+    }
+    report = backtest_report(trades) if trades else {"trades": 0}
+    report.update(
+        {
+            "mode": "walk_forward",
+            "strategy": strategy_name,
+            "symbol": base_parameters["symbol"],
+            "timeframe": base_parameters["timeframe"],
+            "higher_timeframe": base_parameters.get("higher_timeframe"),
+            "objective": objective,
+            "search": search,
+            "candidates": len(candidates),
+            "train_bars": train_bars,
+            "test_bars": test_bars,
+            "anchored": anchored,
+            "fee_rate": fee_rate,
+            "folds": folds,
+            # out-of-sample equity, as the running sum of trade returns at each exit
+            "equity": {
+                "time": [int(open_time[i]) for i in trades.get("exit_index", [])],
+                "value": np.cumsum(trades["return"]).tolist() if trades else [],
+            },
+        }
+    )
+    return report
+
+
+async def run_walk_forward(
+    strategy_name: str,
+    timeframe: str,
+    space: dict,
+    train_days: float,
+    test_days: float,
+    start: int | None = None,
+    end: int | None = None,
+    source: str = "spot",
+    **walk_forward_kwargs,
+) -> list[dict]:
+    """Walks forward every parameter set stored for a strategy and saves the reports."""
+    reports = []
+    strategy_param_list = await mongo.get_many_strategy_params(
+        timeframe=timeframe, collection=strategy_name
+    )
+    for strategy_parameters in strategy_param_list:
+        base_parameters = {key: value for key, value in strategy_parameters.items() if key != "_id"}
+        symbol = "".join(base_parameters["symbol"].split("/"))
+        data = load_frame(symbol, base_parameters["timeframe"], start, end, source)
+        htf = None
+        if base_parameters.get("higher_timeframe"):
+            htf = load_frame(symbol, base_parameters["higher_timeframe"], start, end, source)
+
+        bar_ms = interval_to_milliseconds(base_parameters["timeframe"])
+        report = await asyncio.to_thread(
+            walk_forward,
+            strategy_name,
+            base_parameters,
+            space,
+            data,
+            htf,
+            train_bars=int(train_days * 86_400_000 // bar_ms),
+            test_bars=int(test_days * 86_400_000 // bar_ms),
+            **walk_forward_kwargs,
+        )
+        await mongo.save_backtest_report(report)
+        print(
+            f"{strategy_name} {symbol} {base_parameters['timeframe']}: {len(report['folds'])} folds, "
+            f"{report['trades']} out-of-sample trades, return {report.get('total_return', 0.0):.2%}"
+        )
+        reports.append(report)
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward evaluation on archived candles.")
+    parser.add_argument("--collection", type=str, default="channel_breakout_sma")
+    parser.add_argument("--timeframe", type=str, default="15m")
+    parser.add_argument("--space", type=str, required=True, help="JSON search space, as for the optimizer.")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--train-days", type=float, default=90)
+    parser.add_argument("--test-days", type=float, default=30)
+    parser.add_argument("--anchored", action="store_true", help="Train from the first bar every fold.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--objective", type=str, default="total_return")
+    parser.add_argument("--min-trades", type=int, default=30)
+    parser.add_argument("--fee-rate", type=float, default=0.0)
+    parser.add_argument("--start", type=int, default=None, help="First open time, in ms.")
+    parser.add_argument("--end", type=int, default=None, help="Open time to stop before, in ms.")
+    parser.add_argument("--source", choices=["spot", "futures"], default="spot", help="Archive to read.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_walk_forward(
+            strategy_name=args.collection,
+            timeframe=args.timeframe,
+            space=optimizer.parse_space(args.space),
+            train_days=args.train_days,
+            test_days=args.test_days,
+            start=args.start,
+            end=args.end,
+            source=args.source,
+            search=args.search,
+            trials=args.trials,
+            anchored=args.anchored,
+            workers=args.workers,
+            objective=args.objective,
+            min_trades=args.min_trades,
+            fee_rate=args.fee_rate,
+            seed=args.seed,
+        )
+    )
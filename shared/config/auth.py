@@ -1,4 +1,8 @@
+import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 
 from binance_common.constants import DERIVATIVES_TRADING_USDS_FUTURES_REST_API_TESTNET_URL
 from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futures import (
@@ -7,42 +11,110 @@ from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futur
     DERIVATIVES_TRADING_USDS_FUTURES_REST_API_PROD_URL,
 )
 
+from shared.config.settings import get_settings
+
+settings = get_settings()
+
+
+class FuturesClientPool:
+    """
+    Reuses one DerivativesTradingUsdsFutures client (and its HTTP session) per
+    (environment, api_key).
+
+    Clients are kept in LRU order; the least recently used one is dropped once
+    `max_size` is exceeded, and clients idle for longer than `idle_seconds` are
+    dropped on the next lookup. A client whose secret changed is rebuilt.
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.CLIENT_POOL_MAX_SIZE,
+        idle_seconds: float = settings.CLIENT_POOL_IDLE_SECONDS,
+    ):
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._clients: OrderedDict[tuple[str, str], tuple[str, float, DerivativesTradingUsdsFutures]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self, environment: str, api_key: str, api_secret: str, base_path: str
+    ) -> DerivativesTradingUsdsFutures:
+        key = (environment, api_key)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None and entry[0] == api_secret:
+                self.hits += 1
+                self._clients[key] = (api_secret, now, entry[2])
+                self._clients.move_to_end(key)
+                return entry[2]
+
+            self.misses += 1
+            if entry is not None:
+                self._close(self._clients.pop(key)[2])
+            client = DerivativesTradingUsdsFutures(
+                config_rest_api=ConfigurationRestAPI(
+                    api_key=api_key,
+                    api_secret=api_secret,
+                    base_path=base_path,
+                )
+            )
+            self._clients[key] = (api_secret, now, client)
+            while len(self._clients) > self.max_size:
+                self._close(self._clients.popitem(last=False)[1][2])
+                self.evictions += 1
+            return client
+
+    def _evict_idle(self, now: float):
+        # entries are in LRU order, so idle ones are at the front
+        while self._clients:
+            key, (_, last_used, client) = next(iter(self._clients.items()))
+            if now - last_used <= self.idle_seconds:
+                break
+            del self._clients[key]
+            self._close(client)
+            self.evictions += 1
+
+    def _close(self, client: DerivativesTradingUsdsFutures):
+        try:
+            if client._rest_api is not None:
+                client._rest_api._session.close()
+        except Exception as e:
+            logging.error(f"FuturesClientPool close error: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+futures_client_pool = FuturesClientPool()
+
 
 def get_futures_client(api_key: str, api_secret: str) -> DerivativesTradingUsdsFutures:
-    # Create configuration for the REST API
-    configuration_rest_api = ConfigurationRestAPI(
-        api_key=api_key,
-        api_secret=api_secret,
-        base_path=DERIVATIVES_TRADING_USDS_FUTURES_REST_API_PROD_URL
+    return futures_client_pool.get(
+        "prod", api_key, api_secret, DERIVATIVES_TRADING_USDS_FUTURES_REST_API_PROD_URL
     )
 
-    # Initialize DerivativesTradingUsdsFutures client
-    client = DerivativesTradingUsdsFutures(config_rest_api=configuration_rest_api)
-    return client
-
 
 def get_futures_unauthenticated_client() -> DerivativesTradingUsdsFutures:
-    configuration_rest_api = ConfigurationRestAPI(
-    api_key=os.getenv("API_KEY", ""),
-    api_secret=os.getenv("API_SECRET", ""),
-    base_path=os.getenv(
-        "BASE_PATH", DERIVATIVES_TRADING_USDS_FUTURES_REST_API_PROD_URL
-    ),
+    return futures_client_pool.get(
+        "public",
+        os.getenv("API_KEY", ""),
+        os.getenv("API_SECRET", ""),
+        os.getenv("BASE_PATH", DERIVATIVES_TRADING_USDS_FUTURES_REST_API_PROD_URL),
     )
 
-    # Initialize DerivativesTradingUsdsFutures client
-    client = DerivativesTradingUsdsFutures(config_rest_api=configuration_rest_api)
-    return client
-
 
 def get_futures_testnet_client(api_key: str, api_secret: str) -> DerivativesTradingUsdsFutures:
-    # Create configuration for the REST API
-    configuration_rest_api = ConfigurationRestAPI(
-        api_key=api_key,
-        api_secret=api_secret,
-        base_path=DERIVATIVES_TRADING_USDS_FUTURES_REST_API_TESTNET_URL
+    return futures_client_pool.get(
+        "testnet", api_key, api_secret, DERIVATIVES_TRADING_USDS_FUTURES_REST_API_TESTNET_URL
     )
-
-    # Initialize DerivativesTradingUsdsFutures client
-    client = DerivativesTradingUsdsFutures(config_rest_api=configuration_rest_api)
-    return client
\ No newline at end of file
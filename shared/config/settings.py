@@ -20,8 +20,41 @@ class Settings:
     LOG_COLLECTION = os.getenv("LOG_COLLECTION")
     POSITION_COLLECTION = os.getenv("POSITION_COLLECTION")
     TIMEFRAME_COLLECTION = os.getenv("TIMEFRAME_COLLECTION")
+    OPTIMIZATION_COLLECTION = os.getenv("OPTIMIZATION_COLLECTION", "optimization_results")
+    SIGNAL_LEDGER_COLLECTION = os.getenv("SIGNAL_LEDGER_COLLECTION", "signal_ledger")
+    SIGNAL_LEDGER_TTL_SECONDS = int(os.getenv("SIGNAL_LEDGER_TTL_SECONDS", str(7 * 24 * 3600)))
     TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 
+    # market data settings
+    KLINE_STREAM_URL = os.getenv("KLINE_STREAM_URL", "wss://stream.binance.com:9443")
+    KLINE_STREAMS_PER_CONNECTION = int(os.getenv("KLINE_STREAMS_PER_CONNECTION", "50"))
+    CANDLE_ARCHIVE_DIR = os.getenv("CANDLE_ARCHIVE_DIR", "data/candles")
+    DEPTH_STREAM_URL = os.getenv("DEPTH_STREAM_URL", "wss://fstream.binance.com")
+    ORDER_BOOK_MAX_AGE_SECONDS = float(os.getenv("ORDER_BOOK_MAX_AGE_SECONDS", "5"))
+    EXCHANGE_INFO_TTL_SECONDS = float(os.getenv("EXCHANGE_INFO_TTL_SECONDS", "3600"))
+
+    # exchange client settings
+    CLIENT_POOL_MAX_SIZE = int(os.getenv("CLIENT_POOL_MAX_SIZE", "200"))
+    CLIENT_POOL_IDLE_SECONDS = float(os.getenv("CLIENT_POOL_IDLE_SECONDS", "1800"))
+    # listenKeys expire after 60 minutes without a keepalive
+    USER_STREAM_KEEPALIVE_SECONDS = float(os.getenv("USER_STREAM_KEEPALIVE_SECONDS", "1800"))
+    ACCOUNT_STATE_RECONCILE_SECONDS = float(os.getenv("ACCOUNT_STATE_RECONCILE_SECONDS", "300"))
+    # account state older than this is not trusted and REST is asked instead
+    ACCOUNT_STATE_MAX_AGE_SECONDS = float(os.getenv("ACCOUNT_STATE_MAX_AGE_SECONDS", "900"))
+
+    # scanner settings
+    SCANNER_THREAD_WORKERS = int(os.getenv("SCANNER_THREAD_WORKERS", "16"))
+    # indicator results kept per process before the least recently used go
+    INDICATOR_CACHE_MAX_MB = float(os.getenv("INDICATOR_CACHE_MAX_MB", "256"))
+    SCANNER_STRATEGY_TIMEOUT_SECONDS = float(os.getenv("SCANNER_STRATEGY_TIMEOUT_SECONDS", "30"))
+    # wait after a candle close for its final kline to reach the streams and REST
+    SCANNER_SETTLE_SECONDS = float(os.getenv("SCANNER_SETTLE_SECONDS", "1.0"))
+    EVENT_BUS_WORKERS = int(os.getenv("EVENT_BUS_WORKERS", "8"))
+    EVENT_BUS_MAX_PENDING = int(os.getenv("EVENT_BUS_MAX_PENDING", "10000"))
+    # users a signal is fanned out to at once, overall and per API key
+    SCANNER_FANOUT_CONCURRENCY = int(os.getenv("SCANNER_FANOUT_CONCURRENCY", "16"))
+    SCANNER_FANOUT_PER_KEY = int(os.getenv("SCANNER_FANOUT_PER_KEY", "2"))
+
     # dcabot settings
     SYMBOL = "ETH/USDT"
     TIMEFRAME = "5m"  # 5m
@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from pymongo import AsyncMongoClient
 from pymongo import MongoClient
 from pymongo import DESCENDING
+from pymongo.errors import DuplicateKeyError
 
 from shared.config.settings import get_settings
 
@@ -91,6 +92,75 @@ async def get_backtest_report(skip:int = 0, limit:int = 0):
     except Exception as e:
         print(f"The following error occurred getting users function: {e}")
 
+async def save_backtest_report(report: dict):
+    try:
+        mongo_db = await get_async_mongo_db(settings.DB_STRATEGY)
+        # Get the strategy collection
+        collection = mongo_db.get_collection(settings.STRATEGY_COLLECTION)
+        await collection.insert_one({**report, "created": datetime.now(timezone.utc)})
+    except Exception as e:
+        print(f"The following error occurred saving backtest report function: {e}")
+
+async def save_optimization_results(results: list[dict]):
+    try:
+        mongo_db = await get_async_mongo_db(settings.DB_STRATEGY)
+        # Get the optimization collection
+        collection = mongo_db.get_collection(settings.OPTIMIZATION_COLLECTION)
+        created = datetime.now(timezone.utc)
+        await collection.insert_many([{**result, "created": created} for result in results])
+    except Exception as e:
+        print(f"The following error occurred saving optimization results function: {e}")
+
+async def promote_strategy_parameters(strategy_name: str, strategy_parameters: dict):
+    """Makes a parameter set the live one for its symbol and timeframes."""
+    try:
+        mongo_db = await get_async_mongo_db(settings.DB_STRATEGY)
+        # Get the strategy collection
+        collection = mongo_db.get_collection(strategy_name)
+        selector = {
+            key: strategy_parameters[key]
+            for key in ("symbol", "timeframe", "higher_timeframe")
+            if key in strategy_parameters
+        }
+        document = {key: value for key, value in strategy_parameters.items() if key != "_id"}
+        await collection.replace_one(selector, document, upsert=True)
+    except Exception as e:
+        print(f"The following error occurred promoting strategy parameters function: {e}")
+
+async def ensure_signal_ledger_index() -> bool:
+    """
+    Expires recorded signals SIGNAL_LEDGER_TTL_SECONDS after they were emitted.
+    False when the index could not be created.
+    """
+    try:
+        mongo_db = await get_async_mongo_db(settings.DB_BOT)
+        collection = mongo_db.get_collection(settings.SIGNAL_LEDGER_COLLECTION)
+        await collection.create_index(
+            "created", expireAfterSeconds=settings.SIGNAL_LEDGER_TTL_SECONDS
+        )
+        return True
+    except Exception as e:
+        print(f"The following error occurred creating signal ledger index function: {e}")
+        return False
+
+async def record_signal(signal_id: str, signal: dict) -> bool | None:
+    """
+    Records an emitted signal under `signal_id`. False when it was recorded
+    before, None when it could not be checked.
+    """
+    try:
+        mongo_db = await get_async_mongo_db(settings.DB_BOT)
+        collection = mongo_db.get_collection(settings.SIGNAL_LEDGER_COLLECTION)
+        await collection.insert_one(
+            {"_id": signal_id, **signal, "created": datetime.now(timezone.utc)}
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+    except Exception as e:
+        print(f"The following error occurred recording signal function: {e}")
+        return None
+
 async def get_strategy_parameters(symbol:str = "ETH/USDT"):
     try:
         mongo_db = await get_async_mongo_db(settings.DB_STRATEGY)
@@ -104,13 +174,15 @@ async def get_strategy_parameters(symbol:str = "ETH/USDT"):
 
 async def get_many_strategy_params(
         skip:int = 0, limit:int = 0, 
-        timeframe:str = "15m", collection:str = "channel_breakout_sma"
+        timeframe:str | None = "15m", collection:str = "channel_breakout_sma"
 ) -> list[dict]:
     try:
         mongo_db = await get_async_mongo_db(settings.DB_STRATEGY)
         # Get the user collection
         collection = mongo_db.get_collection(collection)
-        params_cursor = collection.find({"timeframe":timeframe}).skip(skip).limit(limit)
+        # every timeframe when none is given
+        query = {"timeframe": timeframe} if timeframe else {}
+        params_cursor = collection.find(query).skip(skip).limit(limit)
         strategy_params = []
         async for document in params_cursor:
             # Map each document to a VehicleInDB instance
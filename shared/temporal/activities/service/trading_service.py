@@ -259,6 +259,8 @@ class TradingService:
     def get_position(
             self, client: DerivativesTradingUsdsFutures, symbol: str
         ) -> Optional[PositionInformationV3Response]:
+        # mark price and unrealized PnL are not on the user data stream, so
+        # position management reads them from REST rather than the account state
         open_positions = client.rest_api.position_information_v3(symbol=symbol).data()
         return open_positions[0] if open_positions else None
     
@@ -1,12 +1,16 @@
 from shared.config.auth import (
     get_futures_client, get_futures_testnet_client
 )
+from shared.util.account_state import account_state, testnet_account_state
 
 
 def get_futures_usdt_balance(api_key: str, api_secret: str) -> float:
     """
     This function gets usdt balance in the futures market.
     """
+    balance = account_state.balance(api_key, "USDT")
+    if balance is not None:
+        return balance
     client = get_futures_client(api_key=api_key, api_secret=api_secret)
     account_balances = client.rest_api.futures_account_balance_v2()
     account_balances = account_balances.data()
@@ -20,6 +24,9 @@ def get_testnet_futures_usdt_balance(api_key: str, api_secret: str) -> float:
     """
     This function gets usdt balance in the futures market.
     """
+    balance = testnet_account_state.balance(api_key, "USDT")
+    if balance is not None:
+        return balance
     client = get_futures_testnet_client(
         api_key=api_key, api_secret=api_secret
     )
@@ -0,0 +1,371 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+
+from binance_common.constants import (
+    DERIVATIVES_TRADING_USDS_FUTURES_WS_STREAMS_PROD_URL,
+    DERIVATIVES_TRADING_USDS_FUTURES_WS_STREAMS_TESTNET_URL,
+    WebsocketMode,
+)
+from binance_sdk_derivatives_trading_usds_futures.derivatives_trading_usds_futures import (
+    DerivativesTradingUsdsFutures,
+    ConfigurationWebSocketStreams,
+)
+
+from shared.config.auth import get_futures_client, get_futures_testnet_client
+from shared.config.settings import get_settings
+from shared.util.executor import worker_pools
+
+settings = get_settings()
+
+# statuses of orders still working
+OPEN_ORDER_STATUSES = {"NEW", "PARTIALLY_FILLED"}
+OPEN_ALGO_STATUSES = {"NEW", "TRIGGERING"}
+
+
+class AccountState:
+    """Balances, positions and working orders of one futures account."""
+
+    def __init__(self):
+        self.balances: dict[str, float] = {}
+        # symbol -> position side -> amount, open positions only
+        self.positions: dict[str, dict[str, float]] = {}
+        self.orders: dict[str, set[int]] = {}
+        self.algo_orders: dict[str, set[int]] = {}
+        self.stream_open = False
+        # whether a snapshot was applied since the stream last opened; events
+        # missed while it was down are only repaired by one
+        self.synced = False
+        self.reconciled_at = 0.0
+        # when the stream last changed each asset or symbol, so a snapshot
+        # requested before that change does not undo it
+        self._touched: dict[tuple[str, str], float] = {}
+
+    def is_fresh(self, max_age_seconds: float) -> bool:
+        return (
+            self.stream_open
+            and self.synced
+            and self.reconciled_at > 0.0
+            and time.monotonic() - self.reconciled_at <= max_age_seconds
+        )
+
+    def is_trading(self, symbol: str) -> bool:
+        return bool(self.positions.get(symbol) or self.orders.get(symbol) or self.algo_orders.get(symbol))
+
+    def apply_event(self, event: dict, now: float):
+        kind = event.get("e")
+        if kind == "ACCOUNT_UPDATE":
+            update = event.get("a", {})
+            for balance in update.get("B", []):
+                self.balances[balance["a"]] = float(balance["wb"])
+                self._touched[("balances", balance["a"])] = now
+            for position in update.get("P", []):
+                symbol = position["s"]
+                sides = self.positions.setdefault(symbol, {})
+                amount = float(position["pa"])
+                if amount:
+                    sides[position.get("ps", "BOTH")] = amount
+                else:
+                    sides.pop(position.get("ps", "BOTH"), None)
+                if not sides:
+                    del self.positions[symbol]
+                self._touched[("positions", symbol)] = now
+        elif kind == "ORDER_TRADE_UPDATE":
+            order = event["o"]
+            self._update_order(self.orders, "orders", order["s"], order["i"], order["X"] in OPEN_ORDER_STATUSES, now)
+        elif kind == "ALGO_UPDATE":
+            order = event["o"]
+            self._update_order(
+                self.algo_orders, "algo_orders", order["s"], order["aid"], order["X"] in OPEN_ALGO_STATUSES, now
+            )
+
+    def _update_order(self, orders: dict, kind: str, symbol: str, order_id: int, working: bool, now: float):
+        ids = orders.setdefault(symbol, set())
+        if working:
+            ids.add(order_id)
+        else:
+            ids.discard(order_id)
+        if not ids:
+            del orders[symbol]
+        self._touched[(kind, symbol)] = now
+
+    def apply_snapshot(self, requested_at: float, snapshot: dict) -> int:
+        """Replaces what the stream has not changed since `requested_at`; returns the corrections."""
+        corrections = 0
+        for kind, values in snapshot.items():
+            current = getattr(self, kind)
+            for key in set(current) | set(values):
+                if self._touched.get((kind, key), 0.0) > requested_at:
+                    continue
+                if current.get(key) != values.get(key):
+                    corrections += 1
+                    if key in values:
+                        current[key] = values[key]
+                    else:
+                        del current[key]
+        self.reconciled_at = requested_at
+        self.synced = self.stream_open
+        return corrections
+
+
+class AccountStateService:
+    """
+    Keeps the state of every tracked futures account in memory from its user
+    data stream, so pre-trade checks read a dict instead of calling REST.
+
+    Each account gets a listenKey, kept alive every `keepalive_seconds`, on a
+    shared stream connection. Its state is loaded from REST once the stream is
+    open and again every `reconcile_seconds` to repair anything the stream
+    missed; an expired listenKey or a failed keepalive reopens the stream.
+    Lookups return None while an account is not tracked, its stream is down,
+    it has not been reconciled since the stream opened or its last
+    reconciliation is older than `max_age_seconds`, and callers then ask REST.
+    """
+
+    def __init__(
+        self,
+        environment: str = "prod",
+        keepalive_seconds: float = settings.USER_STREAM_KEEPALIVE_SECONDS,
+        reconcile_seconds: float = settings.ACCOUNT_STATE_RECONCILE_SECONDS,
+        max_age_seconds: float = settings.ACCOUNT_STATE_MAX_AGE_SECONDS,
+        streams_per_connection: int = settings.KLINE_STREAMS_PER_CONNECTION,
+    ):
+        self.environment = environment
+        self.keepalive_seconds = keepalive_seconds
+        self.reconcile_seconds = reconcile_seconds
+        self.max_age_seconds = max_age_seconds
+        self.streams_per_connection = streams_per_connection
+        if environment == "testnet":
+            self.stream_url = DERIVATIVES_TRADING_USDS_FUTURES_WS_STREAMS_TESTNET_URL
+        else:
+            self.stream_url = DERIVATIVES_TRADING_USDS_FUTURES_WS_STREAMS_PROD_URL
+        self._accounts: dict[str, AccountState] = {}
+        self._secrets: dict[str, str] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._connection = None
+        self._connect_lock: asyncio.Lock | None = None
+        self._lock = threading.Lock()
+        self.counts = {
+            "events": 0,
+            "reconciliations": 0,
+            "corrections": 0,
+            "reopened": 0,
+            "hits": 0,
+            "misses": 0,
+        }
+
+    def _client(self, api_key: str, api_secret: str) -> DerivativesTradingUsdsFutures:
+        if self.environment == "testnet":
+            return get_futures_testnet_client(api_key=api_key, api_secret=api_secret)
+        return get_futures_client(api_key=api_key, api_secret=api_secret)
+
+    async def track(self, users: list):
+        """Follows the accounts of active users and stops following the others."""
+        keys = {
+            user["api_key"]: user.get("secret_key", "")
+            for user in users
+            if user.get("active", False) and user.get("api_key")
+        }
+        for api_key in list(self._tasks):
+            if keys.get(api_key) != self._secrets.get(api_key):
+                await self.untrack(api_key)
+
+        for api_key, api_secret in keys.items():
+            if api_key in self._tasks:
+                continue
+            self._secrets[api_key] = api_secret
+            with self._lock:
+                self._accounts[api_key] = AccountState()
+            self._tasks[api_key] = asyncio.get_running_loop().create_task(
+                self._follow(api_key, api_secret, pool_size=len(keys))
+            )
+
+    async def untrack(self, api_key: str):
+        task = self._tasks.pop(api_key, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._secrets.pop(api_key, None)
+        with self._lock:
+            self._accounts.pop(api_key, None)
+
+    async def _connect(self, pool_size: int):
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._connection is None:
+                configuration_ws_streams = ConfigurationWebSocketStreams(
+                    stream_url=self.stream_url,
+                    mode=WebsocketMode.POOL,
+                    pool_size=max(1, math.ceil(pool_size / self.streams_per_connection)),
+                )
+                client = DerivativesTradingUsdsFutures(config_ws_streams=configuration_ws_streams)
+                self._connection = await client.websocket_streams.create_connection()
+            return self._connection
+
+    async def _follow(self, api_key: str, api_secret: str, pool_size: int):
+        """Keeps one account's stream open, alive and reconciled, reopening it on failure."""
+        attempt = 0
+        while True:
+            stream = None
+            try:
+                client = self._client(api_key, api_secret)
+                response = await worker_pools.run(client.rest_api.start_user_data_stream)
+                connection = await self._connect(pool_size)
+                expired = asyncio.Event()
+                stream = await connection.user_data(response.data().listen_key)
+                stream.on("message", self._make_handler(api_key, expired))
+                self._set_stream_open(api_key, True)
+
+                kept_alive_at = time.monotonic()
+                await self._reconcile(api_key, client)
+                attempt = 0
+                while not expired.is_set():
+                    with self._lock:
+                        reconciled_at = self._accounts[api_key].reconciled_at
+                    due = min(kept_alive_at + self.keepalive_seconds, reconciled_at + self.reconcile_seconds)
+                    try:
+                        await asyncio.wait_for(expired.wait(), max(0.0, due - time.monotonic()))
+                    except asyncio.TimeoutError:
+                        pass
+                    if expired.is_set():
+                        break
+                    now = time.monotonic()
+                    if now >= kept_alive_at + self.keepalive_seconds:
+                        await worker_pools.run(client.rest_api.keepalive_user_data_stream)
+                        kept_alive_at = now
+                    if now >= reconciled_at + self.reconcile_seconds:
+                        await self._reconcile(api_key, client)
+                logging.warning(f"listenKey expired for {api_key[:8]}, reopening the user data stream")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"account state error for {api_key[:8]}: {e}")
+                attempt += 1
+            finally:
+                self._set_stream_open(api_key, False)
+                if stream is not None:
+                    try:
+                        await stream.unsubscribe()
+                    except Exception as e:
+                        logging.error(f"user data unsubscribe error for {api_key[:8]}: {e}")
+
+            self.counts["reopened"] += 1
+            await asyncio.sleep(min(attempt, 30))
+
+    def _make_handler(self, api_key: str, expired: asyncio.Event):
+        def handler(data):
+            try:
+                event = data if isinstance(data, dict) else data.to_dict()
+                if event.get("e") == "listenKeyExpired":
+                    expired.set()
+                    return
+                with self._lock:
+                    state = self._accounts.get(api_key)
+                    if state is not None:
+                        state.apply_event(event, time.monotonic())
+                        self.counts["events"] += 1
+            except Exception as e:
+                logging.error(f"user data handler error for {api_key[:8]}: {e}")
+
+        return handler
+
+    def _set_stream_open(self, api_key: str, stream_open: bool):
+        with self._lock:
+            state = self._accounts.get(api_key)
+            if state is not None:
+                state.stream_open = stream_open
+                state.synced = False
+
+    async def _reconcile(self, api_key: str, client: DerivativesTradingUsdsFutures):
+        requested_at = time.monotonic()
+        snapshot = await worker_pools.run(self._snapshot, client)
+        with self._lock:
+            state = self._accounts.get(api_key)
+            if state is None:
+                return
+            loaded = state.reconciled_at > 0.0
+            corrections = state.apply_snapshot(requested_at, snapshot)
+            if not loaded:
+                # the first snapshot fills the state rather than correcting it
+                corrections = 0
+            self.counts["reconciliations"] += 1
+            self.counts["corrections"] += corrections
+        if corrections:
+            logging.warning(f"Reconciliation corrected {corrections} entries for {api_key[:8]}")
+
+    def _snapshot(self, client: DerivativesTradingUsdsFutures) -> dict:
+        positions = {}
+        for position in client.rest_api.position_information_v2().data():
+            amount = float(position.position_amt or 0.0)
+            if amount:
+                positions.setdefault(position.symbol, {})[position.position_side or "BOTH"] = amount
+        orders, algo_orders = {}, {}
+        for order in client.rest_api.current_all_open_orders().data():
+            orders.setdefault(order.symbol, set()).add(order.order_id)
+        for order in client.rest_api.current_all_algo_open_orders().data():
+            algo_orders.setdefault(order.symbol, set()).add(order.algo_id)
+        return {
+            "balances": {
+                balance.asset: float(balance.balance)
+                for balance in client.rest_api.futures_account_balance_v2().data()
+            },
+            "positions": positions,
+            "orders": orders,
+            "algo_orders": algo_orders,
+        }
+
+    def _live_state(self, api_key: str) -> AccountState | None:
+        state = self._accounts.get(api_key)
+        if state is None or not state.is_fresh(self.max_age_seconds):
+            self.counts["misses"] += 1
+            return None
+        self.counts["hits"] += 1
+        return state
+
+    def is_trading(self, api_key: str, symbol: str) -> bool | None:
+        """Whether the account holds a position or working orders on `symbol`, None if unknown."""
+        with self._lock:
+            state = self._live_state(api_key)
+            return None if state is None else state.is_trading(symbol)
+
+    def has_position(self, api_key: str, symbol: str) -> bool | None:
+        """Whether the account holds a position on `symbol`, None if unknown."""
+        with self._lock:
+            state = self._live_state(api_key)
+            return None if state is None else bool(state.positions.get(symbol))
+
+    def has_open_orders(self, api_key: str, symbol: str) -> bool | None:
+        with self._lock:
+            state = self._live_state(api_key)
+            return None if state is None else bool(state.orders.get(symbol))
+
+    def has_algo_open_orders(self, api_key: str, symbol: str) -> bool | None:
+        with self._lock:
+            state = self._live_state(api_key)
+            return None if state is None else bool(state.algo_orders.get(symbol))
+
+    def balance(self, api_key: str, asset: str = "USDT") -> float | None:
+        """The account's wallet balance of `asset`, None if unknown."""
+        with self._lock:
+            state = self._live_state(api_key)
+            return None if state is None else state.balances.get(asset, 0.0)
+
+    async def close(self):
+        for api_key in list(self._tasks):
+            await self.untrack(api_key)
+        if self._connection is not None:
+            await self._connection.close_connection(close_session=True)
+            self._connection = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            live = sum(state.is_fresh(self.max_age_seconds) for state in self._accounts.values())
+            return {"accounts": len(self._accounts), "live": live, **self.counts}
+
+
+account_state = AccountStateService()
+testnet_account_state = AccountStateService(environment="testnet")
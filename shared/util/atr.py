@@ -1,5 +1,5 @@
-from shared.util.data_collector import get_data
-from shared.util.indicator import ATR
+from shared.util.candle_buffer import get_candle_buffer
+from shared.util.data_collector import get_ohlcv
 
 def get_latest_atr(
     instrument: str = "ETHUSDT",
@@ -8,6 +8,8 @@ def get_latest_atr(
 ) -> float:
     if "/" in instrument:
         instrument = "".join(instrument.split("/"))
-    data = get_data(instrument=instrument, interval=timeframe)
-    data["ATR"] = ATR(data, atr_length)
-    return data["ATR"].values[-2]
\ No newline at end of file
+    buffer = get_candle_buffer("spot", instrument, timeframe)
+    with buffer.lock:
+        data = get_ohlcv(instrument=instrument, interval=timeframe)
+        # ATR of the last closed candle, i.e. talib ATR(...)[-2]
+        return buffer.indicators.get(data, "ATR", atr_length).value
\ No newline at end of file
@@ -0,0 +1,231 @@
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+
+from shared.util.candle_archive import get_candle_archive
+from shared.util.market_client import FUTURES_REST_URL, SPOT_REST_URL
+from shared.util.ohlcv_buffer import parse_klines
+from shared.util.timeframe import interval_to_milliseconds, now_ms
+
+PAGE_LIMIT = 1000  # largest page that still costs weight 5
+
+# REST base URL and klines path of each archive source; the scanner and the
+# research tools read "spot"
+KLINE_SOURCES = {
+    "spot": (SPOT_REST_URL, "/api/v3/klines"),
+    "futures": (FUTURES_REST_URL, "/fapi/v1/klines"),
+}
+
+
+class WeightBudget:
+    """
+    Throttles requests against the exchange's rolling 1-minute request weight.
+
+    Every response reports the weight already used this minute (the value the SDK
+    exposes as `rate_limits`); once it passes `max_weight`, new requests wait for
+    the next minute window.
+    """
+
+    def __init__(self, max_weight: int = 1800):
+        self.max_weight = max_weight
+        self.used_weight = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            if self.used_weight >= self.max_weight:
+                wait_seconds = 60 - time.time() % 60 + 0.5
+                logging.info(f"Request weight {self.used_weight} used, waiting {wait_seconds:.1f}s")
+                await asyncio.sleep(wait_seconds)
+                self.used_weight = 0
+
+    def update(self, response: httpx.Response):
+        used_weight = response.headers.get("x-mbx-used-weight-1m")
+        if used_weight is not None:
+            self.used_weight = int(used_weight)
+
+
+def split_pages(start: int, end: int, interval: str, page_limit: int = PAGE_LIMIT) -> list[int]:
+    """Start open times of the pages covering [start, end)."""
+    interval_ms = interval_to_milliseconds(interval)
+    first = start - start % interval_ms
+    return list(range(first, end, page_limit * interval_ms))
+
+
+async def fetch_page(
+    client: httpx.AsyncClient,
+    budget: WeightBudget,
+    symbol: str,
+    interval: str,
+    page_start: int,
+    end: int,
+    source: str = "spot",
+) -> np.ndarray:
+    _, path = KLINE_SOURCES[source]
+    while True:
+        await budget.acquire()
+        response = await client.get(
+            path,
+            params={
+                "symbol": symbol,
+                "interval": interval,
+                "startTime": page_start,
+                "endTime": end - 1,
+                "limit": PAGE_LIMIT,
+            },
+        )
+        budget.update(response)
+        if response.status_code in (418, 429):
+            retry_after = int(response.headers.get("retry-after", "60"))
+            logging.warning(f"Rate limited on {symbol} {interval}, retrying in {retry_after}s")
+            await asyncio.sleep(retry_after)
+            continue
+        response.raise_for_status()
+        return parse_klines(response.json())
+
+
+async def backfill(
+    symbol: str,
+    interval: str,
+    start: int,
+    end: int | None = None,
+    concurrency: int = 8,
+    budget: WeightBudget | None = None,
+    client: httpx.AsyncClient | None = None,
+    source: str = "spot",
+):
+    """
+    Downloads [start, end) klines of one symbol from the `source` market into
+    the candle archive.
+
+    Pages are fetched concurrently and staged next to the archive file as they
+    complete, so a crashed run resumes from the pages it already has. Once every
+    page is staged they are merged into the archive in a single compaction.
+    """
+    archive = get_candle_archive(source, symbol, interval)
+    if archive is None:
+        raise ValueError("CANDLE_ARCHIVE_DIR is not configured")
+
+    interval_ms = interval_to_milliseconds(interval)
+    # only closed candles go into the archive
+    end = min(end or now_ms(), now_ms() - now_ms() % interval_ms)
+    page_span = PAGE_LIMIT * interval_ms
+
+    staging_dir = archive.path + ".backfill"
+    os.makedirs(staging_dir, exist_ok=True)
+    # a page is staged under the range it was requested for, so one cut short
+    # by an earlier `end` is fetched again rather than taken as done
+    page_names = {
+        page_start: f"{page_start}-{min(page_start + page_span, end)}.npy"
+        for page_start in split_pages(start, end, interval)
+    }
+    for name in os.listdir(staging_dir):
+        if name not in page_names.values():
+            os.remove(os.path.join(staging_dir, name))
+    pages = [
+        page_start
+        for page_start, name in page_names.items()
+        if not os.path.exists(os.path.join(staging_dir, name))
+    ]
+    logging.info(f"Backfilling {symbol} {interval}: {len(pages)} pages to fetch")
+
+    budget = budget or WeightBudget()
+    semaphore = asyncio.Semaphore(concurrency)
+    own_client = client is None
+    client = client or httpx.AsyncClient(
+        base_url=KLINE_SOURCES[source][0],
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        timeout=30,
+    )
+
+    async def fetch_and_stage(page_start: int):
+        async with semaphore:
+            bars = await fetch_page(
+                client, budget, symbol, interval, page_start, min(page_start + page_span, end), source
+            )
+        # write-then-rename so a half-written page is never taken as done
+        page_path = os.path.join(staging_dir, page_names[page_start])
+        with open(page_path + ".tmp", "wb") as f:
+            np.save(f, bars)
+        os.replace(page_path + ".tmp", page_path)
+
+    try:
+        await asyncio.gather(*[fetch_and_stage(page_start) for page_start in pages])
+    finally:
+        if own_client:
+            await client.aclose()
+
+    staged = [np.load(os.path.join(staging_dir, name)) for name in page_names.values()]
+    staged = [bars for bars in staged if len(bars)]
+    if staged:
+        archive.write_history(np.concatenate(staged))
+    shutil.rmtree(staging_dir)
+    logging.info(
+        f"Backfilled {symbol} {interval}: {len(archive)} bars archived, {len(archive.gaps())} gaps"
+    )
+
+
+async def backfill_many(
+    symbols: list[str],
+    interval: str,
+    start: int,
+    end: int | None = None,
+    concurrency: int = 8,
+    source: str = "spot",
+):
+    budget = WeightBudget()
+    async with httpx.AsyncClient(
+        base_url=KLINE_SOURCES[source][0],
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        timeout=30,
+    ) as client:
+        for symbol in symbols:
+            await backfill(
+                symbol,
+                interval,
+                start,
+                end,
+                concurrency=concurrency,
+                budget=budget,
+                client=client,
+                source=source,
+            )
+
+
+def _parse_date(value: str) -> int:
+    return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Backfill klines into the candle archive.")
+    parser.add_argument("--symbols", nargs="+", required=True, help="e.g. BTCUSDT ETHUSDT")
+    parser.add_argument("--interval", default="1m", help="Kline interval, e.g. 1m or 5m.")
+    parser.add_argument("--start", required=True, help="UTC start date, e.g. 2023-01-01.")
+    parser.add_argument("--end", default=None, help="UTC end date. Default is now.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--source",
+        choices=sorted(KLINE_SOURCES),
+        default="spot",
+        help="Market to download from. Default is spot, which the scanner and research tools read.",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        backfill_many(
+            symbols=args.symbols,
+            interval=args.interval,
+            start=_parse_date(args.start),
+            end=_parse_date(args.end) if args.end else None,
+            concurrency=args.concurrency,
+            source=args.source,
+        )
+    )
@@ -0,0 +1,202 @@
+import numpy as np
+
+# Bar-level replay of the exits `LimitService.manage_position_iteration` runs on
+# a live position, one management iteration per bar at its close:
+# - the STOP_MARKET placed at entry (entry -/+ ATR x sl_multiplier) closes the
+#   whole position as soon as a bar trades through it, at the stop or the open
+#   if the bar gapped past it;
+# - once the close reaches the take profit price (entry +/- ATR x
+#   tp_multiplier, on the latest ATR), a limit order for half the position is
+#   placed at that close. It fills when a later bar trades back to its price; an
+#   order still unfilled after 10 iterations is cancelled, and the iteration
+#   count restarts at 1 like the live `profit_count`. Half is only taken once;
+# - when the close crosses the trailing stop, the rest of the position is
+#   closed at that close. Otherwise the ATR is refreshed from the bar and the
+#   trail ratchets to close -/+ ATR x tp_multiplier, as live passes
+#   `atr_take_profit_mul` to `get_current_atr_trailing_stop`. The trail starts
+#   at the initial stop.
+# A bar that reaches both the stop and the take profit price is assumed to hit
+# the stop first.
+
+TAKE_PROFIT_MAX_ITERATIONS = 10
+
+EXIT_STOP = 0
+EXIT_TRAILING = 1
+EXIT_END_OF_DATA = 2
+EXIT_REASONS = {EXIT_STOP: "stop", EXIT_TRAILING: "trailing", EXIT_END_OF_DATA: "end_of_data"}
+
+
+def simulate_trades(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    atr: np.ndarray,
+    entry_index: np.ndarray,
+    side: np.ndarray,
+    entry_atr: np.ndarray,
+    sl_multiplier: float,
+    tp_multiplier: float,
+    fee_rate: float = 0.0,
+) -> dict[str, np.ndarray]:
+    """
+    Replays the live exits for every trade at once, entering at the open of bar
+    `entry_index` (+1 long, -1 short). All open trades advance one bar per step,
+    so the work per step is a handful of array operations over the trades still
+    open, and the number of steps is the longest holding time.
+
+    Returns per trade arrays: exit_index, exit_price, exit_reason, take_profit
+    (whether half was taken) and return, the fraction of the entry notional won
+    or lost net of `fee_rate` per side.
+    """
+    entry_index = np.asarray(entry_index, dtype=np.int64)
+    side = np.asarray(side, dtype=np.float64)
+    entry_atr = np.asarray(entry_atr, dtype=np.float64)
+    trades = len(entry_index)
+    bars = len(close)
+
+    entry_price = open_[entry_index]
+    stop = entry_price - side * entry_atr * sl_multiplier
+    trail = stop.copy()
+    atr_value = entry_atr.copy()
+    has_order = np.zeros(trades, dtype=bool)
+    order_price = np.zeros(trades)
+    order_count = np.zeros(trades, dtype=np.int64)
+    take_profit = np.zeros(trades, dtype=bool)
+    take_profit_price = np.full(trades, np.nan)
+
+    exit_index = np.full(trades, bars - 1, dtype=np.int64)
+    exit_price = np.full(trades, np.nan)
+    exit_reason = np.full(trades, EXIT_END_OF_DATA, dtype=np.int64)
+
+    active = np.arange(trades)
+    step = 0
+    while len(active):
+        bar = entry_index[active] + step
+        ended = bar >= bars
+        if ended.any():
+            exit_price[active[ended]] = close[-1]
+            active, bar = active[~ended], bar[~ended]
+            if not len(active):
+                break
+        direction = side[active]
+
+        # a pending take profit fills on any later bar trading back to its price
+        filled = has_order[active] & np.where(
+            direction > 0, high[bar] >= order_price[active], low[bar] <= order_price[active]
+        )
+
+        # the exchange side stop
+        stopped = np.where(direction > 0, low[bar] <= stop[active], high[bar] >= stop[active])
+        if stopped.any():
+            closed = active[stopped]
+            gap_price = np.where(
+                direction[stopped] > 0,
+                np.minimum(open_[bar[stopped]], stop[closed]),
+                np.maximum(open_[bar[stopped]], stop[closed]),
+            )
+            exit_index[closed] = bar[stopped]
+            exit_price[closed] = gap_price
+            exit_reason[closed] = EXIT_STOP
+            keep = ~stopped
+            active, bar, direction, filled = active[keep], bar[keep], direction[keep], filled[keep]
+
+        price = close[bar]
+        take_profit[active[filled]] = True
+        take_profit_price[active[filled]] = order_price[active[filled]]
+        has_order[active[filled]] = False
+
+        # place the half take profit at the close reaching the target
+        target = entry_price[active] + direction * tp_multiplier * atr_value[active]
+        place = (direction * (price - target) >= 0) & ~take_profit[active] & ~has_order[active]
+        placed = active[place]
+        has_order[placed] = True
+        order_price[placed] = price[place]
+
+        # give up on a take profit order after 10 iterations
+        waiting = has_order[active] | filled
+        expired = waiting & ~filled & (order_count[active] >= TAKE_PROFIT_MAX_ITERATIONS)
+        has_order[active[expired]] = False
+        order_count[active[expired]] = 0
+        order_count[active[waiting]] += 1
+
+        crossed = direction * (price - trail[active]) <= 0
+        if crossed.any():
+            closed = active[crossed]
+            exit_index[closed] = bar[crossed]
+            exit_price[closed] = price[crossed]
+            exit_reason[closed] = EXIT_TRAILING
+        running, bar, direction, price = active[~crossed], bar[~crossed], direction[~crossed], price[~crossed]
+        atr_value[running] = atr[bar]
+        candidate = price - direction * atr[bar] * tp_multiplier
+        trail[running] = np.where(
+            direction > 0,
+            np.fmax(candidate, trail[running]),
+            np.fmin(candidate, trail[running]),
+        )
+
+        active = running
+        step += 1
+
+    half = np.where(take_profit, 0.5, 0.0)
+    take_profit_price = np.where(take_profit, take_profit_price, exit_price)
+    gross = side * (half * (take_profit_price - entry_price) + (1 - half) * (exit_price - entry_price))
+    fees = fee_rate * (entry_price + half * take_profit_price + (1 - half) * exit_price)
+    return {
+        "entry_index": entry_index,
+        "entry_price": entry_price,
+        "side": side,
+        "exit_index": exit_index,
+        "exit_price": exit_price,
+        "exit_reason": exit_reason,
+        "take_profit": take_profit,
+        "return": (gross - fees) / entry_price,
+    }
+
+
+def select_trades(entry_index: np.ndarray, exit_index: np.ndarray) -> np.ndarray:
+    """
+    Indices of the trades taken when only one position per symbol can be open:
+    starting from the first signal, the next trade is the first signal after
+    the previous one exits. `entry_index` must be sorted.
+    """
+    taken = []
+    position = 0
+    while position < len(entry_index):
+        taken.append(position)
+        position = int(np.searchsorted(entry_index, exit_index[position], side="right"))
+    return np.asarray(taken, dtype=np.int64)
+
+
+def signal_entries(signals: dict, open_: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Entry bars, sides and ATRs from the array form of a strategy signal."""
+    long = np.asarray(signals["isTimeEnterLong"], dtype=bool)
+    short = np.asarray(signals["isTimeEnterShort"], dtype=bool)
+    atr = np.asarray(signals["atr"], dtype=np.float64)
+    entry_index = np.flatnonzero((long | short) & np.isfinite(atr) & (atr > 0) & np.isfinite(open_))
+    side = np.where(long[entry_index], 1.0, -1.0)
+    return entry_index, side, atr[entry_index]
+
+
+def backtest_report(trades: dict) -> dict:
+    returns = trades["return"]
+    wins = returns > 0
+    equity = np.cumsum(returns)
+    drawdown = np.maximum.accumulate(np.concatenate([[0.0], equity]))[1:] - equity
+    gross_loss = -returns[~wins].sum()
+    return {
+        "trades": int(len(returns)),
+        "wins": int(wins.sum()),
+        "win_rate": float(wins.mean()) if len(returns) else 0.0,
+        "total_return": float(returns.sum()),
+        "average_return": float(returns.mean()) if len(returns) else 0.0,
+        "profit_factor": float(returns[wins].sum() / gross_loss) if gross_loss > 0 else None,
+        "max_drawdown": float(drawdown.max()) if len(returns) else 0.0,
+        "take_profit_rate": float(trades["take_profit"].mean()) if len(returns) else 0.0,
+        "average_bars_held": (
+            float((trades["exit_index"] - trades["entry_index"]).mean()) if len(returns) else 0.0
+        ),
+        "exit_reasons": {
+            name: int((trades["exit_reason"] == code).sum()) for code, name in EXIT_REASONS.items()
+        },
+    }
@@ -0,0 +1,164 @@
+import numpy as np
+import talib
+
+from shared.util.ohlcv_buffer import OHLCV_COLUMNS, OHLCVBuffer
+
+# Kernels over (symbol x bar) float64 matrices: one row per symbol, oldest bar
+# first. Every output has the input's shape, with NaN where talib (or pandas,
+# for the rolling forms) has no value yet, so row i matches the single-series
+# function of the same name in `shared/util/indicator.py` run on symbol i.
+# The talib forms run talib row by row, which is faster than any whole-matrix
+# numpy equivalent; numpy is only used where it beats the per-row loop (the
+# rolling extremes, and SIMPLE_RSI, whose single-series form runs on pandas).
+
+
+def stack_ohlcv(buffers: list[OHLCVBuffer], limit: int | None = None) -> dict[str, np.ndarray]:
+    """
+    Stacks the newest bars of several buffers into one (symbols, bars) matrix per
+    OHLCV column. Rows are cut to the shortest buffer so every row is the same
+    length and no kernel has to deal with padding.
+    """
+    length = min(len(buffer) for buffer in buffers)
+    if limit is not None:
+        length = min(length, limit)
+    return {
+        name: np.stack([buffer.column(i, length) for buffer in buffers])
+        for i, name in enumerate(OHLCV_COLUMNS)
+    }
+
+
+def _window_totals(values: np.ndarray, N: int) -> np.ndarray:
+    totals = np.cumsum(values, axis=1)
+    return np.concatenate([totals[:, N - 1:N], totals[:, N:] - totals[:, :-N]], axis=1)
+
+
+def _rolling_sum(values: np.ndarray, N: int) -> np.ndarray:
+    """Window sums, NaN wherever the window holds a NaN (pandas min_periods=N)."""
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] < N:
+        return out
+    missing = np.isnan(values)
+    if missing.any():
+        sums = _window_totals(np.where(missing, 0.0, values), N)
+        sums[_window_totals(missing, N) > 0] = np.nan
+    else:
+        sums = _window_totals(values, N)
+    out[:, N - 1:] = sums
+    return out
+
+
+def _per_row(function, *matrices: np.ndarray):
+    """Runs a single-series talib function on every row and stacks the outputs."""
+    rows = [
+        function(*[np.ascontiguousarray(matrix[i]) for matrix in matrices])
+        for i in range(len(matrices[0]))
+    ]
+    if rows and isinstance(rows[0], tuple):
+        return tuple(np.stack(output) for output in zip(*rows))
+    return np.stack(rows) if rows else np.full(matrices[0].shape, np.nan)
+
+
+def SMA(close: np.ndarray, N: int = 20) -> np.ndarray:
+    return _per_row(lambda values: talib.SMA(values, N), close)
+
+
+def _rolling_mean(close: np.ndarray, N: int) -> np.ndarray:
+    # summing offsets from each row's first bar keeps the running sums small
+    origin = np.nan_to_num(close[:, :1])
+    return _rolling_sum(close - origin, N) / N + origin
+
+
+def _rolling_extreme(values: np.ndarray, N: int, extreme) -> np.ndarray:
+    """
+    Window max/min from two overlapping power-of-two windows, where a window of
+    2w is built from two of w, so the cost is O(log N) passes over the matrix.
+    """
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] < N:
+        return out
+    window = 1
+    current = values
+    while window * 2 <= N:
+        current = extreme(current[:, :-window], current[:, window:])
+        window *= 2
+    # current[:, i] now covers bars i .. i + window - 1
+    out[:, N - 1:] = extreme(current[:, :values.shape[1] - N + 1], current[:, N - window:])
+    return out
+
+
+def ROLLING_MAX(values: np.ndarray, N: int) -> np.ndarray:
+    """Like `Series.rolling(N).max()`."""
+    return _rolling_extreme(values, N, np.maximum)
+
+
+def ROLLING_MIN(values: np.ndarray, N: int) -> np.ndarray:
+    """Like `Series.rolling(N).min()`."""
+    return _rolling_extreme(values, N, np.minimum)
+
+
+def BB(close: np.ndarray, N: int = 10, std: float = 2) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return _per_row(lambda values: talib.BBANDS(values, N, std, std), close)
+
+
+def _wilder(values: np.ndarray, N: int, first: int) -> np.ndarray:
+    """
+    Wilder smoothing of the non-negative `values` along the bars, seeded with the
+    plain mean of values[first:first + N].
+
+    The recursion y[t] = a * y[t-1] + x[t] / N is evaluated in closed form per
+    block of bars, y[s+k] = a^k * (y[s] + sum(a^-j * x[s+j]) / N), so each block is
+    a single cumulative sum over all symbols. Blocks are short enough for a^-k
+    to stay finite, and the sums have no cancellation since every term is >= 0.
+    """
+    out = np.full(values.shape, np.nan)
+    seed = first + N - 1
+    bars = values.shape[1]
+    if bars <= seed:
+        return out
+    out[:, seed] = values[:, first:seed + 1].mean(axis=1)
+    decay = (N - 1) / N
+    if decay == 0:
+        out[:, seed + 1:] = values[:, seed + 1:]
+        return out
+
+    block = max(1, int(150 / -np.log10(decay)))
+    start = seed
+    while start < bars - 1:
+        chunk = values[:, start + 1:start + 1 + block]
+        steps = np.arange(1, chunk.shape[1] + 1)
+        sums = np.cumsum(chunk * decay ** -steps, axis=1) / N
+        out[:, start + 1:start + 1 + chunk.shape[1]] = decay ** steps * (out[:, start, None] + sums)
+        start += chunk.shape[1]
+    return out
+
+
+def ATR(high: np.ndarray, low: np.ndarray, close: np.ndarray, N: int = 14) -> np.ndarray:
+    return _per_row(lambda *values: talib.ATR(*values, N), high, low, close)
+
+
+def _gains_losses(close: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    change = np.full(close.shape, np.nan)
+    change[:, 1:] = np.diff(close, axis=1)
+    return np.maximum(change, 0), np.maximum(-change, 0)
+
+
+def _rsi(average_gain: np.ndarray, average_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + average_gain / average_loss)
+
+
+def RSI_AVERAGES(close: np.ndarray, N: int = 14) -> tuple[np.ndarray, np.ndarray]:
+    """The Wilder average gain and loss behind `RSI`, e.g. to extend it by one bar."""
+    gain, loss = _gains_losses(close)
+    return _wilder(gain, N, first=1), _wilder(loss, N, first=1)
+
+
+def RSI(close: np.ndarray, N: int = 14) -> np.ndarray:
+    """Wilder RSI, like talib.RSI."""
+    return _per_row(lambda values: talib.RSI(values, N), close)
+
+
+def SIMPLE_RSI(close: np.ndarray, N: int = 14) -> np.ndarray:
+    """RSI over plain rolling means, like `indicator.SIMPLE_RSI`."""
+    gain, loss = _gains_losses(close)
+    return _rsi(_rolling_mean(gain, N), _rolling_mean(loss, N))
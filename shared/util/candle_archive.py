@@ -0,0 +1,189 @@
+import argparse
+import fcntl
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from shared.config.settings import get_settings
+from shared.util.ohlcv_buffer import OHLCV_COLUMNS
+from shared.util.timeframe import interval_to_milliseconds
+
+settings = get_settings()
+
+# one record per closed candle: open time, open, high, low, close, volume
+RECORD_WIDTH = len(OHLCV_COLUMNS)
+RECORD_SIZE = RECORD_WIDTH * 8
+
+
+class CandleArchive:
+    """
+    Append-only on-disk history of closed candles for one (source, symbol, interval).
+
+    Candles are stored as fixed-width little-endian float64 records and read back
+    through a read-only memory map, so loading years of bars costs a page-in rather
+    than a parse. Appends are kept in open-time order; anything written out of order
+    (backfilled history) is merged by `compact`, which also rebuilds the gap index.
+    The scanner, the worker and backfills share archive roots, so every write also
+    holds an exclusive lock on a sidecar lock file, across processes.
+    """
+
+    def __init__(self, root: str, source: str, symbol: str, interval: str):
+        self.interval = interval
+        self.interval_ms = interval_to_milliseconds(interval)
+        directory = os.path.join(root, source, symbol)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{interval}.bin")
+        self.gap_index_path = os.path.join(directory, f"{interval}.gaps.json")
+        self.lock_path = os.path.join(directory, f"{interval}.lock")
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def _write_lock(self):
+        with self.lock:
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        return os.path.getsize(self.path) // RECORD_SIZE
+
+    def read(self, start: int | None = None, end: int | None = None) -> np.ndarray:
+        """Memory-mapped (n, 6) view of the bars with start <= open time < end."""
+        count = len(self)
+        if count == 0:
+            return np.empty((0, RECORD_WIDTH), dtype=np.float64)
+        bars = np.memmap(
+            self.path, dtype="<f8", mode="r", shape=(count, RECORD_WIDTH)
+        )
+        first = 0 if start is None else int(np.searchsorted(bars[:, 0], start))
+        last = count if end is None else int(np.searchsorted(bars[:, 0], end))
+        return bars[first:last]
+
+    def tail(self, limit: int) -> np.ndarray:
+        count = len(self)
+        return self.read()[max(0, count - limit):]
+
+    def last_open_time(self) -> int | None:
+        count = len(self)
+        if count == 0:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek((count - 1) * RECORD_SIZE)
+            return int(np.frombuffer(f.read(8), dtype="<f8")[0])
+
+    def append(self, bars: np.ndarray) -> int:
+        """Appends the closed bars newer than the archive's last bar."""
+        with self._write_lock():
+            last_open = self.last_open_time()
+            if last_open is not None:
+                bars = bars[bars[:, 0] > last_open]
+            if len(bars):
+                with open(self.path, "ab") as f:
+                    f.write(np.ascontiguousarray(bars, dtype="<f8").tobytes())
+            return len(bars)
+
+    def write_history(self, bars: np.ndarray):
+        """Appends bars in any order and compacts the archive afterwards."""
+        with self._write_lock():
+            with open(self.path, "ab") as f:
+                f.write(np.ascontiguousarray(bars, dtype="<f8").tobytes())
+            self._compact()
+
+    def compact(self):
+        with self._write_lock():
+            self._compact()
+
+    def _compact(self):
+        bars = np.array(self.read())
+        if len(bars) == 0:
+            return
+        # sort by open time and keep the last write of every candle
+        order = np.argsort(bars[:, 0], kind="stable")
+        bars = bars[order]
+        keep = np.append(bars[1:, 0] != bars[:-1, 0], True)
+        bars = bars[keep]
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(np.ascontiguousarray(bars, dtype="<f8").tobytes())
+        os.replace(tmp_path, self.path)
+
+        steps = np.diff(bars[:, 0])
+        gaps = [
+            [int(bars[i, 0]) + self.interval_ms, int(bars[i + 1, 0])]
+            for i in np.flatnonzero(steps > self.interval_ms)
+        ]
+        with open(self.gap_index_path, "w") as f:
+            json.dump(gaps, f)
+
+    def gaps(self) -> list[list[int]]:
+        """[start, end) open-time ranges missing from the archive as of the last compaction."""
+        if not os.path.exists(self.gap_index_path):
+            return []
+        with open(self.gap_index_path) as f:
+            return json.load(f)
+
+
+_archives: dict[tuple[str, str, str], CandleArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_candle_archive(
+    source: str, symbol: str, interval: str, root: str | None = settings.CANDLE_ARCHIVE_DIR
+) -> CandleArchive | None:
+    if not root:
+        return None
+    key = (source, symbol, interval)
+    with _archives_lock:
+        archive = _archives.get(key)
+        if archive is None:
+            archive = _archives[key] = CandleArchive(root, source, symbol, interval)
+        return archive
+
+
+def load_candles(
+    symbol: str,
+    interval: str,
+    start: int | None = None,
+    end: int | None = None,
+    source: str = "spot",
+) -> np.ndarray:
+    """Archived bars for offline research, as an (n, 6) memory-mapped array."""
+    archive = get_candle_archive(source, symbol, interval)
+    if archive is None:
+        raise ValueError("CANDLE_ARCHIVE_DIR is not configured")
+    return archive.read(start, end)
+
+
+def compact_all(root: str = settings.CANDLE_ARCHIVE_DIR):
+    for source in sorted(os.listdir(root)):
+        for symbol in sorted(os.listdir(os.path.join(root, source))):
+            for name in sorted(os.listdir(os.path.join(root, source, symbol))):
+                if not name.endswith(".bin"):
+                    continue
+                archive = get_candle_archive(source, symbol, name[:-4], root)
+                archive.compact()
+                logging.info(
+                    f"Compacted {source}/{symbol}/{name}: {len(archive)} bars, "
+                    f"{len(archive.gaps())} gaps"
+                )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Maintain the local candle archive.")
+    parser.add_argument("command", choices=["compact"])
+    parser.add_argument("--root", default=settings.CANDLE_ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        compact_all(args.root)
@@ -0,0 +1,176 @@
+import logging
+import threading
+
+import numpy as np
+
+from shared.util.candle_archive import CandleArchive, get_candle_archive
+from shared.util.ohlcv_buffer import OHLCVBuffer, parse_klines
+from shared.util.streaming_indicator import IndicatorSet
+from shared.util.timeframe import interval_to_milliseconds, now_ms
+
+# largest page the kline endpoint of each source serves in a single request
+PAGE_LIMITS = {"spot": 1000, "futures": 1500}
+MAX_PAGE_LIMIT = PAGE_LIMITS["spot"]
+
+
+class CandleBuffer:
+    """
+    Rolling OHLCV history for one (source, symbol, interval).
+
+    The buffer is seeded with a full download once and afterwards only asks the
+    exchange for the bars from the stored forming candle onwards, overwriting that
+    candle in place and appending whatever closed since the previous refresh.
+    With an archive attached, closed candles are persisted as they arrive and a
+    cold buffer is seeded from disk, so only the tail has to be downloaded.
+    `indicators` holds streaming indicators that follow the closed candles.
+
+    No more than `page_limit` bars are kept, the most one download returns, so
+    larger limits are served the `page_limit` newest bars.
+    """
+
+    def __init__(
+        self,
+        interval: str,
+        capacity: int = 0,
+        archive: CandleArchive | None = None,
+        page_limit: int = MAX_PAGE_LIMIT,
+    ):
+        # with no capacity given the buffer is sized by the largest limit requested
+        self.interval = interval
+        self.interval_ms = interval_to_milliseconds(interval)
+        self.page_limit = page_limit
+        self.capacity = min(capacity, page_limit)
+        self.archive = archive
+        # the last full download came back short, the exchange has no older bars
+        self.exhausted = False
+        self.data: OHLCVBuffer | None = None
+        self.close_time = 0
+        self.lock = threading.RLock()
+        self.indicators = IndicatorSet()
+        self.version = 0  # bumped on every change to `data`
+
+    def _seed_from_archive(self, limit: int) -> bool:
+        bars = np.array(self.archive.tail(self.capacity))
+        # only the contiguous run of bars leading up to the newest one is usable
+        breaks = np.flatnonzero(np.diff(bars[:, 0]) != self.interval_ms)
+        if len(breaks):
+            bars = bars[breaks[-1] + 1:]
+        # the forming candle is never archived, the tail request brings it in
+        if len(bars) < limit - 1:
+            return False
+        self.data = OHLCVBuffer(self.capacity)
+        self.data.extend(bars)
+        self.close_time = int(bars[-1, 0]) + self.interval_ms - 1
+        self.version += 1
+        return True
+
+    def _archive_closed(self, bars: np.ndarray):
+        try:
+            self.archive.append(bars)
+        except Exception as e:
+            logging.error(f"candle archive append error: {e}")
+
+    def next_request(self, limit: int) -> dict | None:
+        """
+        Returns the kline request parameters needed to serve `limit` bars, or None
+        when the stored forming candle has not closed yet.
+        """
+        limit = min(limit, self.page_limit)
+        if limit > self.capacity:
+            self.capacity = limit
+            self.data = None
+            self.exhausted = False
+
+        if self.data is None and self.archive is not None and self._seed_from_archive(limit):
+            return self._tail_request()
+
+        if self.data is None or (len(self.data) < limit and not self.exhausted):
+            return self._full_request()
+
+        if now_ms() <= self.close_time:
+            return None
+        return self._tail_request()
+
+    def _tail_request(self) -> dict:
+        last_open = int(self.data.last(0))
+        missing = (now_ms() - last_open) // self.interval_ms + 1
+        if missing > self.page_limit:
+            # too far behind for one page, start over
+            return self._full_request()
+        return {"limit": int(missing), "start_time": last_open}
+
+    def _full_request(self) -> dict:
+        self.data = None
+        return {"limit": self.capacity}
+
+    def merge(self, rows: list):
+        """Applies raw kline rows returned for the last `next_request`."""
+        bars = parse_klines(rows)
+        if len(bars) == 0:
+            return
+
+        if self.data is None:
+            self.data = OHLCVBuffer(self.capacity)
+            self.exhausted = len(bars) < self.capacity
+        else:
+            self.data.truncate_from(bars[0, 0])
+        self.data.extend(bars)
+        self.close_time = int(bars[-1, 0]) + self.interval_ms - 1
+        self.version += 1
+
+        if self.archive is not None:
+            self._archive_closed(bars[bars[:, 0] + self.interval_ms <= now_ms()])
+
+    def apply_stream_kline(
+        self,
+        open_time: int,
+        close_time: int,
+        ohlcv: list[float],
+        is_closed: bool,
+    ) -> bool:
+        """
+        Applies one kline pushed by the websocket feed. Returns False when the bar
+        does not follow the stored history, so the caller has to backfill over REST.
+        """
+        if self.data is None:
+            return False
+
+        last_open = int(self.data.last(0))
+        if open_time > last_open + self.interval_ms:
+            return False
+        if open_time < last_open:
+            return True
+
+        bar = np.array([open_time, *ohlcv], dtype=np.float64)
+        self.version += 1
+        if open_time == last_open:
+            self.data.overwrite_last(bar)
+        else:
+            self.data.append(bar)
+        self.close_time = close_time
+
+        if is_closed:
+            if self.archive is not None:
+                self._archive_closed(bar[np.newaxis, :])
+            # open the next candle flat at the close, like REST right after a close
+            close = ohlcv[3]
+            self.data.append([open_time + self.interval_ms, close, close, close, close, 0.0])
+            self.close_time = close_time + self.interval_ms
+        return True
+
+
+_buffers: dict[tuple[str, str, str], CandleBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def get_candle_buffer(source: str, symbol: str, interval: str) -> CandleBuffer:
+    key = (source, symbol, interval)
+    with _buffers_lock:
+        buffer = _buffers.get(key)
+        if buffer is None:
+            buffer = _buffers[key] = CandleBuffer(
+                interval,
+                archive=get_candle_archive(source, symbol, interval),
+                page_limit=PAGE_LIMITS.get(source, MAX_PAGE_LIMIT),
+            )
+        return buffer
@@ -0,0 +1,36 @@
+from shared.util.latency import LagStats
+from shared.util.timeframe import INTERVAL_UNIT_MS, interval_to_milliseconds, now_ms
+
+# Binance candles are aligned to the Unix epoch, except weekly ones, which open
+# on Monday 00:00 UTC; the epoch fell on a Thursday
+WEEK_OFFSET_MS = 4 * INTERVAL_UNIT_MS["d"]
+
+
+def _offset_ms(interval: str) -> int:
+    return WEEK_OFFSET_MS if interval.endswith("w") else 0
+
+
+def candle_close_ms(interval: str, time_ms: int) -> int:
+    """Close of the `interval` candle forming at `time_ms`, i.e. the next one's open time."""
+    length = interval_to_milliseconds(interval)
+    offset = _offset_ms(interval)
+    return (time_ms - offset) // length * length + length + offset
+
+
+def next_close_ms(intervals, time_ms: int | None = None) -> int:
+    """The first candle close after `time_ms` among `intervals`."""
+    time_ms = now_ms() if time_ms is None else time_ms
+    return min(candle_close_ms(interval, time_ms) for interval in intervals)
+
+
+def closing_intervals(intervals, boundary_ms: int) -> set[str]:
+    """The intervals with a candle closing exactly at `boundary_ms`."""
+    return {
+        interval
+        for interval in intervals
+        if (boundary_ms - _offset_ms(interval)) % interval_to_milliseconds(interval) == 0
+    }
+
+
+# time from a candle close to the decision taken on it, per timeframe
+decision_lag = LagStats()
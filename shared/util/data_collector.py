@@ -1,17 +1,99 @@
-import httpx
+import asyncio
 import logging
-import pandas as pd
 
 from binance_sdk_derivatives_trading_usds_futures.rest_api.models import (
     KlineCandlestickDataIntervalEnum,
 )
 
 from shared.config.auth import get_futures_unauthenticated_client
+from shared.util.candle_buffer import get_candle_buffer
+from shared.util.kline_cache import kline_cache
+from shared.util.market_client import (
+    FUTURES_REST_URL,
+    SPOT_REST_URL,
+    market_client,
+    sync_client,
+)
+from shared.util.ohlcv_buffer import OHLCVBuffer
+from shared.util.order_book import get_live_order_book
 
 
 logging.basicConfig(level=logging.INFO)
 
 
+def _kline_params(symbol: str, interval: str, limit: int, start_time: int | None) -> dict:
+    params = {"symbol": symbol, "interval": interval, "limit": limit}
+    if start_time is not None:
+        params["startTime"] = start_time
+    return params
+
+
+def _fetch_spot_klines(
+    instrument: str, interval: str, limit: int, start_time: int | None = None
+) -> list:
+    return sync_client.get(
+        f"{SPOT_REST_URL}/api/v3/klines",
+        params=_kline_params(instrument, interval, limit, start_time),
+    ).json()
+
+
+async def _async_fetch_spot_klines(
+    instrument: str, interval: str, limit: int, start_time: int | None = None
+) -> list:
+    response = await market_client.get(
+        f"{SPOT_REST_URL}/api/v3/klines",
+        params=_kline_params(instrument, interval, limit, start_time),
+    )
+    return response.json()
+
+
+async def _async_fetch_futures_klines(
+    symbol: str, timeframe: str, limit: int, start_time: int | None = None
+) -> list:
+    response = await market_client.get(
+        f"{FUTURES_REST_URL}/fapi/v1/klines",
+        params=_kline_params(symbol, timeframe, limit, start_time),
+    )
+    return response.json()
+
+
+def _fetch_futures_klines(
+    symbol: str, timeframe: str, limit: int, start_time: int | None = None
+) -> list:
+    client = get_futures_unauthenticated_client()
+    response = client.rest_api.kline_candlestick_data(
+        symbol=symbol,
+        interval=KlineCandlestickDataIntervalEnum[f"INTERVAL_{timeframe}"].value,
+        start_time=start_time,
+        limit=limit
+    )
+    return response.data()
+
+
+def get_ohlcv(instrument="BTCUSDT", interval="1h", limit=1500) -> OHLCVBuffer:
+    """
+    Refreshes and returns the spot candle buffer itself. Its column views are
+    zero-copy and stay valid until the series is updated again, so hold
+    `get_candle_buffer("spot", instrument, interval).lock` while reading them.
+    """
+    buffer = get_candle_buffer("spot", instrument, interval)
+    with buffer.lock:
+        request = buffer.next_request(limit)
+        if request is not None:
+            buffer.merge(_fetch_spot_klines(instrument, interval, **request))
+        return buffer.data
+
+
+def _cache_frame(cache_key: tuple, buffer, limit: int):
+    """Builds the frame served for `cache_key`; call with `buffer.lock` held."""
+    df_ohlc = buffer.data.to_frame(limit)
+    # identifies this exact version of the series to the indicator cache
+    df_ohlc.attrs["series"] = (*cache_key, buffer.version, len(df_ohlc))
+    # the forming candle is the last row, so the entry expires when it closes
+    kline_cache.put(cache_key, df_ohlc, buffer.close_time + 1)
+    return df_ohlc
+
+
 def get_data(
     instrument="BTCUSDT",
     interval="1h",
@@ -19,78 +101,47 @@ def get_data(
     plain=True,
     limit=1500,
 ):
-    url = (
-        "https://api.binance.com/api/v3/klines?symbol="
-        + instrument
-        + "&interval="
-        + interval
-        + "&limit="
-        + str(limit)
-    )
-    data = httpx.get(url).json()
-    df = pd.DataFrame(
-        data,
-        columns=[
-            "Open time",
-            "Open",
-            "High",
-            "Low",
-            "Close",
-            "Volume",
-            "Close time",
-            "Quote asset volume",
-            "Number of trades",
-            "Taker buy base asset volume",
-            "Taker buy quote asset volume",
-            "Ignore",
-        ],
-    )
-    df_ohlc = df.iloc[:, 0:6]
+    cache_key = ("spot", instrument, interval, limit)
+    cached = kline_cache.get(cache_key)
+    if cached is not None and plain:
+        return cached
+
+    buffer = get_candle_buffer("spot", instrument, interval)
+    with buffer.lock:
+        get_ohlcv(instrument, interval, limit)
+        df_ohlc = _cache_frame(cache_key, buffer, limit)
 
     if plain:  # in case the user wants the data with no indicators
-        return df_ohlc.astype("float64")
-    
+        return df_ohlc.copy()
+
 
 def get_candlestick_data(
     symbol: str, timeframe: str, limit: int = 1000, plain: bool = True
 ):
     try:
-        client = get_futures_unauthenticated_client()
-        response = client.rest_api.kline_candlestick_data(
-            symbol=symbol,
-            interval=KlineCandlestickDataIntervalEnum[f"INTERVAL_{timeframe}"].value,
-            limit=limit
-        )
+        cache_key = ("futures", symbol, timeframe, limit)
+        cached = kline_cache.get(cache_key)
+        if cached is not None and plain:
+            return cached
 
-        data = response.data()
-
-        df = pd.DataFrame(
-        data,
-        columns=[
-            "Open time",
-            "Open",
-            "High",
-            "Low",
-            "Close",
-            "Volume",
-            "Close time",
-            "Quote asset volume",
-            "Number of trades",
-            "Taker buy base asset volume",
-            "Taker buy quote asset volume",
-            "Ignore",
-            ],
-        )
-        df_ohlc = df.iloc[:, 0:6]
+        buffer = get_candle_buffer("futures", symbol, timeframe)
+        with buffer.lock:
+            request = buffer.next_request(limit)
+            if request is not None:
+                buffer.merge(_fetch_futures_klines(symbol, timeframe, **request))
+            df_ohlc = _cache_frame(cache_key, buffer, limit)
 
         if plain:  # in case the user wants the data with no indicators
-            return df_ohlc.astype("float64")
+            return df_ohlc.copy()
     except Exception as e:
         logging.error(f"get_candlestick_data() error: {e}")
 
 
 def get_latest_bid(symbol: str) -> float:
     try:
+        book = get_live_order_book(symbol)
+        if book is not None:
+            return book.best_bid()
         client = get_futures_unauthenticated_client()
         order_book = client.rest_api.order_book(symbol, 5)
         order_book = order_book.data()
@@ -101,6 +152,9 @@ def get_latest_bid(symbol: str) -> float:
 
 def get_latest_ask(symbol: str) -> float:
     try:
+        book = get_live_order_book(symbol)
+        if book is not None:
+            return book.best_ask()
         client = get_futures_unauthenticated_client()
         order_book = client.rest_api.order_book(symbol, 5)
         order_book = order_book.data()
@@ -109,6 +163,107 @@ def get_latest_ask(symbol: str) -> float:
         logging.error(f"get_latest_ask() error: {e}")
 
 
+# requests for a series already being refreshed wait on that refresh
+_inflight_refreshes: dict[tuple[str, str, str], asyncio.Future] = {}
+
+
+async def _async_refresh(source: str, symbol: str, interval: str, limit: int, fetch):
+    buffer = get_candle_buffer(source, symbol, interval)
+    key = (source, symbol, interval)
+    while True:
+        inflight = _inflight_refreshes.get(key)
+        if inflight is not None:
+            await inflight
+            continue
+
+        with buffer.lock:
+            request = buffer.next_request(limit)
+        if request is None:
+            return buffer
+
+        done = _inflight_refreshes[key] = asyncio.get_running_loop().create_future()
+        try:
+            rows = await fetch(symbol, interval, **request)
+            with buffer.lock:
+                buffer.merge(rows)
+            return buffer
+        finally:
+            del _inflight_refreshes[key]
+            done.set_result(None)
+
+
+async def async_get_data(
+    instrument="BTCUSDT",
+    interval="1h",
+    forMarketCondition=False,
+    plain=True,
+    limit=1500,
+):
+    cache_key = ("spot", instrument, interval, limit)
+    cached = kline_cache.get(cache_key)
+    if cached is not None and plain:
+        return cached
+
+    buffer = await _async_refresh(
+        "spot", instrument, interval, limit, _async_fetch_spot_klines
+    )
+    with buffer.lock:
+        df_ohlc = _cache_frame(cache_key, buffer, limit)
+
+    if plain:  # in case the user wants the data with no indicators
+        return df_ohlc.copy()
+
+
+async def async_get_candlestick_data(
+    symbol: str, timeframe: str, limit: int = 1000, plain: bool = True
+):
+    try:
+        cache_key = ("futures", symbol, timeframe, limit)
+        cached = kline_cache.get(cache_key)
+        if cached is not None and plain:
+            return cached
+
+        buffer = await _async_refresh(
+            "futures", symbol, timeframe, limit, _async_fetch_futures_klines
+        )
+        with buffer.lock:
+            df_ohlc = _cache_frame(cache_key, buffer, limit)
+
+        if plain:  # in case the user wants the data with no indicators
+            return df_ohlc.copy()
+    except Exception as e:
+        logging.error(f"async_get_candlestick_data() error: {e}")
+
+
+async def _async_order_book(symbol: str, limit: int = 5) -> dict:
+    response = await market_client.get(
+        f"{FUTURES_REST_URL}/fapi/v1/depth", params={"symbol": symbol, "limit": limit}
+    )
+    return response.json()
+
+
+async def async_get_latest_bid(symbol: str) -> float:
+    try:
+        book = get_live_order_book(symbol)
+        if book is not None:
+            return book.best_bid()
+        order_book = await _async_order_book(symbol)
+        return float(order_book["bids"][0][0])
+    except Exception as e:
+        logging.error(f"async_get_latest_bid() error: {e}")
+
+
+async def async_get_latest_ask(symbol: str) -> float:
+    try:
+        book = get_live_order_book(symbol)
+        if book is not None:
+            return book.best_ask()
+        order_book = await _async_order_book(symbol)
+        return float(order_book["asks"][0][0])
+    except Exception as e:
+        logging.error(f"async_get_latest_ask() error: {e}")
+
+
 def get_24h_price_change(symbol: str | None = None) -> float:
     try:
         client = get_futures_unauthenticated_client()
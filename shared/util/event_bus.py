@@ -0,0 +1,126 @@
+import asyncio
+import logging
+
+from shared.config.settings import get_settings
+
+settings = get_settings()
+
+# topics are tuples led by the event kind
+CANDLE_CLOSE = "candle_close"  # (CANDLE_CLOSE, symbol, interval)
+MARK_PRICE = "mark_price"  # (MARK_PRICE, symbol)
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for market events.
+
+    Publishing never blocks, so stream callbacks can publish directly: an event
+    is queued once per topic, and a newer event for a topic still waiting
+    replaces the queued one instead of queueing again, which bounds the backlog
+    by the number of topics. Events carrying a `sequence` (a close time, an
+    event time) that is not newer than the last one queued for the topic are
+    duplicates and dropped, so several sources can publish the same close. When
+    `max_pending` topics are waiting, new ones are dropped and counted.
+
+    `workers` tasks deliver the events, each calling every handler of a topic
+    concurrently, so at most `workers` events are handled at a time. Handlers
+    are coroutines taking (topic, event); their errors are logged.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.EVENT_BUS_WORKERS,
+        max_pending: int = settings.EVENT_BUS_MAX_PENDING,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._handlers: dict[tuple, list] = {}
+        self._pending: dict[tuple, dict] = {}
+        self._sequences: dict[tuple, int] = {}
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self.counts = {
+            "published": 0,
+            "coalesced": 0,
+            "duplicates": 0,
+            "dropped": 0,
+            "delivered": 0,
+            "errors": 0,
+        }
+
+    def subscribe(self, topic: tuple, handler):
+        handlers = self._handlers.setdefault(topic, [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+    def unsubscribe(self, topic: tuple, handler):
+        handlers = self._handlers.get(topic, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if not handlers:
+            self._handlers.pop(topic, None)
+
+    def publish(self, topic: tuple, event: dict, sequence: int | None = None) -> bool:
+        """Queues `event` for the subscribers of `topic`; False when nobody gets it."""
+        if topic not in self._handlers:
+            return False
+        if sequence is not None:
+            if sequence <= self._sequences.get(topic, -1):
+                self.counts["duplicates"] += 1
+                return False
+
+        if topic in self._pending:
+            self.counts["coalesced"] += 1
+        elif self._queue is None or self._queue.qsize() >= self.max_pending:
+            self.counts["dropped"] += 1
+            return False
+        else:
+            self._queue.put_nowait(topic)
+        self._pending[topic] = event
+        if sequence is not None:
+            self._sequences[topic] = sequence
+        self.counts["published"] += 1
+        return True
+
+    async def _worker(self):
+        while True:
+            topic = await self._queue.get()
+            try:
+                event = self._pending.pop(topic)
+                handlers = list(self._handlers.get(topic, []))
+                results = await asyncio.gather(
+                    *[handler(topic, event) for handler in handlers], return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        self.counts["errors"] += 1
+                        logging.error(f"event handler error for {topic}: {result}")
+                self.counts["delivered"] += len(handlers)
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        """Starts the delivery workers on the running loop; publishing before this drops events."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._pending.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self.counts,
+            "topics": len(self._handlers),
+            "pending": len(self._pending),
+        }
+
+
+event_bus = EventBus()
@@ -1,39 +1,91 @@
+import logging
+import threading
+import time
+
 from shared.config.auth import get_futures_unauthenticated_client
+from shared.config.settings import get_settings
+
+settings = get_settings()
+
+
+def _symbol_filters(symbol_info) -> dict:
+    filters = {
+        "tick_size": 0.0,
+        "step_size": 0.0,
+        "min_notional": 0.0,
+        "price_precision": symbol_info.price_precision,
+        "quantity_precision": symbol_info.quantity_precision,
+    }
+    for filter in symbol_info.filters or []:
+        if filter.filter_type == "PRICE_FILTER":
+            filters["tick_size"] = float(filter.tick_size)
+        elif filter.filter_type == "LOT_SIZE":
+            filters["step_size"] = float(filter.step_size)
+        elif filter.filter_type == "MIN_NOTIONAL":
+            filters["min_notional"] = float(filter.notional)
+    return filters
+
+
+class ExchangeInfoIndex:
+    """
+    Process-wide index of futures symbol filters, built from one exchange-info download.
+
+    The first lookup builds the index; after `ttl_seconds` lookups keep answering
+    from the current index while a background thread downloads a fresh one.
+    """
+
+    def __init__(self, ttl_seconds: float = settings.EXCHANGE_INFO_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._symbols: dict[str, dict] = {}
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def refresh(self):
+        client = get_futures_unauthenticated_client()
+        exchange_info = client.rest_api.exchange_information()
+        symbols = {
+            symbol_info.symbol: _symbol_filters(symbol_info)
+            for symbol_info in exchange_info.data().symbols
+        }
+        with self._lock:
+            self._symbols = symbols
+            self._refreshed_at = time.time()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logging.error(f"exchange info refresh error: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self, symbol: str) -> dict | None:
+        if not self._symbols:
+            self.refresh()
+        elif time.time() - self._refreshed_at > self.ttl_seconds:
+            with self._lock:
+                start_refresh = not self._refreshing
+                self._refreshing = True
+            if start_refresh:
+                threading.Thread(target=self._refresh_in_background, daemon=True).start()
+        return self._symbols.get(symbol)
+
+
+exchange_info_index = ExchangeInfoIndex()
+
 
 def get_minimum_notional(symbol: str) -> float:
-    client = get_futures_unauthenticated_client()
-    exchange_info = client.rest_api.exchange_information()
-    symbols_info = exchange_info.data().symbols
-    for symbol_info in symbols_info:
-        if symbol_info.symbol == symbol:
-            for filter in symbol_info.filters:
-                if filter.filter_type == "MIN_NOTIONAL":
-                    return float(filter.notional)
-    
-    return 0.0
+    symbol_filters = exchange_info_index.get(symbol)
+    return symbol_filters["min_notional"] if symbol_filters else 0.0
 
 
 def get_price_precision(symbol: str) -> float:
-    client = get_futures_unauthenticated_client()
-    exchange_info = client.rest_api.exchange_information()
-    symbols_info = exchange_info.data().symbols
-    for symbol_info in symbols_info:
-        if symbol_info.symbol == symbol:
-            for filter in symbol_info.filters:
-                if filter.filter_type == "PRICE_FILTER":
-                    return float(filter.tick_size)
-    
-    return 0.0
+    symbol_filters = exchange_info_index.get(symbol)
+    return symbol_filters["tick_size"] if symbol_filters else 0.0
 
 
 def get_quantity_precision(symbol: str) -> float:
-    client = get_futures_unauthenticated_client()
-    exchange_info = client.rest_api.exchange_information()
-    symbols_info = exchange_info.data().symbols
-    for symbol_info in symbols_info:
-        if symbol_info.symbol == symbol:
-            for filter in symbol_info.filters:
-                if filter.filter_type == "LOT_SIZE":
-                    return float(filter.step_size)
-    
-    return 0.0
\ No newline at end of file
+    symbol_filters = exchange_info_index.get(symbol)
+    return symbol_filters["step_size"] if symbol_filters else 0.0
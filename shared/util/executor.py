@@ -0,0 +1,48 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from shared.config.settings import get_settings
+
+settings = get_settings()
+
+
+class WorkerPools:
+    """
+    Runs blocking work off the event loop on a bounded thread pool: synchronous
+    HTTP and exchange SDK calls, and strategy evaluation, which has to stay in
+    this process to share its indicator cache. The pool starts on first use
+    and is reused afterwards.
+    """
+
+    def __init__(self, thread_workers: int = settings.SCANNER_THREAD_WORKERS):
+        self.thread_workers = thread_workers
+        self._threads: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.thread_workers, thread_name_prefix="worker-pools"
+                )
+            return self._threads
+
+    async def run(self, func, *args, timeout: float | None = None):
+        """
+        Runs `func(*args)` on the pool and waits up to `timeout` seconds for it,
+        raising asyncio.TimeoutError after. A call that already started keeps
+        its worker until it returns; only the wait is abandoned.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._thread_pool()
+        return await asyncio.wait_for(loop.run_in_executor(pool, func, *args), timeout)
+
+    def shutdown(self):
+        with self._lock:
+            if self._threads is not None:
+                self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+
+
+worker_pools = WorkerPools()
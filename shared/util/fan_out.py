@@ -0,0 +1,50 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from shared.config.settings import get_settings
+from shared.util.latency import LagStats
+
+settings = get_settings()
+
+
+class FanOut:
+    """
+    Bounds the exchange calls made while a signal is fanned out to its users.
+
+    Every user's calls run concurrently, but at most `concurrency` at a time
+    overall and `per_key` at a time per API key, since Binance rate-limits each
+    key (and the IP) separately and users may share an account. The per-key
+    limit is taken first, so a busy key waits without holding a global slot.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = settings.SCANNER_FANOUT_CONCURRENCY,
+        per_key: int = settings.SCANNER_FANOUT_PER_KEY,
+    ):
+        self.concurrency = concurrency
+        self.per_key = per_key
+        self._global: asyncio.Semaphore | None = None
+        self._keys: dict[str, asyncio.Semaphore] = {}
+        # time from a signal to the last of its workflows starting, per strategy
+        self.lag = LagStats()
+
+    @asynccontextmanager
+    async def limit(self, api_key: str):
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.concurrency)
+        key = self._keys.get(api_key)
+        if key is None:
+            key = self._keys[api_key] = asyncio.Semaphore(self.per_key)
+        async with key:
+            async with self._global:
+                yield
+
+    def record(self, strategy_name: str, signalled_ms: int, done_ms: int | None = None):
+        self.lag.record(strategy_name, signalled_ms, done_ms)
+
+    def stats(self) -> dict:
+        return {"keys": len(self._keys), "signal_to_workflows": self.lag.stats()}
+
+
+fan_out = FanOut()
@@ -1,79 +1,140 @@
+import numpy as np
 import talib
 import pandas as pd
 
+from shared.util.indicator_cache import indicator_cache
+from shared.util.ohlcv_buffer import OHLCV_COLUMNS, OHLCVBuffer
+
+
+def _values(DataFrame, column: str) -> np.ndarray:
+    """Float64 column values, zero-copy for OHLCVBuffer and float64 frames."""
+    if isinstance(DataFrame, OHLCVBuffer):
+        return DataFrame.column(OHLCV_COLUMNS.index(column))
+    return np.asarray(DataFrame[column].values, dtype=np.float64)
+
+
+def _index(DataFrame):
+    if isinstance(DataFrame, OHLCVBuffer):
+        return pd.RangeIndex(len(DataFrame))
+    return DataFrame.index
+
 
 def ATR(DataFrame, N=14, isBacktesting:bool = False):
-    res = talib.ATR(
-        DataFrame.High.values.astype(float),
-        DataFrame.Low.values.astype(float),
-        DataFrame.Close.values.astype(float),
-        N,
+    res = indicator_cache.resolve(
+        DataFrame,
+        ("ATR", N),
+        lambda: talib.ATR(
+            _values(DataFrame, "High"),
+            _values(DataFrame, "Low"),
+            _values(DataFrame, "Close"),
+            N,
+        ),
     )
     if isBacktesting:
         return res
-    return pd.DataFrame({"ATR": res}, index=DataFrame.index)
+    return pd.DataFrame({"ATR": res}, index=_index(DataFrame))
 
 
 def MA(DataFrame, N=20, isBacktesting:bool = False):
-    res = talib.MA(DataFrame.Close.values.astype(float), N)
+    res = indicator_cache.resolve(
+        DataFrame, ("MA", N), lambda: talib.MA(_values(DataFrame, "Close"), N)
+    )
     if isBacktesting:
         return res
-    return pd.DataFrame({f"MA{N}": res}, index=DataFrame.index)
+    return pd.DataFrame({f"MA{N}": res}, index=_index(DataFrame))
 
 
 def CCI(DataFrame, N=20, isBacktesting:bool = False):
-    res = talib.CCI(
-        DataFrame.High.values.astype(float),
-        DataFrame.Low.values.astype(float),
-        DataFrame.Close.values.astype(float),
-        N,
+    res = indicator_cache.resolve(
+        DataFrame,
+        ("CCI", N),
+        lambda: talib.CCI(
+            _values(DataFrame, "High"),
+            _values(DataFrame, "Low"),
+            _values(DataFrame, "Close"),
+            N,
+        ),
     )
     if isBacktesting:
         return res
-    return pd.DataFrame({"CCI": res}, index=DataFrame.index)
+    return pd.DataFrame({"CCI": res}, index=_index(DataFrame))
 
 def RSI(DataFrame, N=14, isBacktesting:bool=False):
-    res = talib.RSI(DataFrame.Close.values.astype(float), N)
+    res = indicator_cache.resolve(
+        DataFrame, ("RSI", N), lambda: talib.RSI(_values(DataFrame, "Close"), N)
+    )
+    if isBacktesting:
+        return res
+    return pd.DataFrame({"RSI": res}, index=_index(DataFrame))
+
+def _simple_rsi(close: np.ndarray, N: int) -> np.ndarray:
+    delta = pd.Series(close).diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    rs = gain.rolling(N).mean() / loss.rolling(N).mean()
+    return (100 - (100 / (1 + rs))).values
+
+def SIMPLE_RSI(DataFrame, N=14, isBacktesting: bool = False):
+    """RSI over plain rolling means of gains and losses (no Wilder smoothing)."""
+    res = indicator_cache.resolve(
+        DataFrame, ("SIMPLE_RSI", N), lambda: _simple_rsi(_values(DataFrame, "Close"), N)
+    )
     if isBacktesting:
         return res
-    return pd.DataFrame({"RSI": res}, index=DataFrame.index)
+    return pd.DataFrame({"RSI": res}, index=_index(DataFrame))
 
 def MA_for_indicators(DataFrame, Indicator, N=20, isBacktesting: bool = False):
-    res = talib.MA(DataFrame[Indicator].values.astype(float), N)
+    compute = lambda: talib.MA(_values(DataFrame, Indicator), N)
+    # derived columns carry no record of how they were computed, so only raw
+    # OHLCV columns can be shared
+    if Indicator in OHLCV_COLUMNS:
+        res = indicator_cache.resolve(DataFrame, ("MA_for_indicators", Indicator, N), compute)
+    else:
+        res = compute()
     if isBacktesting:
         return res
-    return pd.DataFrame({f"{Indicator}_MA": res}, index=DataFrame.index)
+    return pd.DataFrame({f"{Indicator}_MA": res}, index=_index(DataFrame))
 
 def ENGULFING(DataFrame, isBacktesting: bool = False):
-    res = talib.CDLENGULFING(
-        DataFrame.Open.values.astype(float),
-        DataFrame.High.values.astype(float),
-        DataFrame.Low.values.astype(float),
-        DataFrame.Close.values.astype(float),
+    res = indicator_cache.resolve(
+        DataFrame,
+        ("ENGULFING",),
+        lambda: talib.CDLENGULFING(
+            _values(DataFrame, "Open"),
+            _values(DataFrame, "High"),
+            _values(DataFrame, "Low"),
+            _values(DataFrame, "Close"),
+        ),
     )
     if isBacktesting:
         return res
-    return pd.DataFrame({"ENGULFING": res}, index=DataFrame.index)
+    return pd.DataFrame({"ENGULFING": res}, index=_index(DataFrame))
 
 def BB(DataFrame, N=10, std=2, isBacktesting: bool = False):
-    upper, middle, lower = talib.BBANDS(
-        DataFrame.Close.values.astype(float), N, std, std
+    upper, middle, lower = indicator_cache.resolve(
+        DataFrame,
+        ("BB", N, std),
+        lambda: talib.BBANDS(_values(DataFrame, "Close"), N, std, std),
     )
     if isBacktesting:
         return upper, middle, lower
     return (
-        pd.DataFrame({"BB": upper}, index=DataFrame.index),
-        pd.DataFrame({"BB": middle}, index=DataFrame.index),
-        pd.DataFrame({"BB": lower}, index=DataFrame.index),
+        pd.DataFrame({"BB": upper}, index=_index(DataFrame)),
+        pd.DataFrame({"BB": middle}, index=_index(DataFrame)),
+        pd.DataFrame({"BB": lower}, index=_index(DataFrame)),
     )
 
 def MACD(DataFrame, fastperiod: int = 12, slowperiod: int = 26, signalperiod: int = 9, isBacktesting: bool = False):
-    macd, signal, hist = talib.MACD(
-        DataFrame.Close.values.astype(float),
-        fastperiod=fastperiod,
-        slowperiod=slowperiod,
-        signalperiod=signalperiod,
+    macd, signal, hist = indicator_cache.resolve(
+        DataFrame,
+        ("MACD", fastperiod, slowperiod, signalperiod),
+        lambda: talib.MACD(
+            _values(DataFrame, "Close"),
+            fastperiod=fastperiod,
+            slowperiod=slowperiod,
+            signalperiod=signalperiod,
+        ),
     )
     if isBacktesting:
         return macd, signal, hist
-    return pd.DataFrame({"MACD": hist}, index=DataFrame.index)
\ No newline at end of file
+    return pd.DataFrame({"MACD": hist}, index=_index(DataFrame))
@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+from shared.config.settings import get_settings
+
+settings = get_settings()
+
+
+class IndicatorCache:
+    """
+    Indicator results shared by every strategy evaluated in one scan cycle.
+
+    Results are keyed by (series, indicator, params), where the series key is the
+    one `get_data` stamps into the frame's `attrs`: source, symbol, interval,
+    limit, candle buffer version and row count, so a result is only reused on
+    exactly the data it was computed from. Frames without a series key (or whose
+    length no longer matches it) are computed directly. Cached arrays are
+    read-only; copy before modifying them in place.
+
+    Past `max_bytes` of arrays the least recently used results are evicted, which
+    bounds processes that never start a new cycle, like optimizer workers.
+    """
+
+    def __init__(self, max_bytes: int = int(settings.INDICATOR_CACHE_MAX_MB * 2**20)):
+        self.max_bytes = max_bytes
+        self._results: OrderedDict[tuple, object] = OrderedDict()
+        self._sizes: dict[tuple, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def series_key(DataFrame) -> tuple | None:
+        attrs = getattr(DataFrame, "attrs", None)
+        series = attrs.get("series") if attrs else None
+        # frames reshaped after loading (resampled, sliced) are not the cached series
+        if series is None or len(DataFrame) != series[-1]:
+            return None
+        return series
+
+    def resolve(self, DataFrame, indicator: tuple, compute):
+        series = self.series_key(DataFrame)
+        if series is None:
+            return compute()
+
+        key = (series, *indicator)
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                self._results.move_to_end(key)
+                return self._results[key]
+            self.misses += 1
+
+        result = compute()
+        arrays = result if isinstance(result, tuple) else (result,)
+        for array in arrays:
+            array.flags.writeable = False
+        with self._lock:
+            if key not in self._results:
+                self._results[key] = result
+                self._sizes[key] = sum(array.nbytes for array in arrays)
+                self._bytes += self._sizes[key]
+                # the newest result is kept even when it alone is over the limit
+                while self._bytes > self.max_bytes and len(self._results) > 1:
+                    evicted, _ = self._results.popitem(last=False)
+                    self._bytes -= self._sizes.pop(evicted)
+                    self.evictions += 1
+        return result
+
+    def new_cycle(self):
+        """Drops the previous cycle's results; counters keep accumulating."""
+        with self._lock:
+            self._results.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._results),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+indicator_cache = IndicatorCache()
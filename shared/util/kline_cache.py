@@ -0,0 +1,49 @@
+import threading
+
+import pandas as pd
+
+from shared.util.timeframe import now_ms
+
+
+class KlineCache:
+    """
+    Process-wide cache of OHLCV DataFrames keyed by (source, symbol, interval, limit).
+
+    An entry stays valid until the forming candle of its interval closes, so every
+    strategy evaluated inside the same candle shares a single REST download.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple, tuple[int, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> pd.DataFrame | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now_ms() >= entry[0]:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+        # callers add indicator columns to the frame they get back
+        return entry[1].copy()
+
+    def put(self, key: tuple, data: pd.DataFrame, expires_at: int):
+        with self._lock:
+            self._entries[key] = (expires_at, data)
+
+    def invalidate(self, source: str, symbol: str, interval: str):
+        with self._lock:
+            for key in [
+                key for key in self._entries if key[:3] == (source, symbol, interval)
+            ]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+kline_cache = KlineCache()
@@ -0,0 +1,40 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+from shared.util.timeframe import now_ms
+
+
+class LagStats:
+    """
+    Time from an event (a candle close, a signal) to the action taken on it,
+    per label, over the last `window` actions.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._lags: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, event_ms: int, done_ms: int | None = None):
+        lag = (now_ms() if done_ms is None else done_ms) - event_ms
+        with self._lock:
+            lags = self._lags.get(label)
+            if lags is None:
+                lags = self._lags[label] = deque(maxlen=self.window)
+            lags.append(lag)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lags = {label: np.array(values) for label, values in self._lags.items()}
+        return {
+            label: {
+                "count": len(values),
+                "last_ms": int(values[-1]),
+                "p50_ms": float(np.percentile(values, 50)),
+                "p99_ms": float(np.percentile(values, 99)),
+                "max_ms": int(values.max()),
+            }
+            for label, values in lags.items()
+        }
@@ -0,0 +1,81 @@
+import math
+
+from shared.util.candle_buffer import PAGE_LIMITS
+
+# the most history any signal is evaluated on: signals read spot candles, and a
+# spot candle buffer holds no more than one page of /api/v3/klines
+MAX_LOOKBACK = PAGE_LIMITS["spot"]
+# the oldest value signals read is [-5], four bars before the forming candle
+READ_DEPTH = 5
+# weight the seed of a recursive (Wilder/EMA) indicator may still carry at the
+# bars a signal reads; that much history is added on top of the seed window
+CONVERGENCE_TOLERANCE = 1e-5
+
+
+def _convergence_bars(decay: float, tolerance: float) -> int:
+    if decay <= 0:
+        return 0
+    return math.ceil(math.log(tolerance) / math.log(decay))
+
+
+def window_lookback(N: int) -> int:
+    """Bars before a rolling-window indicator (SMA, BB, CCI, channels) is exact."""
+    return N
+
+
+def wilder_lookback(N: int, tolerance: float = CONVERGENCE_TOLERANCE) -> int:
+    """Bars before Wilder ATR/RSI has forgotten its seed to within `tolerance`."""
+    # one extra bar for the first price change
+    return N + 1 + _convergence_bars((N - 1) / N, tolerance)
+
+
+def ema_lookback(N: int, tolerance: float = CONVERGENCE_TOLERANCE) -> int:
+    return N + _convergence_bars(1 - 2 / (N + 1), tolerance)
+
+
+def macd_lookback(fast: int, slow: int, signal: int, tolerance: float = CONVERGENCE_TOLERANCE) -> int:
+    # the signal line smooths a MACD line that must have converged first
+    return max(ema_lookback(fast, tolerance), ema_lookback(slow, tolerance)) + ema_lookback(
+        signal, tolerance
+    )
+
+
+def bars_needed(*lookbacks: int) -> int:
+    """History to fetch so every indicator is warm at every bar a signal reads."""
+    return min(max(lookbacks) + READ_DEPTH, MAX_LOOKBACK)
+
+
+def simple_rsi_lookback(N: int) -> int:
+    # a plain average of the last N changes, which needs one bar more
+    return window_lookback(N + 1)
+
+
+def rsi_ma_lookback(rsi_N: int, ma_N: int) -> int:
+    # the average of an RSI only starts once the RSI has converged
+    return wilder_lookback(rsi_N) + window_lookback(ma_N)
+
+
+def candle_pattern_lookback() -> int:
+    # engulfing compares a candle with the one before it
+    return window_lookback(2)
+
+
+# how much history each indicator a strategy declares needs, by name; ROLLING
+# covers the plain rolling windows signals build themselves (channel bounds,
+# average range, resistance)
+INDICATOR_LOOKBACKS = {
+    "ATR": wilder_lookback,
+    "RSI": wilder_lookback,
+    "SIMPLE_RSI": simple_rsi_lookback,
+    "RSI_MA": rsi_ma_lookback,
+    "MA": window_lookback,
+    "BB": window_lookback,
+    "CCI": window_lookback,
+    "ROLLING": window_lookback,
+    "MACD": macd_lookback,
+    "ENGULFING": candle_pattern_lookback,
+}
+
+
+def indicator_lookback(indicator: str, *params) -> int:
+    return INDICATOR_LOOKBACKS[indicator](*params)
@@ -0,0 +1,78 @@
+import asyncio
+import importlib.util
+from urllib.parse import urlsplit
+
+import httpx
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+SPOT_REST_URL = "https://api.binance.com"
+FUTURES_REST_URL = "https://fapi.binance.com"
+
+
+class MarketDataClient:
+    """
+    Shared keep-alive HTTP client for public market data.
+
+    One connection pool is reused for every request, HTTP/2 is negotiated when h2
+    is installed, and each host gets its own concurrency limit so a burst against
+    one venue cannot starve the other.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 50,
+        max_concurrency_per_host: int = 10,
+        timeout: float = 10.0,
+    ):
+        self.max_connections = max_connections
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        # pooled connections belong to the loop that opened them
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout,
+            )
+            self._loop = loop
+            self._host_semaphores = {}
+        return self._client
+
+    async def get(self, url: str, params: dict | None = None) -> httpx.Response:
+        client = self._get_client()
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(
+                self.max_concurrency_per_host
+            )
+        async with semaphore:
+            response = await client.get(url, params=params)
+        response.raise_for_status()
+        return response
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+market_client = MarketDataClient()
+
+# synchronous callers share one keep-alive pool as well
+sync_client = httpx.Client(
+    http2=HTTP2_AVAILABLE,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    timeout=10.0,
+)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["Open time", "Open", "High", "Low", "Close", "Volume"]
+
+
+def parse_klines(rows) -> np.ndarray:
+    """Parses raw kline rows (REST list-of-lists of strings) into an (n, 6) float64 array."""
+    try:
+        return np.array(
+            [row[:6] for row in rows], dtype=np.float64
+        ).reshape(-1, len(OHLCV_COLUMNS))
+    except (TypeError, ValueError):
+        # SDK responses wrap every row and value in pydantic models
+        return np.array(
+            [
+                [float(getattr(value, "actual_instance", value)) for value in list(getattr(row, "root", row))[:6]]
+                for row in rows
+            ],
+            dtype=np.float64,
+        ).reshape(-1, len(OHLCV_COLUMNS))
+
+
+class OHLCVBuffer:
+    """
+    Fixed-capacity OHLCV series stored as one contiguous float64 array per column.
+
+    Storage is twice the capacity: bars are appended at the end and, once the end
+    is reached, the newest `capacity` bars are moved back to the front. Appending
+    is amortized O(1), overwriting the forming bar is O(1), and every column is
+    always exposed as a contiguous zero-copy view.
+    """
+
+    def __init__(self, capacity: int = 1500):
+        self.capacity = capacity
+        self._store = np.empty((len(OHLCV_COLUMNS), 2 * capacity), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _make_room(self, count: int):
+        if self._end + count <= self._store.shape[1]:
+            return
+        keep = min(len(self), self.capacity - count)
+        self._store[:, :keep] = self._store[:, self._end - keep:self._end]
+        self._start, self._end = 0, keep
+
+    def append(self, bar):
+        self._make_room(1)
+        self._store[:, self._end] = bar
+        self._end += 1
+        if len(self) > self.capacity:
+            self._start += 1
+
+    def overwrite_last(self, bar):
+        self._store[:, self._end - 1] = bar
+
+    def extend(self, bars: np.ndarray):
+        bars = bars[-self.capacity:]
+        self._make_room(len(bars))
+        self._store[:, self._end:self._end + len(bars)] = bars.T
+        self._end += len(bars)
+        self._start = max(self._start, self._end - self.capacity)
+
+    def truncate_from(self, open_time: float):
+        """Drops every bar that opened at or after `open_time`."""
+        self._end = self._start + int(np.searchsorted(self.open_time, open_time))
+
+    def column(self, index: int, limit: int | None = None) -> np.ndarray:
+        start = self._start if limit is None else max(self._start, self._end - limit)
+        view = self._store[index, start:self._end]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def open_time(self) -> np.ndarray:
+        return self.column(0)
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.column(1)
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.column(2)
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.column(3)
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column(4)
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.column(5)
+
+    def last(self, index: int) -> float:
+        return float(self._store[index, self._end - 1])
+
+    def to_frame(self, limit: int | None = None) -> pd.DataFrame:
+        """Builds a pandas DataFrame over the newest `limit` bars on request."""
+        return pd.DataFrame(
+            {name: self.column(i, limit).copy() for i, name in enumerate(OHLCV_COLUMNS)}
+        )
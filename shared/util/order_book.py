@@ -0,0 +1,159 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import deque
+
+from shared.config.settings import get_settings
+
+settings = get_settings()
+
+
+def _parse_levels(levels) -> list[tuple[float, float]]:
+    """[price, quantity] pairs from REST JSON or SDK stream models."""
+    parsed = []
+    for level in levels or []:
+        price, quantity = list(getattr(level, "root", level))[:2]
+        parsed.append((float(price), float(quantity)))
+    return parsed
+
+
+class _BookSide:
+    """Price levels of one side, kept in a dict plus an ascending price list."""
+
+    def __init__(self):
+        self.quantities: dict[float, float] = {}
+        self.prices: list[float] = []
+
+    def clear(self):
+        self.quantities.clear()
+        self.prices.clear()
+
+    def set(self, price: float, quantity: float):
+        if quantity == 0:
+            if self.quantities.pop(price, None) is not None:
+                del self.prices[bisect_left(self.prices, price)]
+        else:
+            if price not in self.quantities:
+                insort(self.prices, price)
+            self.quantities[price] = quantity
+
+
+class LocalOrderBook:
+    """
+    Futures order book for one symbol, mirrored from a snapshot plus the diff depth stream.
+
+    Diffs that arrive before a snapshot is loaded are held back and replayed on top
+    of it. Every applied diff must continue the sequence of the previous one
+    (`pu` equals the last `u`); a break marks the book out of sync until a new
+    snapshot is applied. Best bid/ask reads are O(1) and depth reads O(k).
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.lock = threading.Lock()
+        self.bids = _BookSide()
+        self.asks = _BookSide()
+        self.last_update_id: int | None = None  # None until a snapshot is loaded
+        self.synced = False
+        self.updated_at = 0.0
+        self._pending: deque[tuple] = deque(maxlen=1000)
+
+    def reset(self):
+        with self.lock:
+            self.bids.clear()
+            self.asks.clear()
+            self.last_update_id = None
+            self.synced = False
+            self._pending.clear()
+
+    def apply_snapshot(self, snapshot: dict) -> bool:
+        """Loads a REST depth snapshot and replays the held back diffs; False on a gap."""
+        with self.lock:
+            self.bids.clear()
+            self.asks.clear()
+            for price, quantity in _parse_levels(snapshot["bids"]):
+                self.bids.set(price, quantity)
+            for price, quantity in _parse_levels(snapshot["asks"]):
+                self.asks.set(price, quantity)
+            self.last_update_id = snapshot["lastUpdateId"]
+            self.synced = False
+            self.updated_at = time.time()
+
+            pending = list(self._pending)
+            self._pending.clear()
+            for diff in pending:
+                if not self._apply(*diff):
+                    self.last_update_id = None
+                    return False
+            return True
+
+    def apply_diff(self, first_id: int, final_id: int, previous_final_id: int, bids, asks) -> bool:
+        """Applies one depth diff event (U, u, pu, b, a); False when the sequence broke."""
+        with self.lock:
+            if self.last_update_id is None:
+                self._pending.append((first_id, final_id, previous_final_id, bids, asks))
+                return True
+            if self._apply(first_id, final_id, previous_final_id, bids, asks):
+                return True
+            self.last_update_id = None
+            self.synced = False
+            return False
+
+    def _apply(self, first_id, final_id, previous_final_id, bids, asks) -> bool:
+        if final_id < self.last_update_id:
+            return True  # already contained in the snapshot
+        if self.synced:
+            if previous_final_id != self.last_update_id:
+                return False
+        elif first_id > self.last_update_id:
+            return False  # the snapshot is older than the first diff we hold
+
+        for price, quantity in _parse_levels(bids):
+            self.bids.set(price, quantity)
+        for price, quantity in _parse_levels(asks):
+            self.asks.set(price, quantity)
+        self.last_update_id = final_id
+        self.synced = True
+        self.updated_at = time.time()
+        return True
+
+    def is_live(self, max_age_seconds: float = settings.ORDER_BOOK_MAX_AGE_SECONDS) -> bool:
+        return self.synced and time.time() - self.updated_at <= max_age_seconds
+
+    def best_bid(self) -> float | None:
+        with self.lock:
+            return self.bids.prices[-1] if self.bids.prices else None
+
+    def best_ask(self) -> float | None:
+        with self.lock:
+            return self.asks.prices[0] if self.asks.prices else None
+
+    def depth(self, limit: int = 5) -> tuple[list[tuple[float, float]], list[tuple[float, float]]]:
+        """Best `limit` (price, quantity) levels per side, best price first."""
+        with self.lock:
+            bid_prices = self.bids.prices[-limit:][::-1]
+            ask_prices = self.asks.prices[:limit]
+            return (
+                [(price, self.bids.quantities[price]) for price in bid_prices],
+                [(price, self.asks.quantities[price]) for price in ask_prices],
+            )
+
+
+_books: dict[str, LocalOrderBook] = {}
+_books_lock = threading.Lock()
+
+
+def get_local_order_book(symbol: str) -> LocalOrderBook:
+    with _books_lock:
+        book = _books.get(symbol)
+        if book is None:
+            book = _books[symbol] = LocalOrderBook(symbol)
+        return book
+
+
+def get_live_order_book(symbol: str) -> LocalOrderBook | None:
+    """The mirrored book for `symbol` if one is streaming and in sync, else None."""
+    book = _books.get(symbol)
+    if book is None or not book.is_live():
+        return None
+    return book
@@ -0,0 +1,102 @@
+import itertools
+
+import numpy as np
+
+# A search space maps parameter names to either a list of values to choose
+# from, or a (low, high) tuple for a range, sampled as integers when both
+# bounds are integers:
+#   {"length": [10, 15, 20], "sl_multiplier": (1.0, 4.0), "atr_period": (50, 200)}
+
+
+def _is_range(values) -> bool:
+    return isinstance(values, tuple) and len(values) == 2
+
+
+def _is_integer_range(values) -> bool:
+    return all(isinstance(bound, (int, np.integer)) for bound in values)
+
+
+def _sample(values, rng: np.random.Generator, count: int) -> list:
+    if not _is_range(values):
+        return [values[i] for i in rng.integers(len(values), size=count)]
+    low, high = values
+    if _is_integer_range(values):
+        return [int(v) for v in rng.integers(low, high + 1, size=count)]
+    return [float(v) for v in rng.uniform(low, high, size=count)]
+
+
+def grid_candidates(space: dict) -> list[dict]:
+    """Every combination of a space whose parameters are all lists."""
+    for name, values in space.items():
+        if _is_range(values):
+            raise ValueError(f"Grid search needs a list of values for {name}, got a range")
+    names = list(space)
+    return [dict(zip(names, combination)) for combination in itertools.product(*space.values())]
+
+
+def random_candidates(space: dict, count: int, rng: np.random.Generator) -> list[dict]:
+    columns = {name: _sample(values, rng, count) for name, values in space.items()}
+    return [{name: columns[name][i] for name in space} for i in range(count)]
+
+
+def _parzen_log_density(x: np.ndarray, points: np.ndarray, bandwidth: float, low, high) -> np.ndarray:
+    """Log of a Gaussian kernel density over `points`, plus a flat prior over the range."""
+    z = (x[:, None] - points[None, :]) / bandwidth
+    kernels = np.exp(-0.5 * z * z) / (bandwidth * np.sqrt(2 * np.pi))
+    prior = 1.0 / (high - low) if high > low else 1.0
+    return np.log((kernels.sum(axis=1) + prior) / (len(points) + 1))
+
+
+def tpe_candidates(
+    space: dict,
+    history: list[tuple[dict, float]],
+    count: int,
+    rng: np.random.Generator,
+    gamma: float = 0.25,
+    samples: int = 24,
+) -> list[dict]:
+    """
+    Tree-structured Parzen estimator proposals, the Bayesian search used when a
+    grid is too large to exhaust. Past trials, (parameters, score) with higher
+    scores better, are split into the best `gamma` fraction and the rest; each
+    parameter is drawn from a density around the good values and the draw that
+    is most likely under it relative to the rest is kept. Parameters are treated
+    independently, and `count` proposals are made at once so a whole pool of
+    workers can evaluate them together.
+    """
+    ranked = sorted(history, key=lambda trial: trial[1], reverse=True)
+    split = max(1, int(np.ceil(gamma * len(ranked))))
+    good, bad = ranked[:split], ranked[split:] or ranked[:split]
+
+    proposals = [{} for _ in range(count)]
+    for name, values in space.items():
+        good_values = [trial[0][name] for trial in good]
+        bad_values = [trial[0][name] for trial in bad]
+        if not _is_range(values):
+            # smoothed frequencies of each choice among good and bad trials
+            good_weights = np.array([1.0 + sum(v == choice for v in good_values) for choice in values])
+            bad_weights = np.array([1.0 + sum(v == choice for v in bad_values) for choice in values])
+            ratio = (good_weights / good_weights.sum()) / (bad_weights / bad_weights.sum())
+            for proposal in proposals:
+                draws = rng.choice(len(values), size=samples, p=good_weights / good_weights.sum())
+                proposal[name] = values[draws[np.argmax(ratio[draws])]]
+            continue
+
+        low, high = values
+        good_points = np.asarray(good_values, dtype=np.float64)
+        bad_points = np.asarray(bad_values, dtype=np.float64)
+        bandwidth = max((high - low) / max(len(good_points), 1) ** 0.5 / 4, 1e-12)
+        for proposal in proposals:
+            draws = np.clip(
+                rng.choice(good_points, size=samples) + rng.normal(0, bandwidth, size=samples),
+                low,
+                high,
+            )
+            if _is_integer_range(values):
+                draws = np.round(draws)
+            score = _parzen_log_density(draws, good_points, bandwidth, low, high) - _parzen_log_density(
+                draws, bad_points, bandwidth, low, high
+            )
+            best = draws[np.argmax(score)]
+            proposal[name] = int(best) if _is_integer_range(values) else float(best)
+    return proposals
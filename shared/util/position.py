@@ -4,6 +4,7 @@ from shared.config.auth import (
 from shared.util.account import (
     get_futures_usdt_balance, get_testnet_futures_usdt_balance
 )
+from shared.util.account_state import account_state, testnet_account_state
 from shared.util.decimals import count_decimal_places_decimal
 from shared.util.exchange_info import get_minimum_notional, get_quantity_precision
 
@@ -74,8 +75,7 @@ def calculate_testnet_position_size(
     return round(position_size, number_of_decimals), number_of_decimals
 
 
-def check_open_positions(api_key: str, api_secret: str, symbol: str) -> bool:
-    client = get_futures_client(api_key=api_key, api_secret=api_secret)
+def _has_open_position(client, symbol: str) -> bool:
     open_positions = client.rest_api.position_information_v2(symbol=symbol).data()
     for position in open_positions:
         if position.entry_price != "0.0":
@@ -83,52 +83,85 @@ def check_open_positions(api_key: str, api_secret: str, symbol: str) -> bool:
     return False
 
 
-def check_open_orders(api_key: str, api_secret: str, symbol: str) -> bool:
-    client = get_futures_client(api_key=api_key, api_secret=api_secret)
+def _has_open_orders(client, symbol: str) -> bool:
     open_orders = client.rest_api.current_all_open_orders(symbol=symbol).data()
     return len(open_orders) > 0
 
 
-def check_algo_open_orders(api_key: str, api_secret: str, symbol: str) -> bool:
-    client = get_futures_client(api_key=api_key, api_secret=api_secret)
+def _has_algo_open_orders(client, symbol: str) -> bool:
     open_orders = client.rest_api.current_all_algo_open_orders(symbol=symbol).data()
     return len(open_orders) > 0
 
 
+def check_open_positions(api_key: str, api_secret: str, symbol: str) -> bool:
+    cached = account_state.has_position(api_key, symbol)
+    if cached is not None:
+        return cached
+    client = get_futures_client(api_key=api_key, api_secret=api_secret)
+    return _has_open_position(client, symbol)
+
+
+def check_open_orders(api_key: str, api_secret: str, symbol: str) -> bool:
+    cached = account_state.has_open_orders(api_key, symbol)
+    if cached is not None:
+        return cached
+    client = get_futures_client(api_key=api_key, api_secret=api_secret)
+    return _has_open_orders(client, symbol)
+
+
+def check_algo_open_orders(api_key: str, api_secret: str, symbol: str) -> bool:
+    cached = account_state.has_algo_open_orders(api_key, symbol)
+    if cached is not None:
+        return cached
+    client = get_futures_client(api_key=api_key, api_secret=api_secret)
+    return _has_algo_open_orders(client, symbol)
+
+
 def is_this_symbol_being_traded(api_key: str, api_secret: str, symbol: str) -> bool:
-    if (check_open_positions(api_key, api_secret, symbol) or 
-        check_open_orders(api_key, api_secret, symbol) or 
-        check_algo_open_orders(api_key, api_secret, symbol)
+    trading = account_state.is_trading(api_key, symbol)
+    if trading is not None:
+        return trading
+    client = get_futures_client(api_key=api_key, api_secret=api_secret)
+    if (_has_open_position(client, symbol) or 
+        _has_open_orders(client, symbol) or 
+        _has_algo_open_orders(client, symbol)
     ):
         return True
     return False
 
 
 def check_testnet_open_positions(api_key: str, api_secret: str, symbol: str) -> bool:
+    cached = testnet_account_state.has_position(api_key, symbol)
+    if cached is not None:
+        return cached
     client = get_futures_testnet_client(api_key=api_key, api_secret=api_secret)
-    open_positions = client.rest_api.position_information_v2(symbol=symbol).data()
-    for position in open_positions:
-        if position.entry_price != "0.0":
-            return True
-    return False
+    return _has_open_position(client, symbol)
 
 
 def check_testnet_open_orders(api_key: str, api_secret: str, symbol: str) -> bool:
+    cached = testnet_account_state.has_open_orders(api_key, symbol)
+    if cached is not None:
+        return cached
     client = get_futures_testnet_client(api_key=api_key, api_secret=api_secret)
-    open_orders = client.rest_api.current_all_open_orders(symbol=symbol).data()
-    return len(open_orders) > 0
+    return _has_open_orders(client, symbol)
 
 
 def check_testnet_algo_open_orders(api_key: str, api_secret: str, symbol: str) -> bool:
+    cached = testnet_account_state.has_algo_open_orders(api_key, symbol)
+    if cached is not None:
+        return cached
     client = get_futures_testnet_client(api_key=api_key, api_secret=api_secret)
-    open_orders = client.rest_api.current_all_algo_open_orders(symbol=symbol).data()
-    return len(open_orders) > 0
+    return _has_algo_open_orders(client, symbol)
 
 
 def is_this_symbol_being_traded_testnet(api_key: str, api_secret: str, symbol: str) -> bool:
-    if (check_testnet_open_positions(api_key, api_secret, symbol) or 
-        check_testnet_open_orders(api_key, api_secret, symbol) or 
-        check_testnet_algo_open_orders(api_key, api_secret, symbol)
+    trading = testnet_account_state.is_trading(api_key, symbol)
+    if trading is not None:
+        return trading
+    client = get_futures_testnet_client(api_key=api_key, api_secret=api_secret)
+    if (_has_open_position(client, symbol) or 
+        _has_open_orders(client, symbol) or 
+        _has_algo_open_orders(client, symbol)
     ):
         return True
     return False
\ No newline at end of file
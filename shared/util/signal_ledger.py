@@ -0,0 +1,69 @@
+from shared.config.settings import get_settings
+from shared.database import mongo
+from shared.util.timeframe import now_ms
+
+settings = get_settings()
+
+
+class SignalLedger:
+    """
+    Remembers every signal emitted, as (strategy, symbol, timeframe, direction,
+    bar open time), so the same bar is acted on once however many times it is
+    evaluated. Signals are checked in memory first and then recorded in Mongo,
+    where a unique id catches signals another scanner (or this one before a
+    restart) already emitted and a TTL index expires them. When Mongo cannot be
+    reached the in-memory check alone decides.
+    """
+
+    def __init__(self, ttl_seconds: int = settings.SIGNAL_LEDGER_TTL_SECONDS):
+        self.ttl_ms = ttl_seconds * 1000
+        self._emitted: dict[tuple, int] = {}
+        self._index_ready = False
+        self.claimed = 0
+        self.duplicates = 0
+
+    async def claim(
+        self, strategy_name: str, symbol: str, timeframe: str, direction: str, bar_open_time: int
+    ) -> bool:
+        """True the first time a signal is seen; False for a duplicate to drop."""
+        key = (strategy_name, symbol, timeframe, direction, int(bar_open_time))
+        if key in self._emitted:
+            self.duplicates += 1
+            return False
+        # taken before awaiting Mongo, so a concurrent evaluation of the bar sees it
+        self._emitted[key] = int(bar_open_time)
+        self._prune()
+
+        if not self._index_ready:
+            # retried on the next claim until Mongo accepts it
+            self._index_ready = await mongo.ensure_signal_ledger_index()
+        recorded = await mongo.record_signal(
+            "|".join(str(part) for part in key),
+            {
+                "strategy": strategy_name,
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "direction": direction,
+                "bar_open_time": int(bar_open_time),
+            },
+        )
+        if recorded is False:
+            self.duplicates += 1
+            return False
+        self.claimed += 1
+        return True
+
+    def _prune(self):
+        oldest = now_ms() - self.ttl_ms
+        if len(self._emitted) and min(self._emitted.values()) < oldest:
+            self._emitted = {
+                key: bar_open_time
+                for key, bar_open_time in self._emitted.items()
+                if bar_open_time >= oldest
+            }
+
+    def stats(self) -> dict:
+        return {"entries": len(self._emitted), "claimed": self.claimed, "duplicates": self.duplicates}
+
+
+signal_ledger = SignalLedger()
@@ -0,0 +1,329 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+import numpy as np
+
+from shared.util.ohlcv_buffer import OHLCVBuffer
+
+NAN = float("nan")
+
+
+class StreamingIndicator(ABC):
+    """
+    Incrementally updated indicator matching the talib function of the same name.
+
+    `update` consumes one closed bar in O(1) and stores the indicator value for it
+    in `value`; `peek` returns the value a forming bar would give without
+    consuming it. Values are NaN until the talib lookback is filled.
+    """
+
+    def __init__(self):
+        self.value = NAN
+        self.last_open_time: float | None = None
+
+    @abstractmethod
+    def update(self, high: float, low: float, close: float):
+        ...
+
+    @abstractmethod
+    def peek(self, high: float, low: float, close: float):
+        ...
+
+    def seed(self, high: np.ndarray, low: np.ndarray, close: np.ndarray):
+        for bar in zip(high.tolist(), low.tolist(), close.tolist()):
+            self.update(*bar)
+
+
+class _RollingWindow:
+    """Fixed-length window with running sums, re-summed exactly every `n` updates."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.values: deque[float] = deque(maxlen=n)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._updates = 0
+
+    def push(self, value: float):
+        if len(self.values) == self.n:
+            dropped = self.values[0]
+            self.total -= dropped
+            self.total_sq -= dropped * dropped
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        self._updates += 1
+        if self._updates >= self.n:
+            # keep floating point drift from accumulating
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+            self._updates = 0
+
+    def sums_with(self, value: float) -> tuple[int, float, float]:
+        """Count, sum and sum of squares the window would have after pushing `value`."""
+        total = self.total + value
+        total_sq = self.total_sq + value * value
+        count = len(self.values) + 1
+        if len(self.values) == self.n:
+            dropped = self.values[0]
+            total -= dropped
+            total_sq -= dropped * dropped
+            count = self.n
+        return count, total, total_sq
+
+
+class StreamingSMA(StreamingIndicator):
+    def __init__(self, n: int = 20):
+        super().__init__()
+        self.n = n
+        self.window = _RollingWindow(n)
+
+    def _value(self, count: int, total: float) -> float:
+        return total / self.n if count == self.n else NAN
+
+    def update(self, high, low, close):
+        self.window.push(close)
+        self.value = self._value(len(self.window.values), self.window.total)
+        return self.value
+
+    def peek(self, high, low, close):
+        count, total, _ = self.window.sums_with(close)
+        return self._value(count, total)
+
+
+class StreamingEMA(StreamingIndicator):
+    """EMA seeded with the SMA of its first `n` inputs, after skipping `skip` inputs."""
+
+    def __init__(self, n: int = 20, skip: int = 0):
+        super().__init__()
+        self.n = n
+        self.k = 2.0 / (n + 1)
+        self.skip = skip
+        self.count = 0
+        self.seed_total = 0.0
+
+    def _next(self, close: float) -> tuple[float, float]:
+        count = self.count + 1 - self.skip
+        if count <= 0:
+            return self.seed_total, NAN
+        if count < self.n:
+            return self.seed_total + close, NAN
+        if count == self.n:
+            return self.seed_total, (self.seed_total + close) / self.n
+        return self.seed_total, self.value + self.k * (close - self.value)
+
+    def update(self, high, low, close):
+        self.seed_total, self.value = self._next(close)
+        self.count += 1
+        return self.value
+
+    def peek(self, high, low, close):
+        return self._next(close)[1]
+
+
+class StreamingMACD(StreamingIndicator):
+    """`value` is the (macd, signal, hist) tuple, like talib.MACD."""
+
+    def __init__(self, fastperiod: int = 12, slowperiod: int = 26, signalperiod: int = 9):
+        super().__init__()
+        # talib starts the fast EMA so its first value lands on the slow one's
+        self.fast = StreamingEMA(fastperiod, skip=max(0, slowperiod - fastperiod))
+        self.slow = StreamingEMA(slowperiod)
+        self.signal = StreamingEMA(signalperiod)
+        self.value = (NAN, NAN, NAN)
+
+    @staticmethod
+    def _combine(macd: float, signal: float) -> tuple[float, float, float]:
+        if math.isnan(signal):
+            return NAN, NAN, NAN
+        return macd, signal, macd - signal
+
+    def update(self, high, low, close):
+        macd = self.fast.update(high, low, close) - self.slow.update(high, low, close)
+        signal = self.signal.update(high, low, macd) if not math.isnan(macd) else NAN
+        self.value = self._combine(macd, signal)
+        return self.value
+
+    def peek(self, high, low, close):
+        macd = self.fast.peek(high, low, close) - self.slow.peek(high, low, close)
+        signal = self.signal.peek(high, low, macd) if not math.isnan(macd) else NAN
+        return self._combine(macd, signal)
+
+
+class StreamingBB(StreamingIndicator):
+    """`value` is the (upper, middle, lower) tuple, like talib.BBANDS with an SMA."""
+
+    def __init__(self, n: int = 10, std: float = 2):
+        super().__init__()
+        self.n = n
+        self.std = std
+        self.window = _RollingWindow(n)
+        self.value = (NAN, NAN, NAN)
+
+    def _bands(self, count: int, total: float, total_sq: float):
+        if count < self.n:
+            return NAN, NAN, NAN
+        mean = total / self.n
+        deviation = math.sqrt(max(total_sq / self.n - mean * mean, 0.0))
+        return mean + self.std * deviation, mean, mean - self.std * deviation
+
+    def update(self, high, low, close):
+        self.window.push(close)
+        self.value = self._bands(
+            len(self.window.values), self.window.total, self.window.total_sq
+        )
+        return self.value
+
+    def peek(self, high, low, close):
+        return self._bands(*self.window.sums_with(close))
+
+
+class StreamingRSI(StreamingIndicator):
+    """Wilder RSI, seeded with the plain average of the first `n` changes like talib."""
+
+    def __init__(self, n: int = 14):
+        super().__init__()
+        self.n = n
+        self.count = 0
+        self.prev_close = NAN
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def _next(self, close: float) -> tuple[float, float, float]:
+        if self.count == 0:
+            return 0.0, 0.0, NAN
+        change = close - self.prev_close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if self.count < self.n:
+            return self.avg_gain + gain, self.avg_loss + loss, NAN
+        if self.count == self.n:
+            avg_gain, avg_loss = (self.avg_gain + gain) / self.n, (self.avg_loss + loss) / self.n
+        else:
+            avg_gain = (self.avg_gain * (self.n - 1) + gain) / self.n
+            avg_loss = (self.avg_loss * (self.n - 1) + loss) / self.n
+        total = avg_gain + avg_loss
+        return avg_gain, avg_loss, 100.0 * avg_gain / total if total else 0.0
+
+    def update(self, high, low, close):
+        self.avg_gain, self.avg_loss, self.value = self._next(close)
+        self.prev_close = close
+        self.count += 1
+        return self.value
+
+    def peek(self, high, low, close):
+        return self._next(close)[2]
+
+
+class StreamingATR(StreamingIndicator):
+    """Wilder ATR, seeded with the plain average of the first `n` true ranges like talib."""
+
+    def __init__(self, n: int = 14):
+        super().__init__()
+        self.n = n
+        self.count = 0
+        self.prev_close = NAN
+        self.atr = 0.0
+
+    def _next(self, high: float, low: float, close: float) -> tuple[float, float]:
+        if self.count == 0:
+            return 0.0, NAN
+        true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        if self.count < self.n:
+            return self.atr + true_range, NAN
+        if self.count == self.n:
+            atr = (self.atr + true_range) / self.n
+        else:
+            atr = (self.atr * (self.n - 1) + true_range) / self.n
+        return atr, atr
+
+    def update(self, high, low, close):
+        self.atr, self.value = self._next(high, low, close)
+        self.prev_close = close
+        self.count += 1
+        return self.value
+
+    def peek(self, high, low, close):
+        return self._next(high, low, close)[1]
+
+
+class StreamingCCI(StreamingIndicator):
+    """
+    CCI over the typical price. The mean deviation has no running form, so each
+    update costs O(n) in the CCI period, still independent of the history length.
+    """
+
+    def __init__(self, n: int = 20):
+        super().__init__()
+        self.n = n
+        self.window = _RollingWindow(n)
+
+    def _cci(self, prices) -> float:
+        if len(prices) < self.n:
+            return NAN
+        mean = sum(prices) / self.n
+        mean_deviation = sum(abs(price - mean) for price in prices) / self.n
+        if mean_deviation == 0:
+            return 0.0
+        return (prices[-1] - mean) / (0.015 * mean_deviation)
+
+    def update(self, high, low, close):
+        self.window.push((high + low + close) / 3)
+        self.value = self._cci(self.window.values)
+        return self.value
+
+    def peek(self, high, low, close):
+        prices = list(self.window.values)[-(self.n - 1):] if self.n > 1 else []
+        return self._cci(prices + [(high + low + close) / 3])
+
+
+STREAMING_INDICATORS = {
+    "SMA": StreamingSMA,
+    "EMA": StreamingEMA,
+    "MACD": StreamingMACD,
+    "BB": StreamingBB,
+    "RSI": StreamingRSI,
+    "ATR": StreamingATR,
+    "CCI": StreamingCCI,
+}
+
+
+class IndicatorSet:
+    """
+    Streaming indicators kept in step with the closed bars of one candle buffer.
+
+    Indicators are created and seeded from the buffer's history on first use;
+    later lookups only feed them the bars that closed since, and reseed them if
+    the buffer's history was replaced underneath them.
+    """
+
+    def __init__(self):
+        self._indicators: dict[tuple, StreamingIndicator] = {}
+
+    def get(self, data: OHLCVBuffer, name: str, *params) -> StreamingIndicator:
+        key = (name, *params)
+        indicator = self._indicators.get(key)
+        if indicator is None:
+            indicator = self._indicators[key] = STREAMING_INDICATORS[name](*params)
+
+        # the newest bar in the buffer is the forming candle
+        closed = len(data) - 1
+        open_time = data.open_time[:closed]
+        start = 0
+        if indicator.last_open_time is not None:
+            start = int(np.searchsorted(open_time, indicator.last_open_time, side="right"))
+            if start == 0 or open_time[start - 1] != indicator.last_open_time:
+                indicator = self._indicators[key] = STREAMING_INDICATORS[name](*params)
+                start = 0
+
+        if start < closed:
+            indicator.seed(
+                data.high[start:closed], data.low[start:closed], data.close[start:closed]
+            )
+            indicator.last_open_time = float(open_time[-1])
+        return indicator
+
+    def forming(self, data: OHLCVBuffer, name: str, *params):
+        """The indicator value for the forming candle."""
+        indicator = self.get(data, name, *params)
+        return indicator.peek(data.last(2), data.last(3), data.last(4))
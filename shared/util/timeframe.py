@@ -0,0 +1,23 @@
+import time
+
+INTERVAL_UNIT_MS = {
+    "m": 60 * 1000,
+    "h": 60 * 60 * 1000,
+    "d": 24 * 60 * 60 * 1000,
+    "w": 7 * 24 * 60 * 60 * 1000,
+}
+
+
+def interval_to_milliseconds(interval: str) -> int:
+    """
+    Converts a Binance kline interval (1m, 15m, 4h, 1d, 1w) into milliseconds.
+    Monthly candles (1M) have no fixed length and are rejected.
+    """
+    unit = interval[-1]
+    if unit not in INTERVAL_UNIT_MS:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return int(interval[:-1]) * INTERVAL_UNIT_MS[unit]
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)